@@ -0,0 +1,206 @@
+"""
+Micro-benchmarks do parser de playlists.
+
+Mede `get_segments`, `get_type_m3u8_content`, `get_high_resolution`, `get_audio_playlist` e a construção de
+`M3U8Playlist` (servida por um servidor HTTP local) sobre playlists sintéticas de 10 a 1.000.000 de segmentos,
+e grava o resultado em JSON para comparação entre versões.
+
+Uso:
+    python benchmarks/bench_parser.py --output bench.json
+    python benchmarks/bench_parser.py --sizes 10,1000 --profiles plain,keys --repeat 7
+    python benchmarks/bench_parser.py --compare bench-1.0.4.json bench.json
+"""
+import argparse
+import gc
+import http.server
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from m3u8_analyzer import M3u8Analyzer  # noqa: E402
+from m3u8_analyzer.M3u8Analyzer import M3U8Playlist  # noqa: E402
+from m3u8_analyzer.__version__ import __version__  # noqa: E402
+
+from generator import PROFILES, make_master_playlist, make_media_playlist  # noqa: E402
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+
+
+class _PlaylistServer:
+    """Servidor HTTP local que substitui a origem/CDN na etapa de download."""
+
+    def __init__(self):
+        self.files = {}
+        files = self.files
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                body = files.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/vnd.apple.mpegurl')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def publish(self, path: str, content: str) -> str:
+        self.files[path] = content.encode('utf-8')
+        return f'http://127.0.0.1:{self.httpd.server_address[1]}{path}'
+
+
+def _timeit(func, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        'min_s': min(samples),
+        'median_s': statistics.median(samples),
+        'max_s': max(samples),
+        'repeat': repeat,
+    }
+
+
+def _repeat_for(size: int, repeat: int) -> int:
+    # Playlists enormes são medidas menos vezes para manter o tempo total razoável
+    if size >= 1_000_000:
+        return 1
+    if size >= 100_000:
+        return min(repeat, 3)
+    return repeat
+
+
+def run(sizes, profiles, repeat: int, variants: int) -> dict:
+    results = []
+    master = make_master_playlist(variants=variants)
+    with _PlaylistServer() as server:
+        master_url = server.publish('/master.m3u8', master)
+        r = repeat * 10
+        for name, func in (
+                ('get_high_resolution', lambda: M3u8Analyzer.get_high_resolution(master)),
+                ('get_audio_playlist', lambda: M3u8Analyzer.get_audio_playlist(master)),
+                ('get_type_m3u8_content', lambda: M3u8Analyzer.get_type_m3u8_content(master)),
+                ('get_segments', lambda: M3u8Analyzer.get_segments(master)),
+                ('M3U8Playlist', lambda: M3U8Playlist(master_url).info()),
+        ):
+            results.append({'playlist': 'master', 'profile': f'{variants}_variants', 'segments': 0,
+                            'bytes': len(master), 'function': name, **_timeit(func, r)})
+            print(f"master {name:<24} {results[-1]['median_s'] * 1000:10.3f} ms", file=sys.stderr)
+
+        for size in sizes:
+            for profile in profiles:
+                content = make_media_playlist(size, **PROFILES[profile])
+                url = server.publish(f'/{profile}/{size}.m3u8', content)
+                r = _repeat_for(size, repeat)
+                for name, func in (
+                        ('get_segments', lambda: M3u8Analyzer.get_segments(content)),
+                        ('get_type_m3u8_content', lambda: M3u8Analyzer.get_type_m3u8_content(content)),
+                        ('get_high_resolution', lambda: M3u8Analyzer.get_high_resolution(content)),
+                        ('get_audio_playlist', lambda: M3u8Analyzer.get_audio_playlist(content)),
+                        ('M3U8Playlist', lambda: M3U8Playlist(url).number_segments()),
+                ):
+                    timing = _timeit(func, r)
+                    timing['segments_per_s'] = size / timing['median_s'] if timing['median_s'] else None
+                    results.append({'playlist': 'media', 'profile': profile, 'segments': size,
+                                    'bytes': len(content), 'function': name, **timing})
+                    print(f"{profile:<15} {size:>9} {name:<24} {timing['median_s'] * 1000:10.3f} ms",
+                          file=sys.stderr)
+                del content
+    return {
+        'library_version': __version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'results': results,
+    }
+
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> int:
+    """Compara dois arquivos de resultado e retorna 1 se houver regressão acima do limite."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(current_path, encoding='utf-8') as f:
+        current = json.load(f)
+
+    def key(row):
+        return row['playlist'], row['profile'], row['segments'], row['function']
+
+    before = {key(row): row for row in baseline['results']}
+    regressions = 0
+    for row in current['results']:
+        old = before.get(key(row))
+        if not old or not old['median_s']:
+            continue
+        ratio = row['median_s'] / old['median_s']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  <-- regressão'
+            regressions += 1
+        print(f"{row['profile']:<15} {row['segments']:>9} {row['function']:<24} {ratio:6.2f}x{flag}")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='quantidades de segmentos, separadas por vírgula')
+    parser.add_argument('--profiles', default=','.join(PROFILES), help=f'perfis: {", ".join(PROFILES)}')
+    parser.add_argument('--repeat', type=int, default=5, help='repetições por medição (playlists pequenas)')
+    parser.add_argument('--variants', type=int, default=8, help='variantes na playlist master')
+    parser.add_argument('--output', '-o', help='arquivo JSON de saída (padrão: stdout)')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help='compara dois resultados em vez de medir')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='piora relativa considerada regressão em --compare (padrão: 0.15)')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(args.compare[0], args.compare[1], args.threshold)
+
+    profiles = [p for p in args.profiles.split(',') if p]
+    unknown = set(profiles) - set(PROFILES)
+    if unknown:
+        parser.error(f"perfis desconhecidos: {', '.join(sorted(unknown))}")
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    report = run(sizes, profiles, args.repeat, args.variants)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Gerador determinístico de playlists M3U8 sintéticas para os benchmarks.
+
+A mesma combinação de parâmetros (incluindo `seed`) sempre produz exatamente o mesmo texto, para que os
+resultados de versões diferentes da biblioteca possam ser comparados.
+"""
+import random
+
+BASE_URL = 'https://cdn.example.com/vod/asset-0042/'
+RESOLUTIONS = [(416, 234), (640, 360), (768, 432), (960, 540), (1280, 720), (1600, 900), (1920, 1080),
+               (2560, 1440), (3840, 2160)]
+
+PROFILES = {
+    'plain': {},
+    'keys': {'keys': True},
+    'byteranges': {'byteranges': True},
+    'discontinuities': {'discontinuities': True},
+    'long_query': {'long_query': True},
+    'all': {'keys': True, 'byteranges': True, 'discontinuities': True, 'long_query': True},
+}
+
+
+def make_media_playlist(segments: int, keys: bool = False, byteranges: bool = False,
+                        discontinuities: bool = False, long_query: bool = False, key_rotation: int = 100,
+                        target_duration: int = 6, seed: int = 0) -> str:
+    """
+    Gera uma playlist de mídia (VOD) com o número de segmentos informado.
+
+    Args:
+        segments (int): Quantidade de segmentos.
+        keys (bool): Inclui #EXT-X-KEY AES-128, rotacionada a cada `key_rotation` segmentos.
+        byteranges (bool): Endereça os segmentos como sub-intervalos de um único arquivo (#EXT-X-BYTERANGE).
+        discontinuities (bool): Insere #EXT-X-DISCONTINUITY em pontos pseudoaleatórios.
+        long_query (bool): Acrescenta query strings longas (tokens de CDN) às URIs.
+        key_rotation (int): Intervalo de rotação de chave, em segmentos.
+        target_duration (int): Valor de #EXT-X-TARGETDURATION.
+        seed (int): Semente do gerador pseudoaleatório.
+
+    Returns:
+        str: Conteúdo da playlist.
+    """
+    rng = random.Random(seed)
+    lines = ['#EXTM3U', '#EXT-X-VERSION:4' if byteranges else '#EXT-X-VERSION:3',
+             f'#EXT-X-TARGETDURATION:{target_duration}', '#EXT-X-MEDIA-SEQUENCE:0',
+             '#EXT-X-PLAYLIST-TYPE:VOD']
+    append = lines.append
+    offset = 0
+    for i in range(segments):
+        if keys and i % key_rotation == 0:
+            append(f'#EXT-X-KEY:METHOD=AES-128,URI="{BASE_URL}keys/{i // key_rotation}.key",'
+                   f'IV=0x{i:032x}')
+        if discontinuities and i and rng.random() < 0.01:
+            append('#EXT-X-DISCONTINUITY')
+        append(f'#EXTINF:{target_duration - rng.random():.3f},')
+        if byteranges:
+            length = rng.randrange(200_000, 2_000_000)
+            append(f'#EXT-X-BYTERANGE:{length}@{offset}')
+            offset += length
+            uri = f'{BASE_URL}media.mp4'
+        else:
+            uri = f'{BASE_URL}1080p/segment_{i:07d}.ts'
+        if long_query:
+            token = ''.join(rng.choice('abcdef0123456789') for _ in range(32))
+            uri += (f'?Policy=eyJTdGF0ZW1lbnQiOlt7IlJlc291cmNlIjoiaHR0cHM6Ly9jZG4uZXhhbXBsZS5jb20v&'
+                    f'Key-Pair-Id=APKAEXAMPLE&Signature={token}&expires=1900000000&seq={i}')
+        append(uri)
+    append('#EXT-X-ENDLIST')
+    return '\n'.join(lines) + '\n'
+
+
+def make_master_playlist(variants: int = 6, audio_groups: int = 2, seed: int = 0) -> str:
+    """
+    Gera uma playlist master com variantes e mídias de áudio alternativas.
+
+    Args:
+        variants (int): Quantidade de #EXT-X-STREAM-INF.
+        audio_groups (int): Quantidade de grupos de áudio (#EXT-X-MEDIA TYPE=AUDIO).
+        seed (int): Semente do gerador pseudoaleatório.
+
+    Returns:
+        str: Conteúdo da playlist.
+    """
+    rng = random.Random(seed)
+    lines = ['#EXTM3U', '#EXT-X-VERSION:6', '#EXT-X-INDEPENDENT-SEGMENTS']
+    for g in range(audio_groups):
+        for lang in ('en', 'pt'):
+            lines.append(f'#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aac-{g}",NAME="{lang}",LANGUAGE="{lang}",'
+                         f'DEFAULT={"YES" if lang == "en" else "NO"},AUTOSELECT=YES,'
+                         f'URI="{BASE_URL}audio/{g}/{lang}.m3u8"')
+    for v in range(variants):
+        width, height = RESOLUTIONS[v % len(RESOLUTIONS)]
+        bandwidth = 200_000 + v * 450_000 + rng.randrange(0, 50_000)
+        codec = 'avc1.640028' if v % 3 else 'hvc1.2.4.L123.B0'
+        lines.append(f'#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},AVERAGE-BANDWIDTH={bandwidth * 9 // 10},'
+                     f'RESOLUTION={width}x{height},FRAME-RATE=29.970,CODECS="{codec},mp4a.40.2",'
+                     f'AUDIO="aac-{v % audio_groups}"')
+        lines.append(f'{BASE_URL}{height}p_{v}/index.m3u8')
+    return '\n'.join(lines) + '\n'
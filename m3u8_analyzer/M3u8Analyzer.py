@@ -4,15 +4,29 @@ import shutil
 import stat
 import subprocess
 import sys
+import tempfile
+import threading
 import time
-from typing import List, Dict, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Dict, Optional, Sequence, Tuple, Iterable, Iterator, Union
 import requests
 from colorama import Fore, Style
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import padding
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from .__config__ import Configurate
-from .exeptions import M3u8Error, M3u8NetworkingError, M3u8FileError, M3u8FfmpegDownloadError
+from .exeptions import M3u8Error, M3u8NetworkingError, M3u8FileError, M3u8FfmpegDownloadError, M3u8DownloadError, \
+    M3u8AnalyzerExceptions
+from .network import DEFAULT_CHUNK_SIZE, HEADERS_DEFAULT, HttpSession, get_default_session, read_into_file
+from .retry import RetryPolicy, get_default_policy
+from .throttle import Throttle, get_default_throttle, job_throttle
+from .cache import HttpCache, get_default_cache
+from .mirrors import MirrorPool
+from .keys import KeyCache, SegmentDecryptor, get_default_key_cache, segment_iv
+from .singleflight import SingleFlight, get_default_flight, request_key
+from .batch import parse_many
+from .journal import DownloadJournal
+from .playlist import InitSection, Playlist, PlaylistParser, Segment, iter_segments
+from .segment_table import SegmentTable
+from .serializer import dumps, load_snapshot, save_snapshot
+from .variant_index import VariantIndex
 
 parser = Configurate()
 parser.configure()
@@ -24,6 +38,8 @@ __ossystem = os.name
 HOME = INSTALL_DIR
 ffmpeg_bin = os.path.join(INSTALL_DIR, FFMPEG_BINARY)
 temp_dir = os.path.devnull
+# Caixas ISO BMFF que podem abrir um segmento fMP4 ou uma seção de inicialização (#EXT-X-MAP)
+_CAIXAS_ISO_BMFF = (b'ftyp', b'styp', b'moof', b'sidx', b'moov', b'emsg', b'prft', b'free', b'skip', b'mdat')
 
 
 class M3u8Analyzer:
@@ -34,7 +50,9 @@ class M3u8Analyzer:
         pass
 
     @staticmethod
-    def get_m3u8(url_m3u8: str, headers: dict = None, save_in_file=None, timeout: int = None):
+    def get_m3u8(url_m3u8: str, headers: dict = None, save_in_file=None, timeout: int = None,
+                 session: HttpSession = None, retry: RetryPolicy = None, cache: HttpCache = None,
+                 flight: SingleFlight = None):
         """
         Obtém o conteúdo de um arquivo M3U8 a partir de uma URL HLS.
 
@@ -45,7 +63,12 @@ class M3u8Analyzer:
         HTTP opcionais para a requisição. Se não forem fornecidos, serão usados cabeçalhos padrão. save_in_file (str,
         optional): Nome do arquivo para salvar o conteúdo M3U8. Se fornecido, o conteúdo da playlist será salvo no
         diretório atual com a extensão `.m3u8`. timeout (int, optional): Tempo máximo (em segundos) para aguardar uma
-        resposta do servidor. O padrão é 20 segundos.
+        resposta do servidor. O padrão é o tempo limite da sessão (20 segundos). session (HttpSession, optional):
+        Sessão com pool de conexões a ser usada. Padrão: a sessão compartilhada da biblioteca. retry (RetryPolicy,
+        optional): Política de novas tentativas para falhas transitórias. Padrão: `get_default_policy()`. cache
+        (HttpCache, optional): Cache HTTP em disco; playlists não modificadas são respondidas pelo servidor com
+        304 e servidas do cache. Padrão: `get_default_cache()` (nenhum). flight (SingleFlight, optional): Agrupa
+        chamadas simultâneas para a mesma URL e cabeçalhos em uma única requisição. Padrão: `get_default_flight()`.
 
         Returns:
             str: O conteúdo do arquivo M3U8 como uma string se a requisição for bem-sucedida.
@@ -79,39 +102,41 @@ class M3u8Analyzer:
         if not (url_m3u8.startswith('https://') or url_m3u8.startswith('http://')):
             raise M3u8Error(f"Este valor não se parece ser uma url válida!")
         try:
-            time = 20
+            session = session or get_default_session()
+            time = session.timeout
             respo = ''
-            headers_default = {
-                "Accept": "application/json, text/plain, */*",
-                "Accept-Encoding": "gzip, deflate, br, zstd",
-                "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
-                "Content-Length": "583",
-                "Content-Type": "text/plain",
-                "Sec-Fetch-Dest": "empty",
-                "Sec-Fetch-Mode": "cors",
-                "Sec-Fetch-Site": "same-origin",
-                "Sec-Ch-Ua": "\"Not:A-Brand\";v=\"99\", \"Google Chrome\";v=\"118\", \"Chromium\";v=\"118\"",
-                "Sec-Ch-Ua-Mobile": "?0",
-                "Sec-Ch-Ua-Platform": "\"Windows\"",
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
-                              "Chrome/118.0.0.0 Safari/537.36"
-            }
-            session = requests.session()
             if timeout:
                 time = timeout
                 if not headers:
-                    headers = headers_default
-            r = session.get(url_m3u8, timeout=time, headers=headers)
-            if r.status_code == 200:
+                    headers = HEADERS_DEFAULT
+            policy = retry or get_default_policy()
+            cache = cache if cache is not None else get_default_cache()
+            flight = flight if flight is not None else get_default_flight()
+
+            def buscar(condicionais=None):
+                cabecalhos = {**(headers or {}), **condicionais} if condicionais else headers
+                return policy.run(url_m3u8, lambda: session.get(url_m3u8, timeout=time, headers=cabecalhos))
+
+            # Cabeçalhos efetivamente enviados (com os da sessão e os cookies): requisições com credenciais
+            # diferentes não compartilham resposta, nem no cache nem no agrupamento
+            enviados = session.request_headers(url_m3u8, headers) if cache is not None or flight is not None else None
+
+            def obter():
+                r = cache.get(url_m3u8, buscar, enviados) if cache is not None else buscar()
+                # O texto é lido aqui para que todas as threads agrupadas recebam o mesmo conteúdo pronto
+                return r.status_code, r.text
+
+            status, texto = flight.do(request_key(url_m3u8, enviados), obter) if flight is not None else obter()
+            if status == 200:
                 # Verificar o conteúdo do arquivo
-                if not "#EXTM3U" in r.text:
+                if not "#EXTM3U" in texto:
                     raise M3u8Error("A URL fornecida não parece ser um arquivo M3U8 válido.")
-                elif "#EXTM3U" in r.text:
+                elif "#EXTM3U" in texto:
                     if save_in_file:
-                        local = os.getcwd()
-                        with open(fr"{local}\{save_in_file}.m3u8", 'a', encoding='utf-8') as e:
-                            e.write(r.text)
-                    return r.text
+                        local = os.path.join(os.getcwd(), f"{save_in_file}.m3u8")
+                        with open(local, 'w', encoding='utf-8') as e:
+                            e.write(texto)
+                    return texto
                 else:
                     return None
             else:
@@ -205,18 +230,12 @@ class M3u8Analyzer:
             print(result)  # Saída esperada: 'Playlist type: <TIPO DA PLAYLIST> not resolutions...'
             ```
         """
-        resolutions = re.findall(r'RESOLUTION=(\d+x\d+)', m3u8_content)
-        if not resolutions:
-            tip = M3u8Analyzer.get_type_m3u8_content(m3u8_content=m3u8_content)
+        playlist = PlaylistParser.parse(m3u8_content)
+        best = VariantIndex.from_playlist(playlist).highest_resolution()
+        if best is None:
+            tip = M3u8Analyzer.get_type_playlist(playlist)
             return f"Playlist type: {Fore.LIGHTRED_EX}{tip}{Style.RESET_ALL} not resolutions..."
-        max_resolution = max(resolutions, key=lambda res: int(res.split('x')[0]) * int(res.split('x')[1]))
-        url = re.search(rf'#EXT-X-STREAM-INF:[^\n]*RESOLUTION={max_resolution}[^\n]*\n([^\n]+)', m3u8_content).group(1)
-        if not url:
-            return max_resolution, None
-        if not max_resolution:
-            return None, url
-        else:
-            return max_resolution, url
+        return best.resolution, best.uri
 
     @staticmethod
     def get_type_m3u8_content(m3u8_content: str) -> str:
@@ -286,31 +305,34 @@ class M3u8Analyzer:
                        mensagem de erro descritiva.
         """
         try:
-            conteudo = m3u8_content
-            if '#EXT-X-STREAM-INF' in conteudo:
-                if '#EXT-X-KEY' in conteudo:
-                    return 'Master encrypted'
-                else:
-                    return 'Master'
-            elif '#EXTINF' in conteudo:
-                if '#EXT-X-KEY' in conteudo:
-                    return 'Segments encrypted'
-                else:
-                    # Verifica se URLs dos segmentos possuem a extensão .ts ou .m4s
-                    segment_urls = re.findall(r'#EXTINF:[0-9.]+,\n([^\n]+)', conteudo)
-                    if all(url.endswith('.ts') for url in segment_urls):
-                        return 'Segments .ts'
-                    elif all(url.endswith('.m4s') for url in segment_urls):
-                        return 'Segments .m4s'
-                    else:
-                        return 'Segments Master'
-            else:
-                return 'Desconhecido'
-        except re.error as e:
-            raise M3u8FileError(f"Erro ao processar o conteúdo M3U8: {str(e)}")
+            return M3u8Analyzer.get_type_playlist(PlaylistParser.parse(m3u8_content))
         except Exception as e:
             raise M3u8FileError(f"Erro inesperado ao processar o conteúdo M3U8: {str(e)}")
 
+    @staticmethod
+    def get_type_playlist(playlist: Playlist) -> str:
+        """
+        Determina o tipo de uma playlist já analisada, sem reprocessar o texto.
+
+        Args:
+            playlist (Playlist): Modelo retornado por `parse_playlist`.
+
+        Returns:
+            str: Os mesmos valores de `get_type_m3u8_content`.
+        """
+        if playlist.is_master:
+            return 'Master encrypted' if playlist.encrypted else 'Master'
+        if playlist.has_extinf:
+            if playlist.encrypted:
+                return 'Segments encrypted'
+            # Verifica se URLs dos segmentos possuem a extensão .ts ou .m4s
+            if all(uri.endswith('.ts') for uri in playlist.segments.iter_uris()):
+                return 'Segments .ts'
+            if all(uri.endswith('.m4s') for uri in playlist.segments.iter_uris()):
+                return 'Segments .m4s'
+            return 'Segments Master'
+        return 'Desconhecido'
+
     @staticmethod
     def get_player_playlist(m3u8_url: str) -> str:
         """
@@ -408,10 +430,12 @@ class M3u8Analyzer:
             ```
 
         """
-        match = re.search(r'#EXT-X-MEDIA:.*URI="([^"]+)"(?:.*,IV=(0x[0-9A-Fa-f]+))?', m3u8_content)
-        if match:
-            return match.group(1)
-        return None
+        renditions = [r for r in PlaylistParser.parse(m3u8_content).renditions if r.uri]
+        for rendition in renditions:
+            if rendition.type == 'AUDIO':
+                return rendition.uri
+        # Sem TYPE=AUDIO: mantém o comportamento anterior e retorna a primeira mídia com URI
+        return renditions[0].uri if renditions else None
 
     @staticmethod
     def get_segments(content: str) -> Dict[str, List[Tuple[str, str]]]:
@@ -433,6 +457,7 @@ class M3u8Analyzer:
                 - 'len' (int): Contagem total de URLs de stream encontradas.
                 - 'enumerated_uris' (List[Tuple[int, str]]): Lista de tuplas contendo a ordem e o URL de cada segmento.
                 - 'resolutions' (Dict[str, str]): Dicionário mapeando resoluções para suas URLs correspondentes.
+                - 'parts' (List[str]): URIs das partes de LL-HLS (#EXT-X-PART), em ordem (vazia fora do LL-HLS).
 
         Raises:
             ValueError: Se o conteúdo fornecido for uma URL em vez de uma string de conteúdo M3U8.
@@ -483,45 +508,25 @@ class M3u8Analyzer:
             ```
 
         """
-        # Expressão regular para verificar se o conteúdo é uma URL HTTP(s)
-        url_pattern = re.compile(r'^https?://', re.IGNORECASE)
-
-        # Verifica se o conteúdo é uma URL HTTP(s)
-        if url_pattern.match(content):
-            raise M3u8Error("O conteúdo não deve ser uma URL, mas sim uma string de uma playlist M3U8.")
-        if content == "NULL":
-            raise M3u8Error("essa url não é de uma playlist m3u8!")
-        # Separação das linhas da playlist, ignorando linhas vazias e comentários
-        urls_segmentos = [linha for linha in content.splitlines() if linha and not linha.startswith('#')]
+        playlist = M3u8Analyzer.parse_playlist(content)
+        uris = playlist.uris()
 
         # Inicializa o dicionário para armazenar os dados dos segmentos
         data_segments = {
-            'uris': urls_segmentos,
+            'uris': uris,
             'urls': [],
             'len': 0,
-            'enumerated_uris': [(index + 1, url) for index, url in enumerate(urls_segmentos)],
+            'enumerated_uris': list(enumerate(uris, start=1)),
             'resolutions': {},
-            'codecs': []
+            'codecs': list(playlist.codecs),
+            'parts': [part.uri for part in playlist.parts]
         }
 
-        # Busca por resoluções na playlist e armazena suas URLs correspondentes
-        resolution_pattern = r'RESOLUTION=(\d+x\d+)'
-        resolutions = re.findall(resolution_pattern, content)
-
-        codec_pattern = r'CODECS="([^"]+)"'
-        codecs = re.findall(codec_pattern, content)
-
-        for res in resolutions:
-            match = re.search(rf'#EXT-X-STREAM-INF:[^\n]*RESOLUTION={re.escape(res)}[^\n]*\n([^\n]+)', content)
-            if match:
-                url = match.group(1)
-                data_segments['urls'].append(url)
-                data_segments['resolutions'][res] = url
-
-        # Adiciona os codecs encontrados, evitando repetições
-        for codec in codecs:
-            if codec not in data_segments['codecs']:
-                data_segments['codecs'].append(codec)
+        # Resoluções das variantes e suas URLs correspondentes (a primeira de cada resolução prevalece)
+        for variant in playlist.variants:
+            if variant.resolution:
+                data_segments['urls'].append(variant.uri)
+                data_segments['resolutions'].setdefault(variant.resolution, variant.uri)
 
         # Adiciona a contagem de URLs de stream encontradas ao dicionário
         data_segments['len'] = len(data_segments['urls'])
@@ -529,6 +534,176 @@ class M3u8Analyzer:
         # Retorna o dicionário com todas as informações encontradas
         return data_segments
 
+    @staticmethod
+    def parse_playlist(content: str) -> Playlist:
+        """
+        Analisa o conteúdo de uma playlist M3U8 em uma única passada e retorna o modelo tipado.
+
+        Todos os demais métodos de análise (`get_segments`, `get_type_m3u8_content`, `get_high_resolution`,
+        `get_audio_playlist`) são visões sobre este modelo.
+
+        Args:
+            content (str): Conteúdo da playlist M3U8 como uma string. Não deve ser uma URL.
+
+        Returns:
+            Playlist: Modelo com variantes, mídias alternativas e segmentos (com o contexto de
+            #EXTINF, #EXT-X-KEY, #EXT-X-MAP e #EXT-X-BYTERANGE de cada um).
+
+        Raises:
+            M3u8Error: Se o conteúdo for uma URL ou a resposta inválida de `get_m3u8`.
+
+        Examples:
+            ```python
+            playlist = M3u8Analyzer.parse_playlist(content)
+            if playlist.is_master:
+                print([v.resolution for v in playlist.variants])
+            else:
+                print(playlist.segments[0].uri, playlist.segments[0].duration)
+            ```
+        """
+        # Verifica se o conteúdo é uma URL HTTP(s)
+        if re.match(r'^https?://', content, re.IGNORECASE):
+            raise M3u8Error("O conteúdo não deve ser uma URL, mas sim uma string de uma playlist M3U8.")
+        if content == "NULL":
+            raise M3u8Error("essa url não é de uma playlist m3u8!")
+        return PlaylistParser.parse(content)
+
+    @staticmethod
+    def get_variant_index(m3u8_content: str) -> VariantIndex:
+        """
+        Constrói um índice das variantes de uma playlist master para seleção rápida de renditions.
+
+        Construa o índice uma vez e reutilize-o: cada consulta é respondida em O(log n).
+
+        Args:
+            m3u8_content (str): Conteúdo da playlist master.
+
+        Returns:
+            VariantIndex: Índice ordenado por BANDWIDTH e por resolução.
+
+        Examples:
+            ```python
+            index = M3u8Analyzer.get_variant_index(master_content)
+            print(index.best_under(2_000_000).uri)
+            print(index.nearest_resolution('1280x720').uri)
+            print(index.highest_with_codec('avc1').resolution)
+            print(index.lowest_with_audio_group('aac').bandwidth)
+            ```
+        """
+        return VariantIndex.from_playlist(M3u8Analyzer.parse_playlist(m3u8_content))
+
+    @staticmethod
+    def parse_many(items: Iterable[Union[str, bytes, os.PathLike]], workers: int = None, chunksize: int = 32,
+                   ordered: bool = True, return_exceptions: bool = False) -> Iterator[Playlist]:
+        """
+        Analisa um grande volume de playlists em paralelo, distribuindo o trabalho em um pool de processos.
+
+        Substitui laços como `for c in contents: M3u8Analyzer.get_segments(c)`, que usam um único núcleo. Os
+        resultados são devolvidos em fluxo, com um número limitado de lotes em andamento.
+
+        Args:
+            items: Conteúdos de playlists (`str`/`bytes`) ou caminhos de arquivos `.m3u8`.
+            workers (int, optional): Número de processos (padrão: número de CPUs).
+            chunksize (int): Quantidade de playlists enviadas a cada processo por vez.
+            ordered (bool): True para manter a ordem da entrada; False para receber conforme concluírem.
+            return_exceptions (bool): Se True, entrega a exceção no lugar do resultado de itens inválidos.
+
+        Yields:
+            Playlist: Modelo compacto e serializável (pickle) de cada playlist.
+
+        Examples:
+            ```python
+            from pathlib import Path
+
+            paths = Path('manifests').glob('**/*.m3u8')
+            for playlist in M3u8Analyzer.parse_many(paths, workers=8, chunksize=64):
+                print(M3u8Analyzer.get_type_playlist(playlist), len(playlist.segments))
+            ```
+        """
+        return parse_many(items, workers=workers, chunksize=chunksize, ordered=ordered,
+                          return_exceptions=return_exceptions)
+
+    @staticmethod
+    def dumps_playlist(playlist: Playlist) -> str:
+        """
+        Converte um modelo de playlist de volta em texto M3U8.
+
+        Args:
+            playlist (Playlist): Modelo retornado por `parse_playlist` (possivelmente modificado).
+
+        Returns:
+            str: Conteúdo M3U8 válido.
+
+        Examples:
+            ```python
+            playlist = M3u8Analyzer.parse_playlist(content)
+            recortada = M3u8Analyzer.parse_playlist(content)
+            recortada.segments = playlist.segments[:10]
+            print(M3u8Analyzer.dumps_playlist(recortada))
+            ```
+        """
+        return dumps(playlist)
+
+    @staticmethod
+    def save_snapshot(playlist: Playlist, path: str):
+        """
+        Grava um snapshot binário de uma playlist analisada, para recarregá-la sem reprocessar o texto.
+
+        Args:
+            playlist (Playlist): Modelo da playlist.
+            path (str): Caminho do arquivo de snapshot.
+        """
+        save_snapshot(playlist, path)
+
+    @staticmethod
+    def load_snapshot(path: str) -> Playlist:
+        """
+        Carrega um snapshot gravado por `save_snapshot`, mapeando o arquivo em memória.
+
+        Args:
+            path (str): Caminho do arquivo de snapshot.
+
+        Returns:
+            Playlist: O modelo da playlist.
+
+        Examples:
+            ```python
+            M3u8Analyzer.save_snapshot(M3u8Analyzer.parse_playlist(content), 'video.m3u8snap')
+            playlist = M3u8Analyzer.load_snapshot('video.m3u8snap')  # em outro processo
+            ```
+        """
+        return load_snapshot(path)
+
+    @staticmethod
+    def iter_segments(source: Union[Iterable[bytes], Iterable[str], bytes, str]) -> Iterator[Segment]:
+        """
+        Gera os segmentos de uma playlist de mídia à medida que o manifesto é recebido.
+
+        Ao contrário de `get_segments`, não exige o conteúdo completo em uma `str` nem monta listas: cada
+        segmento é entregue assim que sua linha chega, mantendo a memória constante mesmo em playlists enormes
+        e permitindo iniciar downloads antes do fim da transferência do manifesto.
+
+        Args:
+            source: Iterável de blocos `bytes` (ex.: `response.iter_content()`), arquivo aberto, resposta
+                    `requests` com `stream=True` ou o próprio conteúdo.
+
+        Yields:
+            Segment: Registro do segmento com `uri`, `duration`, `sequence`, `key`, `init_section` e `byterange`.
+
+        Examples:
+            ```python
+            import requests
+
+            with requests.get("https://example.com/video.m3u8", stream=True) as resp:
+                for segment in M3u8Analyzer.iter_segments(resp):
+                    print(segment.sequence, segment.uri)
+
+            with open("playlist.m3u8", "rb") as f:
+                total = sum(s.duration or 0 for s in M3u8Analyzer.iter_segments(f))
+            ```
+        """
+        return iter_segments(source)
+
 
 class EncryptSuport:
     """
@@ -542,18 +717,29 @@ class EncryptSuport:
         """
 
     @staticmethod
-    def get_url_key_m3u8(m3u8_content: str, player: str, headers=None):
+    def get_url_key_m3u8(m3u8_content: str, player: str, headers=None, session: HttpSession = None,
+                         retry: RetryPolicy = None, throttle: Throttle = None, key_cache: KeyCache = None,
+                         flight: SingleFlight = None):
         """
             Extrai a URL da chave de criptografia AES-128 e o IV (vetor de inicialização) de um conteúdo M3U8.
 
-            Este método analisa o conteúdo M3U8 para localizar a URL da chave de criptografia e o IV, se disponível.
-            Em seguida, faz uma requisição HTTP para obter a chave em formato hexadecimal.
+            Este método analisa o conteúdo M3U8 para localizar a primeira #EXT-X-KEY AES-128 (com URI) e o IV, se
+            disponível. Em seguida, obtém a chave em formato hexadecimal pelo cache de chaves (uma requisição HTTP
+            por URI enquanto a chave for válida). Para playlists com rotação de chaves, use `get_segment_keys`.
 
             Args:
                 m3u8_content (str): String contendo o conteúdo do arquivo M3U8.
                 player (str): URL base para formar o URL completo da chave, se necessário.
                 headers (dict, optional): Cabeçalhos HTTP opcionais para a requisição da chave. Se não fornecido,
                                           cabeçalhos padrão serão utilizados.
+                session (HttpSession, optional): Sessão com pool de conexões a ser usada. Padrão: a sessão
+                                                 compartilhada da biblioteca.
+                retry (RetryPolicy, optional): Política de novas tentativas. Padrão: `get_default_policy()`.
+                throttle (Throttle, optional): Limite de requisições por segundo. Padrão: `get_default_throttle()`.
+                key_cache (KeyCache, optional): Cache de chaves; a chave só é buscada se não estiver guardada.
+                                                Padrão: `get_default_key_cache()`.
+                flight (SingleFlight, optional): Agrupa buscas simultâneas da mesma chave. Padrão:
+                                                 `get_default_flight()`.
 
             Returns:
                 dict: Um dicionário contendo as seguintes chaves:
@@ -587,84 +773,171 @@ class EncryptSuport:
             Raises:
                 requests.HTTPError: Se a requisição HTTP para a chave falhar.
             """
-        pattern = r'#EXT-X-KEY:.*URI="([^"]+)"(?:.*,IV=(0x[0-9A-Fa-f]+))?'
-        match = re.search(pattern, m3u8_content)
-        data = {}
-        if match:
-            url_key = f"{player}{match.group(1)}"
-            iv_hex = match.group(2)
-            if not headers:
-                headers_default = {
-                    "Accept": "application/json, text/plain, */*",
-                    "Accept-Encoding": "gzip, deflate, br, zstd",
-                    "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
-                    "Content-Length": "583",
-                    "Content-Type": "text/plain",
-                    "Sec-Fetch-Dest": "empty",
-                    "Sec-Fetch-Mode": "cors",
-                    "Sec-Fetch-Site": "same-origin",
-                    "Sec-Ch-Ua": "\"Not:A-Brand\";v=\"99\", \"Google Chrome\";v=\"118\", \"Chromium\";v=\"118\"",
-                    "Sec-Ch-Ua-Mobile": "?0",
-                    "Sec-Ch-Ua-Platform": "\"Windows\"",
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko)"
-                                  "Chrome/118.0.0.0 Safari/537.36"
-                }
-                headers = headers_default
+        playlist = PlaylistParser.parse(m3u8_content)
+        chave = next((k for k in playlist.keys if k.method == 'AES-128' and k.uri), None)
+        if chave is None:
+            return None
+        key_bytes = EncryptSuport.get_key(EncryptSuport.__url_chave(chave.uri, player), headers=headers,
+                                          session=session, retry=retry, throttle=throttle, key_cache=key_cache,
+                                          flight=flight)
+        data = {'key': key_bytes.hex()}
+        if chave.iv:
+            data['iv'] = segment_iv(chave, 0).hex()
+        return data
 
-                try:
-                    resp = requests.get(url_key, headers=headers)
-                    resp.raise_for_status()
-                    key_bytes = resp.content
-                    key_hex = key_bytes.hex()
-                    data['key'] = key_hex
-                    if iv_hex:
-                        data['iv'] = iv_hex[2:]  # Remove '0x' prefix
-                    return data
-                except requests.exceptions.InvalidProxyURL as e:
-                    raise M3u8NetworkingError(f"Erro: URL de proxy inválida: {e}")
-                except requests.exceptions.InvalidURL:
-                    raise M3u8NetworkingError("Erro: URL inválida fornecida.")
-                except requests.exceptions.InvalidSchema:
-                    raise M3u8NetworkingError("Erro: URL inválida, esquema não suportado.")
-                except requests.exceptions.MissingSchema:
-                    raise M3u8NetworkingError("Erro: URL inválida, esquema ausente.")
-                except requests.exceptions.InvalidHeader as e:
-                    raise M3u8NetworkingError(f"Erro de cabeçalho inválido: {e}")
-                except ValueError as e:
-                    raise M3u8FileError(f"Erro de valor: {e}")
-                except requests.exceptions.ContentDecodingError as e:
-                    raise M3u8NetworkingError(f"Erro de decodificação de conteúdo: {e}")
-                except requests.exceptions.BaseHTTPError as e:
-                    raise M3u8NetworkingError(f"Erro HTTP básico: {e}")
-                except requests.exceptions.SSLError as e:
-                    raise M3u8NetworkingError(f"Erro SSL: {e}")
-                except requests.exceptions.ProxyError as e:
-                    raise M3u8NetworkingError(f"Erro de proxy: {e}")
-                except requests.exceptions.ConnectionError:
-                    raise M3u8NetworkingError("Erro: O servidor ou o servidor encerrou a conexão.")
-                except requests.exceptions.HTTPError as e:
-                    raise M3u8NetworkingError(f"Erro HTTP: {e}")
-                except requests.exceptions.Timeout:
-                    raise M3u8NetworkingError(
-                        "Erro de tempo esgotado: A conexão com o servidor demorou muito para responder.")
-                except requests.exceptions.TooManyRedirects:
-                    raise M3u8NetworkingError("Erro de redirecionamento: Muitos redirecionamentos.")
-                except requests.exceptions.URLRequired:
-                    raise M3u8NetworkingError("Erro: URL é necessária para a solicitação.")
-                except requests.exceptions.ChunkedEncodingError as e:
-                    raise M3u8NetworkingError(f"Erro de codificação em partes: {e}")
-                except requests.exceptions.StreamConsumedError:
-                    raise M3u8NetworkingError("Erro: Fluxo de resposta já consumido.")
-                except requests.exceptions.RetryError as e:
-                    raise M3u8NetworkingError(f"Erro de tentativa: {e}")
-                except requests.exceptions.UnrewindableBodyError:
-                    raise M3u8NetworkingError("Erro: Corpo da solicitação não pode ser rebobinado.")
-                except requests.exceptions.RequestException as e:
-                    raise M3u8NetworkingError(
-                        f"Erro de conexão: Não foi possível se conectar ao servidor. Detalhes: {e}")
+    @staticmethod
+    def get_segment_keys(m3u8_content: str, player: str, headers=None, session: HttpSession = None,
+                         retry: RetryPolicy = None, throttle: Throttle = None,
+                         key_cache: KeyCache = None) -> List[Optional[Tuple[bytes, bytes]]]:
+        """
+            Resolve a chave AES-128 e o IV de cada segmento de uma playlist de mídia, inclusive com rotação.
+
+            Cada segmento usa a #EXT-X-KEY em vigor na sua posição; o IV é o declarado na tag ou, sem ele, o media
+            sequence do segmento. Cada URI de chave distinta é buscada uma vez, pelo cache de chaves.
+
+            Args:
+                m3u8_content (str): Conteúdo da playlist de mídia.
+                player (str): URL base para URIs de chave relativas.
+                headers, session, retry, throttle, key_cache: Como em `get_url_key_m3u8`.
+
+            Returns:
+                list: (chave, IV) em bytes de cada segmento, na ordem da playlist; None para segmentos sem
+                criptografia (ou com um método diferente de AES-128, que não é descriptografado).
+
+            Examples:
+                ```python
+                chaves = EncryptSuport.get_segment_keys(content, 'https://example.com/video/')
+                key, iv = chaves[0]
+                ```
+            """
+        return EncryptSuport.keys_for_segments(PlaylistParser.parse(m3u8_content).segments, player,
+                                               headers=headers, session=session, retry=retry, throttle=throttle,
+                                               key_cache=key_cache)
+
+    @staticmethod
+    def keys_for_segments(segments: Iterable[Union[Segment, InitSection, None]], player: str, headers=None,
+                          session: HttpSession = None, retry: RetryPolicy = None, throttle: Throttle = None,
+                          key_cache: KeyCache = None) -> List[Optional[Tuple[bytes, bytes]]]:
+        """
+            Como `get_segment_keys`, a partir de unidades já analisadas: segmentos, seções de inicialização
+            (#EXT-X-MAP, com a chave em vigor na tag) ou None (unidade sem chave).
+            """
+        chaves = []
+        obtidas = {}
+        for unidade in segments:
+            chave = unidade.key if unidade is not None else None
+            if chave is None or chave.method != 'AES-128' or not chave.uri:
+                chaves.append(None)
+                continue
+            url_key = EncryptSuport.__url_chave(chave.uri, player)
+            if url_key not in obtidas:
+                obtidas[url_key] = EncryptSuport.get_key(url_key, headers=headers, session=session, retry=retry,
+                                                         throttle=throttle, key_cache=key_cache)
+            # A RFC exige o IV na #EXT-X-KEY de uma seção de inicialização criptografada; sem ele, usa zero
+            sequencia = unidade.sequence if isinstance(unidade, Segment) else 0
+            chaves.append((obtidas[url_key], segment_iv(chave, sequencia)))
+        return chaves
+
+    @staticmethod
+    def __url_chave(uri: str, player: str) -> str:
+        if uri.startswith('https://') or uri.startswith('http://') or not player:
+            return uri
+        return f"{player}{uri}"
 
+    @staticmethod
+    def get_key(url_key: str, headers=None, session: HttpSession = None, retry: RetryPolicy = None,
+                throttle: Throttle = None, key_cache: KeyCache = None, flight: SingleFlight = None) -> bytes:
+        """
+            Obtém os bytes de uma chave AES-128, pelo cache de chaves.
+
+            Requisições simultâneas pela mesma chave (ex.: vários downloads da mesma transmissão) resultam em uma
+            única requisição HTTP, mesmo sem cache; enquanto a entrada do cache for válida, nenhuma nova requisição
+            é feita.
+
+            Args:
+                url_key (str): URL da chave.
+                headers, session, retry, throttle, key_cache, flight: Como em `get_url_key_m3u8`.
+
+            Returns:
+                bytes: A chave.
+
+            Raises:
+                M3u8NetworkingError: Se a requisição falhar.
+                M3u8FileError: Se a resposta não tiver 16 bytes.
+            """
+        if not headers:
+            headers = HEADERS_DEFAULT
+        key_cache = key_cache if key_cache is not None else get_default_key_cache()
+        flight = flight if flight is not None else get_default_flight()
+        session_ = session or get_default_session()
+        # Cabeçalhos efetivamente enviados: chaves pedidas com credenciais diferentes não são compartilhadas
+        enviados = session_.request_headers(url_key, headers) if key_cache is not None or flight is not None \
+            else None
+
+        def buscar() -> bytes:
+            throttle_ = throttle if throttle is not None else get_default_throttle()
+
+            def tentativa():
+                if throttle_ is not None:
+                    throttle_.request(url_key)
+                return session_.get(url_key, headers=headers)
+
+            resp = (retry or get_default_policy()).run(url_key, tentativa)
+            resp.raise_for_status()
+            if len(resp.content) != 16:
+                raise M3u8FileError(f"A chave AES-128 deve ter 16 bytes, recebidos {len(resp.content)}",
+                                    errors=[url_key])
+            return resp.content
+
+        if key_cache is None and flight is not None:
+            # Sem cache, as buscas simultâneas ainda são agrupadas (o cache já agrupa as suas)
+            buscar_chave = lambda: flight.do(request_key(url_key, enviados), buscar)
         else:
-            return None
+            buscar_chave = buscar
+        try:
+            return key_cache.get(url_key, buscar_chave, enviados) if key_cache is not None else buscar_chave()
+        except requests.exceptions.InvalidProxyURL as e:
+            raise M3u8NetworkingError(f"Erro: URL de proxy inválida: {e}")
+        except requests.exceptions.InvalidURL:
+            raise M3u8NetworkingError("Erro: URL inválida fornecida.")
+        except requests.exceptions.InvalidSchema:
+            raise M3u8NetworkingError("Erro: URL inválida, esquema não suportado.")
+        except requests.exceptions.MissingSchema:
+            raise M3u8NetworkingError("Erro: URL inválida, esquema ausente.")
+        except requests.exceptions.InvalidHeader as e:
+            raise M3u8NetworkingError(f"Erro de cabeçalho inválido: {e}")
+        except ValueError as e:
+            raise M3u8FileError(f"Erro de valor: {e}")
+        except requests.exceptions.ContentDecodingError as e:
+            raise M3u8NetworkingError(f"Erro de decodificação de conteúdo: {e}")
+        except requests.exceptions.BaseHTTPError as e:
+            raise M3u8NetworkingError(f"Erro HTTP básico: {e}")
+        except requests.exceptions.SSLError as e:
+            raise M3u8NetworkingError(f"Erro SSL: {e}")
+        except requests.exceptions.ProxyError as e:
+            raise M3u8NetworkingError(f"Erro de proxy: {e}")
+        except requests.exceptions.ConnectionError:
+            raise M3u8NetworkingError("Erro: O servidor ou o servidor encerrou a conexão.")
+        except requests.exceptions.HTTPError as e:
+            raise M3u8NetworkingError(f"Erro HTTP: {e}")
+        except requests.exceptions.Timeout:
+            raise M3u8NetworkingError(
+                "Erro de tempo esgotado: A conexão com o servidor demorou muito para responder.")
+        except requests.exceptions.TooManyRedirects:
+            raise M3u8NetworkingError("Erro de redirecionamento: Muitos redirecionamentos.")
+        except requests.exceptions.URLRequired:
+            raise M3u8NetworkingError("Erro: URL é necessária para a solicitação.")
+        except requests.exceptions.ChunkedEncodingError as e:
+            raise M3u8NetworkingError(f"Erro de codificação em partes: {e}")
+        except requests.exceptions.StreamConsumedError:
+            raise M3u8NetworkingError("Erro: Fluxo de resposta já consumido.")
+        except requests.exceptions.RetryError as e:
+            raise M3u8NetworkingError(f"Erro de tentativa: {e}")
+        except requests.exceptions.UnrewindableBodyError:
+            raise M3u8NetworkingError("Erro: Corpo da solicitação não pode ser rebobinado.")
+        except requests.exceptions.RequestException as e:
+            raise M3u8NetworkingError(
+                f"Erro de conexão: Não foi possível se conectar ao servidor. Detalhes: {e}")
 
 
 class M3u8Downloader:
@@ -679,7 +952,26 @@ class M3u8Downloader:
             player: str = None,
             headers: dict = None,
             segmentsType: str = None,
-            logs: bool = None
+            logs: bool = None,
+            session: HttpSession = None,
+            retry: RetryPolicy = None,
+            workers: int = 1,
+            max_pending: int = None,
+            resume: bool = False,
+            jobs_dir: str = None,
+            throttle: Throttle = None,
+            max_bandwidth: float = None,
+            requests_per_second: float = None,
+            cache: HttpCache = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            mirrors: Union[Sequence[str], MirrorPool] = None,
+            hedge_percentile: float = None,
+            range_workers: int = 4,
+            split_threshold: int = 32 * 1024 * 1024,
+            merge_limit: int = 8 * 1024 * 1024,
+            pipeline: bool = False,
+            validate_workers: int = 2,
+            key_cache: KeyCache = None
     ) -> None:
         """
             Baixa os segmentos de uma playlist M3U8, opcionalmente descriptografa-os, e os combina em um arquivo de vídeo.
@@ -698,6 +990,49 @@ class M3u8Downloader:
                 headers (Optional[dict]): Cabeçalhos HTTP adicionais para as requisições (opcional).
                 segmentsType (Optional[str]): Tipo de segmento de saída, como '.ts' ou '.m4s' (opcional).
                 logs (Optional[bool]): Se True, exibe a saída do processo de download e concatenação.
+                session (Optional[HttpSession]): Sessão com pool de conexões usada para a playlist e todos os
+                    segmentos (padrão: a sessão compartilhada da biblioteca).
+                retry (Optional[RetryPolicy]): Política de novas tentativas (com disjuntor por host, se configurado)
+                    aplicada à playlist e a cada segmento (padrão: `get_default_policy()`).
+                workers (int): Quantidade de segmentos baixados em paralelo (threads). Com 1 (padrão), os segmentos
+                    são baixados um após o outro.
+                max_pending (Optional[int]): Limite de segmentos enviados ao pool e ainda não concluídos
+                    (padrão: `2 * workers`).
+                resume (bool): Se True, o download usa um diretório de trabalho determinístico com um diário
+                    (`DownloadJournal`): em caso de falha os segmentos já baixados são mantidos, e executar de novo
+                    o mesmo download (mesma playlist e saída) baixa apenas os que faltam.
+                jobs_dir (Optional[str]): Diretório base dos trabalhos retomáveis (padrão: diretório temporário do
+                    sistema).
+                throttle (Optional[Throttle]): Limites de banda e de requisições compartilhados com outros
+                    downloads (padrão: `get_default_throttle()`, os limites do processo).
+                max_bandwidth (Optional[float]): Limite de banda deste download, em bytes por segundo.
+                requests_per_second (Optional[float]): Limite de requisições de segmentos por segundo deste
+                    download.
+                cache (Optional[HttpCache]): Cache HTTP usado para a playlist (padrão: `get_default_cache()`).
+                chunk_size (int): Maior bloco lido de uma vez por segmento, em bytes (padrão: 1 MB). O bloco
+                    cresce a partir de 64 KB conforme a conexão entrega dados; com limites de banda ele fica em
+                    no máximo 64 KB para a taxa continuar estável.
+                mirrors (Optional[Union[list, MirrorPool]]): URLs base de espelhos (CDNs) que servem os mesmos
+                    caminhos, usadas no lugar de `player`. Cada segmento vai para o espelho mais saudável e, se
+                    falhar, para o próximo. Passe um `MirrorPool` para compartilhar a saúde dos espelhos entre
+                    downloads.
+                hedge_percentile (Optional[float]): Com `mirrors` em lista, ativa o hedging: um segmento que não
+                    terminar dentro desse percentil (ex.: 0.95) dos tempos recentes é pedido também a outro
+                    espelho e vale a primeira resposta.
+                range_workers (int): Requisições paralelas usadas para um segmento grande (1 desativa a divisão).
+                split_threshold (int): Tamanho, em bytes, a partir do qual um segmento é baixado em sub-faixas
+                    paralelas (padrão: 32 MB). Vale para faixas #EXT-X-BYTERANGE e para objetos cujo servidor
+                    anuncia `Accept-Ranges: bytes`.
+                merge_limit (int): Em playlists com #EXT-X-BYTERANGE sem criptografia, faixas adjacentes do mesmo
+                    recurso são unidas em uma única requisição até esse tamanho (padrão: 8 MB).
+                pipeline (bool): Se True, download (já descriptografando), validação e gravação rodam como
+                    etapas sobrepostas: enquanto segmentos são baixados (`workers` threads), os anteriores são
+                    validados (`validate_workers` threads) e acrescentados, em ordem, a um único arquivo. No máximo
+                    `max_pending` segmentos (padrão: `4 * workers`) ficam entre a primeira e a última etapa. Não
+                    pode ser combinado com `resume`.
+                validate_workers (int): Threads da etapa de validação do contêiner no modo pipeline.
+                key_cache (Optional[KeyCache]): Cache das chaves AES-128 da playlist (padrão:
+                    `get_default_key_cache()`, compartilhado entre downloads).
 
             Returns:
                 None
@@ -735,61 +1070,174 @@ class M3u8Downloader:
             Notes:
                 - O método cria um diretório temporário para armazenar os segmentos baixados e, em seguida, remove-o após a concatenação.
                 - Se ocorrer um erro durante a requisição HTTP ou o processo de concatenação, o método tentará remover arquivos temporários criados.
-                - A chave e o IV fornecidos são usados para descriptografar os segmentos se fornecidos; caso contrário, os segmentos são baixados diretamente.
+                - A chave e o IV fornecidos são usados para descriptografar todos os segmentos. Sem eles, cada segmento
+                  é descriptografado com a #EXT-X-KEY AES-128 em vigor na sua posição (rotação de chaves), com o IV da
+                  tag ou, sem ele, o media sequence do segmento; cada chave distinta é buscada uma vez. Segmentos sem
+                  criptografia são baixados diretamente.
+                - Playlists com #EXT-X-BYTERANGE (ex.: fMP4 em um único arquivo) são baixadas por faixas; a seção
+                  #EXT-X-MAP, se houver, entra no início do arquivo final.
+                - Com `workers > 1`, a ordem de conclusão não altera a ordem do vídeo final: cada segmento é gravado
+                  em um arquivo indexado e a lista de concatenação segue a ordem da playlist. Se um segmento falhar,
+                  os que ainda não começaram são cancelados e os que estão em andamento são interrompidos antes de
+                  o erro ser propagado.
             """
+        global Novideo, Noaudio
         if not M3u8Downloader.__verific_path_bin(binPath=ffmpeg_bin, typePath='file'):
             parser.install_bins()
 
         if not (url_playlist.startswith('http://') or url_playlist.startswith('https://')):
             raise M3u8Error("A URL é inválida!")
-
-        resposta = requests.get(url_playlist, headers=headers)
-        resposta.raise_for_status()
-        playlist = resposta.text
-        urls_segmentos = [linha for linha in playlist.splitlines() if linha and not linha.startswith('#')]
+        if pipeline and resume:
+            raise M3u8Error("pipeline não pode ser combinado com resume!")
+
+        session = session or get_default_session()
+        retry = retry or get_default_policy()
+        cache = cache if cache is not None else get_default_cache()
+
+        flight = get_default_flight()
+
+        def buscar_playlist(condicionais=None):
+            cabecalhos = {**(headers or {}), **condicionais} if condicionais else headers
+            return retry.run(url_playlist, lambda: session.get(url_playlist, headers=cabecalhos))
+
+        # Cabeçalhos efetivamente enviados, com os da sessão e os cookies (chave do cache e do agrupamento)
+        enviados = session.request_headers(url_playlist, headers)
+
+        def obter_playlist() -> str:
+            resposta = cache.get(url_playlist, buscar_playlist, enviados) if cache is not None else buscar_playlist()
+            resposta.raise_for_status()
+            return resposta.text
+
+        playlist = flight.do(request_key(url_playlist, enviados), obter_playlist) if flight is not None \
+            else obter_playlist()
+        key = iv = None
+        if key_hex and iv_hex:
+            key = bytes.fromhex(key_hex)
+            iv = bytes.fromhex(iv_hex)
+        segmentos = None
+        if '#EXT-X-BYTERANGE' in playlist or '#EXT-X-MAP' in playlist:
+            unidades = M3u8Downloader.__unidades_com_faixas(playlist, mesclar=key is None, limite=merge_limit)
+            urls_segmentos = [uri for uri, _, _ in unidades]
+            faixas = [faixa for _, faixa, _ in unidades]
+            segmentos = [segmento for _, _, segmento in unidades]
+        else:
+            urls_segmentos = [linha for linha in playlist.splitlines() if linha and not linha.startswith('#')]
+            faixas = None
+        chaves = None
+        if key is not None and segmentos is not None:
+            # A chave informada vale para os segmentos; a seção de inicialização só é descriptografada quando a
+            # playlist declara uma #EXT-X-KEY AES-128 em vigor na #EXT-X-MAP
+            chaves = [(key, iv) if isinstance(unidade, Segment) or (unidade.key is not None
+                                                                     and unidade.key.method == 'AES-128') else None
+                      for unidade in segmentos]
+        elif key is not None:
+            chaves = [(key, iv)] * len(urls_segmentos)
+        elif '#EXT-X-KEY' in playlist:
+            # Chave em vigor em cada segmento; cada URI de chave é buscada uma vez (cache compartilhado)
+            if segmentos is None:
+                segmentos = list(M3u8Analyzer.parse_playlist(playlist).segments)
+                urls_segmentos = [segmento.uri for segmento in segmentos]
+            base_chaves = player or M3u8Analyzer.get_player_playlist(url_playlist)
+            chaves = EncryptSuport.keys_for_segments(segmentos, base_chaves, headers=headers, session=session,
+                                                     retry=retry, throttle=throttle, key_cache=key_cache)
         arquivos_temporarios = []
         extens = '.ts'
+        if segmentsType:
+            if '.m4s' in segmentsType:
+                extens = '.m4s'
+        pool = None
+        if isinstance(mirrors, MirrorPool):
+            pool = mirrors
+        elif mirrors:
+            pool = MirrorPool(list(mirrors), hedge_percentile=hedge_percentile)
+        journal = None
+        concluido = False
+        if resume:
+            journal = DownloadJournal.for_job(url_playlist, output, jobs_dir=jobs_dir)
+            work_dir = journal.work_dir
+        else:
+            # Diretório de trabalho exclusivo deste download
+            work_dir = tempfile.mkdtemp(prefix='m3u8_analyzer_')
 
         try:
+            urls_completas = []
+            caminhos = []
             for i, url_segmento in enumerate(urls_segmentos):
-                if segmentsType:
-                    if '.m4s' in segmentsType:
-                        extens = '.m4s'
-
-                arquivo_temporario = fr'{temp_dir}\seg_{i}{extens}'
-                arquivos_temporarios.append(arquivo_temporario)
-
-                if not url_segmento.startswith("https://"):
-                    if player:
-                        url_segmento = f"{player}{url_segmento}"
-                    else:
-                        raise ValueError("Não há URL base para os segmentos.")
-
-                if key_hex and iv_hex:
-                    key = bytes.fromhex(key_hex)
-                    iv = bytes.fromhex(iv_hex)
-                    M3u8Downloader.__baixar_segmento(
-                        url_segmento=url_segmento,
-                        path=arquivo_temporario,
-                        key=key,
-                        iv=iv,
-                        headers=headers,
-                        index=i + 1,
-                        total=len(urls_segmentos),
-                        logs=logs
-                    )
+                arquivos_temporarios.append(os.path.join(work_dir, f'seg_{i:06d}{extens}'))
+                caminho = None
+                if url_segmento.startswith("https://") or url_segmento.startswith("http://"):
+                    if pool is not None:
+                        caminho = pool.relative(url_segmento)
+                elif pool is not None:
+                    caminho = url_segmento
+                    # A URL do espelho preferido identifica o segmento (ex.: no diário)
+                    url_segmento = pool.mirrors[0].url(caminho)
+                elif player:
+                    url_segmento = f"{player}{url_segmento}"
                 else:
-                    M3u8Downloader.__baixar_segmento(
-                        url_segmento=url_segmento,
-                        path=arquivo_temporario,
-                        headers=headers,
-                        index=i + 1,
-                        total=len(urls_segmentos),
-                        logs=logs
-                    )
+                    raise ValueError("Não há URL base para os segmentos.")
+                urls_completas.append(url_segmento)
+                caminhos.append(caminho)
+
+            if pipeline:
+                combinado = os.path.join(work_dir, f'combinado{extens}')
+                has_audio, has_video = M3u8Downloader.__baixar_em_pipeline(
+                    urls=urls_completas,
+                    paths=arquivos_temporarios,
+                    destino=combinado,
+                    chaves=chaves,
+                    headers=headers,
+                    logs=logs,
+                    session=session,
+                    retry=retry,
+                    throttle=job_throttle(throttle, max_bandwidth=max_bandwidth,
+                                          requests_per_second=requests_per_second),
+                    chunk_size=chunk_size,
+                    mirrors=pool,
+                    caminhos=caminhos,
+                    faixas=faixas,
+                    range_workers=range_workers,
+                    split_threshold=split_threshold,
+                    workers=workers,
+                    validate_workers=validate_workers,
+                    max_pending=max_pending
+                )
+                Noaudio = None if has_audio else True
+                Novideo = None if has_video else True
+                M3u8Downloader.__ffmpeg_concatener(output=output, extension=extens, arquivos=[combinado],
+                                                   work_dir=work_dir)
+                concluido = True
+                return
+
+            resultados = M3u8Downloader.__baixar_segmentos(
+                urls=urls_completas,
+                paths=arquivos_temporarios,
+                chaves=chaves,
+                headers=headers,
+                logs=logs,
+                session=session,
+                retry=retry,
+                throttle=job_throttle(throttle, max_bandwidth=max_bandwidth,
+                                      requests_per_second=requests_per_second),
+                chunk_size=chunk_size,
+                mirrors=pool,
+                caminhos=caminhos,
+                faixas=faixas,
+                range_workers=range_workers,
+                split_threshold=split_threshold,
+                workers=workers,
+                max_pending=max_pending,
+                journal=journal
+            )
+            # Como no download sequencial, vale o resultado do último segmento da playlist
+            has_audio, has_video = resultados[-1] if resultados else (True, True)
+            Noaudio = None if has_audio else True
+            Novideo = None if has_video else True
 
             # Concatena os segmentos em um arquivo de vídeo final
-            M3u8Downloader.__ffmpeg_concatener(output=output, extension=extens)
+            M3u8Downloader.__ffmpeg_concatener(output=output, extension=extens, arquivos=arquivos_temporarios,
+                                               work_dir=work_dir)
+            concluido = True
 
         except requests.exceptions.ChunkedEncodingError as e:
             raise M3u8NetworkingError(f"Erro de codificação em partes: {e}")
@@ -837,6 +1285,16 @@ class M3u8Downloader:
             raise M3u8NetworkingError(f"Erro HTTP básico: {e}")
 
         finally:
+            if pool is not None and pool is not mirrors:
+                pool.close()
+            if journal is not None:
+                # O diretório do trabalho pertence ao diário: removido só quando o download termina
+                arquivos_temporarios = []
+                work_dir = ''
+                if concluido:
+                    journal.discard()
+                elif logs:
+                    print(f"Download interrompido; {len(journal)} segmentos mantidos em {journal.work_dir}")
             # Remover arquivos temporários
             for arquivo in arquivos_temporarios:
                 if os.path.isfile(arquivo):
@@ -846,16 +1304,53 @@ class M3u8Downloader:
                         print(f"Erro ao remover o arquivo {arquivo}: {e}")
 
             # Remover o diretório temporário
-            if os.path.exists(temp_dir):
+            if work_dir and os.path.exists(work_dir):
                 try:
                     sys.stdout.flush()
-                    shutil.rmtree(temp_dir, onerror=M3u8Downloader.__handle_remove_readonly)
+                    shutil.rmtree(work_dir, onerror=M3u8Downloader.__handle_remove_readonly)
                 except PermissionError as e:
-                    print(f"Permissão negada ao tentar remover o diretório {temp_dir}: {e}")
+                    print(f"Permissão negada ao tentar remover o diretório {work_dir}: {e}")
                 except OSError as e:
-                    print(f"Erro ao remover o diretório {temp_dir}: {e}")
+                    print(f"Erro ao remover o diretório {work_dir}: {e}")
                 except Exception as e:
-                    print(f"Erro inesperado ao remover o diretório {temp_dir}: {e}")
+                    print(f"Erro inesperado ao remover o diretório {work_dir}: {e}")
+
+    @staticmethod
+    def __unidades_com_faixas(playlist: str, mesclar: bool = True,
+                              limite: int = 8 * 1024 * 1024
+                              ) -> List[Tuple[str, Optional[Tuple[int, int]], Union[Segment, InitSection]]]:
+        """
+            Lista o que deve ser baixado de uma playlist com #EXT-X-BYTERANGE/#EXT-X-MAP.
+
+            A seção de inicialização entra antes do primeiro segmento que a usa. Com `mesclar`, faixas adjacentes do
+            mesmo recurso viram uma única unidade, até `limite` bytes (segmentos criptografados não são unidos, pois
+            cada um é descriptografado separadamente com a sua chave e IV).
+            Args:
+                playlist(str): Conteúdo da playlist de mídia.
+                mesclar(bool): Une faixas adjacentes.
+                limite(int): Tamanho máximo de uma unidade unida.
+            Returns:
+                list: (uri, (offset, tamanho) ou None, segmento) de cada unidade, na ordem da playlist; para a seção
+                de inicialização, no lugar do segmento vem a própria `InitSection`.
+            """
+        unidades = []
+        init_atual = None
+        for segmento in M3u8Analyzer.parse_playlist(playlist).segments:
+            init = segmento.init_section
+            if init is not None and init != init_atual:
+                init_atual = init
+                unidades.append((init.uri, (init.byterange.offset, init.byterange.length) if init.byterange else None,
+                                 init))
+            faixa = (segmento.byterange.offset, segmento.byterange.length) if segmento.byterange else None
+            if mesclar and faixa is not None and segmento.key is None and unidades:
+                uri_anterior, anterior, segmento_anterior = unidades[-1]
+                if uri_anterior == segmento.uri and anterior is not None and isinstance(segmento_anterior, Segment) \
+                        and segmento_anterior.key is None and sum(anterior) == faixa[0] \
+                        and anterior[1] + faixa[1] <= limite:
+                    unidades[-1] = (uri_anterior, (anterior[0], anterior[1] + faixa[1]), segmento_anterior)
+                    continue
+            unidades.append((segmento.uri, faixa, segmento))
+        return unidades
 
     @staticmethod
     def __handle_remove_readonly(func, path, exc_info):
@@ -863,12 +1358,270 @@ class M3u8Downloader:
         os.chmod(path, stat.S_IWRITE)
         func(path)
 
+    @staticmethod
+    def __baixar_segmentos(urls: List[str], paths: List[str], chaves: List[Optional[Tuple[bytes, bytes]]] = None,
+                           headers: dict = None, logs=None, session: HttpSession = None,
+                           retry: RetryPolicy = None, throttle: Throttle = None,
+                           chunk_size: int = DEFAULT_CHUNK_SIZE, mirrors: MirrorPool = None,
+                           caminhos: List[Optional[str]] = None, faixas: List[Optional[Tuple[int, int]]] = None,
+                           range_workers: int = 1, split_threshold: int = None, workers: int = 1,
+                           max_pending: int = None, journal: DownloadJournal = None) -> List[Tuple[bool, bool]]:
+        """
+            Baixa todos os segmentos, em sequência ou com um pool de threads.
+
+            No modo concorrente, no máximo `max_pending` segmentos ficam enviados ao pool ao mesmo tempo. Na primeira
+            falha, os segmentos que ainda não começaram são cancelados, os que estão em andamento são interrompidos
+            no próximo bloco lido e o pool é encerrado antes de o erro ser propagado.
+            Args:
+                urls(list): URLs completas dos segmentos, na ordem da playlist.
+                paths(list): Arquivo de destino de cada segmento (mesmo índice de `urls`).
+                chaves(list,opcional): (chave, IV) de cada segmento, ou None para os que não são criptografados.
+                workers(int): Quantidade de downloads simultâneos.
+                max_pending(int,opcional): Limite de segmentos em andamento (padrão: `2 * workers`).
+                mirrors(MirrorPool,opcional): Espelhos dos segmentos.
+                caminhos(list,opcional): Caminho de cada segmento relativo aos espelhos (None: usa a URL).
+                faixas(list,opcional): (offset, tamanho) de cada segmento dentro do recurso, ou None.
+                range_workers(int,opcional): Requisições paralelas por segmento grande.
+                split_threshold(int,opcional): Tamanho a partir do qual um segmento é dividido em sub-faixas.
+                journal(DownloadJournal,opcional): Diário do trabalho; segmentos já concluídos são pulados e cada
+                    novo segmento é registrado assim que termina.
+            Returns:
+                list: (tem áudio, tem vídeo) de cada segmento, na ordem da playlist.
+            """
+        total = len(urls)
+        resultados = [None] * total
+        faltando = []
+
+        def identificador(i: int) -> str:
+            # Faixas do mesmo recurso compartilham a URL; o diário as diferencia pelo intervalo
+            faixa = faixas[i] if faixas else None
+            return urls[i] if faixa is None else f'{urls[i]}#{faixa[0]}-{faixa[1]}'
+
+        for i in range(total):
+            if journal is not None and journal.is_complete(i, identificador(i), paths[i]):
+                resultados[i] = journal.flags(i)
+            else:
+                faltando.append(i)
+        if logs and journal is not None and len(faltando) < total:
+            print(f"Retomando: {total - len(faltando)} de {total} segmentos já baixados")
+        if workers is None or workers <= 1:
+            for i in faltando:
+                url_segmento = urls[i]
+                key, iv = chaves[i] if chaves and chaves[i] else (None, None)
+                resultados[i] = M3u8Downloader.__baixar_segmento(
+                    url_segmento=url_segmento,
+                    path=paths[i],
+                    key=key,
+                    iv=iv,
+                    headers=headers,
+                    index=i + 1,
+                    total=total,
+                    logs=logs,
+                    session=session,
+                    retry=retry,
+                    throttle=throttle,
+                    chunk_size=chunk_size,
+                    mirrors=mirrors,
+                    caminho=caminhos[i] if caminhos else None,
+                    faixa=faixas[i] if faixas else None,
+                    range_workers=range_workers,
+                    split_threshold=split_threshold
+                )
+                if journal is not None:
+                    journal.record(i, identificador(i), paths[i], resultados[i])
+            return resultados
+
+        if max_pending is None:
+            max_pending = workers * 2
+        if max_pending < workers:
+            raise M3u8Error("max_pending deve ser maior ou igual a workers!", errors=[max_pending, workers])
+        cancelado = threading.Event()
+
+        def baixar(i: int):
+            key, iv = chaves[i] if chaves and chaves[i] else (None, None)
+            resultados[i] = M3u8Downloader.__baixar_segmento(
+                url_segmento=urls[i],
+                path=paths[i],
+                key=key,
+                iv=iv,
+                headers=headers,
+                index=i + 1,
+                total=total,
+                logs=logs,
+                session=session,
+                retry=retry,
+                throttle=throttle,
+                chunk_size=chunk_size,
+                mirrors=mirrors,
+                caminho=caminhos[i] if caminhos else None,
+                cancelado=cancelado,
+                faixa=faixas[i] if faixas else None,
+                range_workers=range_workers,
+                split_threshold=split_threshold
+            )
+            if journal is not None:
+                journal.record(i, identificador(i), paths[i], resultados[i])
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='m3u8_segment') as executor:
+            pending = set()
+            try:
+                for i in faltando:
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    pending.add(executor.submit(baixar, i))
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+            except BaseException:
+                # Não deixa downloads órfãos: cancela os que não começaram e interrompe os que estão em andamento
+                cancelado.set()
+                for future in pending:
+                    future.cancel()
+                raise
+        return resultados
+
+    @staticmethod
+    def __baixar_em_pipeline(urls: List[str], paths: List[str], destino: str,
+                             chaves: List[Optional[Tuple[bytes, bytes]]] = None, headers: dict = None, logs=None,
+                             session: HttpSession = None, retry: RetryPolicy = None, throttle: Throttle = None,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE, mirrors: MirrorPool = None,
+                             caminhos: List[Optional[str]] = None, faixas: List[Optional[Tuple[int, int]]] = None,
+                             range_workers: int = 1, split_threshold: int = None, workers: int = 1,
+                             validate_workers: int = 2, max_pending: int = None) -> Tuple[bool, bool]:
+        """
+            Baixa (já descriptografando), valida e grava os segmentos em etapas sobrepostas.
+
+            Etapa 1 (`workers` threads): download do segmento para o disco, descriptografado (AES-128) à medida que
+            os dados chegam. Etapa 2 (`validate_workers` threads): validação do contêiner pelos primeiros bytes do
+            arquivo. Etapa 3 (thread chamadora): copia os segmentos para `destino`, em blocos e na ordem da
+            playlist, e apaga o arquivo de cada um. Nenhum segmento é carregado inteiro na memória.
+
+            Um segmento só entra na etapa 1 quando há menos de `max_pending` segmentos entre ela e a etapa 3, o que
+            limita o disco usado mesmo quando um segmento atrasado segura a gravação. Na primeira falha, todas as
+            etapas são interrompidas antes de o erro ser propagado.
+            Args:
+                urls(list): URLs completas dos segmentos, na ordem da playlist.
+                paths(list): Arquivo temporário de cada segmento.
+                destino(str): Arquivo em que os segmentos são acrescentados.
+                chaves(list,opcional): (chave, IV) de cada segmento, ou None para os que não são criptografados.
+                validate_workers(int): Threads da etapa de validação.
+                max_pending(int,opcional): Segmentos em andamento entre a primeira e a última etapa (padrão:
+                    `4 * workers`).
+            Returns:
+                tuple: (tem áudio, tem vídeo) do arquivo combinado.
+            """
+        total = len(urls)
+        workers = max(workers or 1, 1)
+        if max_pending is None:
+            max_pending = workers * 4
+        if max_pending < workers:
+            raise M3u8Error("max_pending deve ser maior ou igual a workers!", errors=[max_pending, workers])
+        cancelado = threading.Event()
+
+        def processar(i: int, decifrado: bool):
+            if cancelado.is_set():
+                raise M3u8DownloadError(f"Segmento [{i + 1}/{total}] cancelado.")
+            # O suficiente para reconhecer o contêiner (dois pacotes MPEG-TS)
+            with open(paths[i], 'rb') as arquivo_segmento:
+                inicio = arquivo_segmento.read(189)
+            M3u8Downloader.__validar_container(inicio, i + 1, decifrado=decifrado, logs=logs)
+
+        def buscar(i: int):
+            key, iv = chaves[i] if chaves and chaves[i] else (None, None)
+            M3u8Downloader.__baixar_segmento(
+                url_segmento=urls[i],
+                path=paths[i],
+                index=i + 1,
+                total=total,
+                key=key,
+                iv=iv,
+                headers=headers,
+                logs=logs,
+                session=session,
+                retry=retry,
+                throttle=throttle,
+                chunk_size=chunk_size,
+                mirrors=mirrors,
+                caminho=caminhos[i] if caminhos else None,
+                cancelado=cancelado,
+                faixa=faixas[i] if faixas else None,
+                range_workers=range_workers,
+                split_threshold=split_threshold,
+                processar=False
+            )
+            # Encadeia a próxima etapa assim que o download termina
+            return validadores.submit(processar, i, bool(key and iv))
+
+        validadores = ThreadPoolExecutor(max_workers=max(validate_workers, 1), thread_name_prefix='m3u8_validate')
+        # `validadores` é encerrado por último: os downloads em andamento ainda enviam trabalho para ele
+        with validadores, ThreadPoolExecutor(max_workers=workers, thread_name_prefix='m3u8_segment') as buscadores, \
+                open(destino, 'wb') as saida:
+            futuros = {}
+            proximo = 0
+
+            def gravar_proximo():
+                nonlocal proximo
+                futuros.pop(proximo).result().result()
+                with open(paths[proximo], 'rb') as arquivo_segmento:
+                    shutil.copyfileobj(arquivo_segmento, saida, chunk_size)
+                os.remove(paths[proximo])
+                proximo += 1
+                if logs:
+                    print(f"Gravado [{proximo}/{total}]")
+
+            try:
+                for i in range(total):
+                    while i - proximo >= max_pending:
+                        gravar_proximo()
+                    futuros[i] = buscadores.submit(buscar, i)
+                while proximo < total:
+                    gravar_proximo()
+            except BaseException:
+                cancelado.set()
+                for futuro in futuros.values():
+                    futuro.cancel()
+                raise
+        return M3u8Downloader.__verificar_audio(destino), M3u8Downloader.__verificar_video(destino)
+
+    @staticmethod
+    def __validar_container(dados: bytes, index: int, decifrado: bool = False, logs=None):
+        """
+            Confere se o segmento começa como um contêiner conhecido: MPEG-TS, caixas ISO BMFF (fMP4) ou áudio
+            empacotado (ID3/ADTS). O tipo vem do próprio conteúdo, não da extensão: seções #EXT-X-MAP e fMP4 em
+            byte-range costumam usar `.mp4` ou URLs sem extensão.
+
+            Após a descriptografia, um contêiner irreconhecível indica chave ou IV incorretos e é um erro; sem
+            criptografia, apenas avisa (há servidores que disfarçam os segmentos).
+            Raises:
+                M3u8FileError: Se `decifrado` for True e o conteúdo não for reconhecido.
+            """
+        valido = bool(dados) and (
+            # Pacotes MPEG-TS de 188 bytes começam com o byte de sincronismo 0x47
+            (dados[0] == 0x47 and (len(dados) <= 188 or dados[188] == 0x47))
+            or dados[4:8] in _CAIXAS_ISO_BMFF
+            # Áudio empacotado: tag ID3 com o timestamp ou quadro ADTS/MPEG
+            or dados[:3] == b'ID3' or (dados[0] == 0xFF and len(dados) > 1 and dados[1] & 0xE0 == 0xE0))
+        if valido:
+            return
+        if decifrado:
+            raise M3u8FileError(f"Segmento [{index}] inválido após a descriptografia: verifique a chave e o IV.")
+        if logs:
+            print(f"Aviso: segmento [{index}] não parece um contêiner de mídia válido.")
+
     @staticmethod
     def __baixar_segmento(url_segmento: str, path: str, index, total, key: bytes = None, iv: bytes = None,
-                          headers: dict = None, logs=None):
-        global Novideo, Noaudio
+                          headers: dict = None, logs=None, session: HttpSession = None,
+                          retry: RetryPolicy = None, throttle: Throttle = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, mirrors: MirrorPool = None,
+                          caminho: str = None, cancelado: threading.Event = None,
+                          faixa: Tuple[int, int] = None, range_workers: int = 1,
+                          split_threshold: int = None, processar: bool = True) -> Tuple[bool, bool]:
         """
-            Baixa um segmento de vídeo e, se necessário, o descriptografa.
+            Baixa um segmento de vídeo e, se necessário, o descriptografa à medida que os dados chegam (o arquivo
+            é gravado uma única vez, já em texto claro).
             Em seguida, verifica se o vídeo possui áudio.
             Args:
                 url_segmento(str): URL do segmento.
@@ -877,56 +1630,163 @@ class M3u8Downloader:
                 iv(bytes,opcional): IV (vetor de inicialização) em bytes (opcional).
                 headers(dict,opcional): Cabeçalhos HTTP adicionais para a requisição (opcional).
                 logs(bool,opcional): Exibe o progresso.
-            Returns: 
-                  None
+                session(HttpSession,opcional): Sessão com pool de conexões (padrão: a compartilhada).
+                retry(RetryPolicy,opcional): Política de novas tentativas; cada tentativa baixa o segmento inteiro.
+                throttle(Throttle,opcional): Limites de banda e de requisições, aplicados a cada bloco lido.
+                chunk_size(int,opcional): Maior bloco lido de uma vez (ver `read_into_file`).
+                mirrors(MirrorPool,opcional): Espelhos; com `caminho`, o segmento é pedido a eles com failover e
+                    hedging em vez de `url_segmento`.
+                caminho(str,opcional): Caminho do segmento relativo aos espelhos.
+                cancelado(threading.Event,opcional): Quando sinalizado, o download é interrompido.
+                faixa(tuple,opcional): (offset, tamanho) do segmento dentro do recurso (#EXT-X-BYTERANGE).
+                range_workers(int,opcional): Requisições paralelas por segmento grande.
+                split_threshold(int,opcional): Tamanho a partir do qual o segmento é dividido em `range_workers`
+                    sub-faixas baixadas em paralelo e gravadas nos offsets corretos do arquivo. Segmentos sem
+                    faixa só são divididos se o servidor anunciar `Accept-Ranges: bytes`.
+                processar(bool,opcional): Se False, apenas baixa (e descriptografa), sem verificar áudio e vídeo,
+                    para o modo pipeline, que valida e grava os segmentos em outras etapas.
+            Returns:
+                  tuple: (tem áudio, tem vídeo).
             """
-        headers_default = {
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Encoding": "gzip, deflate, br, zstd",
-            "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
-            "Content-Length": "583",
-            "Content-Type": "text/plain",
-            "Sec-Fetch-Dest": "empty",
-            "Sec-Fetch-Mode": "cors",
-            "Sec-Fetch-Site": "same-origin",
-            "Sec-Ch-Ua": "\"Not:A-Brand\";v=\"99\", \"Google Chrome\";v=\"118\", \"Chromium\";v=\"118\"",
-            "Sec-Ch-Ua-Mobile": "?0",
-            "Sec-Ch-Ua-Platform": "\"Windows\"",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
-                          "Chrome/118.0.0.0 Safari/537.36"
-        }
         try:
             if not headers:
-                headers = headers_default
-            resposta = requests.get(url_segmento, headers=headers, stream=True)
-            total_bytes = 0
-            chunk_size = 1024  # Definir o tamanho do chunk (1 KB)
+                headers = HEADERS_DEFAULT
+            if throttle is not None:
+                # Blocos menores mantêm a taxa estável sob limite de banda
+                chunk_size = min(chunk_size, 64 * 1024)
             if logs:
                 print(f"Baixando Segmentos [{index}/{total}]", end=" ")
-            with open(path, 'wb') as arquivo_segmento:
-                for chunk in resposta.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        arquivo_segmento.write(chunk)
-                        total_bytes += len(chunk)
-                arquivo_segmento.close()
-            # Descriptografar se necessário
-            if key and iv:
-                M3u8Downloader.__descriptografar_segmento(path, key, iv, logs)
+            session = session or get_default_session()
+
+            policy = retry or get_default_policy()
+            dividir_acima = split_threshold if range_workers and range_workers > 1 and split_threshold else None
+            decifrar = bool(key and iv)
+
+            def baixar(url: str, destino: str, interromper: threading.Event = None):
+                # Sinalizado quando uma sub-faixa falha, para interromper as demais
+                abortar = threading.Event()
+
+                def bloco(tamanho: int):
+                    if cancelado is not None and cancelado.is_set():
+                        raise M3u8DownloadError(f"Download do segmento [{index}/{total}] cancelado.")
+                    if (interromper is not None and interromper.is_set()) or abortar.is_set():
+                        raise M3u8DownloadError(f"Download do segmento [{index}/{total}] interrompido.")
+                    if throttle is not None:
+                        throttle.data(url, tamanho)
+
+                def baixar_faixa(inicio: int, tamanho: int, deslocamento: int, ultima: bool = True) -> int:
+                    # Baixa os bytes [inicio, inicio + tamanho) do recurso na posição `deslocamento` do arquivo e
+                    # retorna onde a escrita terminou
+                    # Criptografado: uma sub-faixa no meio do segmento pede também o bloco cifrado anterior, que é
+                    # o seu IV no modo CBC
+                    anterior = 16 if decifrar and deslocamento else 0
+                    fim = deslocamento + tamanho
+
+                    def tentativa():
+                        nonlocal fim
+                        if throttle is not None:
+                            throttle.request(url)
+                        cabecalhos = {**headers, 'Range': f'bytes={inicio - anterior}-{inicio + tamanho - 1}'}
+                        with session.get(url, headers=cabecalhos, stream=True) as resposta:
+                            if resposta.status_code >= 400:
+                                return resposta
+                            if resposta.status_code != 206:
+                                raise M3u8DownloadError("O servidor ignorou o cabeçalho Range.", errors=[url])
+                            with open(destino, 'r+b', buffering=0) as arquivo_segmento:
+                                arquivo_segmento.seek(deslocamento)
+                                saida = SegmentDecryptor(arquivo_segmento, key, None if anterior else iv,
+                                                         unpad=ultima) if decifrar else arquivo_segmento
+                                lidos = read_into_file(resposta, saida, chunk_size=chunk_size, on_chunk=bloco)
+                                if lidos != tamanho + anterior:
+                                    raise requests.exceptions.ChunkedEncodingError(
+                                        f"Faixa incompleta: {lidos} de {tamanho + anterior} bytes")
+                                if decifrar:
+                                    fim = deslocamento + saida.finish()
+                        return resposta
+
+                    policy.run(url, tentativa).raise_for_status()
+                    return fim
+
+                def baixar_em_partes(inicio: int, tamanho: int):
+                    with open(destino, 'wb') as arquivo_segmento:
+                        arquivo_segmento.truncate(tamanho)
+                    parte = max(-(-tamanho // range_workers), 1024 * 1024)
+                    if decifrar:
+                        # Sub-faixas alinhadas aos blocos AES, para serem descriptografadas de forma independente
+                        parte = -(-parte // 16) * 16
+                    with ThreadPoolExecutor(max_workers=range_workers, thread_name_prefix='m3u8_range') as executor:
+                        futuros = [executor.submit(baixar_faixa, inicio + deslocamento,
+                                                   min(parte, tamanho - deslocamento), deslocamento,
+                                                   deslocamento + parte >= tamanho)
+                                   for deslocamento in range(0, tamanho, parte)]
+                        try:
+                            for futuro in futuros:
+                                futuro.result()
+                        except BaseException:
+                            abortar.set()
+                            for futuro in futuros:
+                                futuro.cancel()
+                            raise
+                    if decifrar:
+                        # Remove o espaço reservado para o padding retirado da última sub-faixa
+                        with open(destino, 'r+b') as arquivo_segmento:
+                            arquivo_segmento.truncate(futuros[-1].result())
+
+                if faixa is not None:
+                    inicio, tamanho = faixa
+                    if dividir_acima and tamanho > dividir_acima:
+                        baixar_em_partes(inicio, tamanho)
+                    else:
+                        open(destino, 'wb').close()
+                        baixar_faixa(inicio, tamanho, 0)
+                    return
+
+                dividir = 0
+
+                def tentativa():
+                    nonlocal dividir
+                    if throttle is not None:
+                        throttle.request(url)
+                    # O `with` devolve a conexão ao pool da sessão mesmo se a escrita falhar
+                    with session.get(url, headers=headers, stream=True) as resposta:
+                        if resposta.status_code >= 400:
+                            return resposta
+                        if dividir_acima and resposta.headers.get('Accept-Ranges', '').lower() == 'bytes' \
+                                and not resposta.headers.get('Content-Encoding'):
+                            tamanho = int(resposta.headers.get('Content-Length') or 0)
+                            if tamanho > dividir_acima:
+                                # Objeto grande: descarta esta resposta e baixa em sub-faixas paralelas
+                                dividir = tamanho
+                                return resposta
+                        # Sem buffer do Python: os blocos vão do buffer de leitura direto para o arquivo (passando
+                        # pela descriptografia, se houver)
+                        with open(destino, 'wb', buffering=0) as arquivo_segmento:
+                            saida = SegmentDecryptor(arquivo_segmento, key, iv) if decifrar else arquivo_segmento
+                            read_into_file(resposta, saida, chunk_size=chunk_size, on_chunk=bloco)
+                            if decifrar:
+                                saida.finish()
+                    return resposta
+
+                policy.run(url, tentativa).raise_for_status()
+                if dividir:
+                    baixar_em_partes(0, dividir)
+
+            if mirrors is not None and caminho is not None:
+                mirrors.fetch(caminho, path, baixar, cancel=cancelado)
+            else:
+                baixar(url_segmento, path)
+            if not processar:
+                return True, True
             # Verificar se o vídeo tem áudio e vídeo
             has_audio = M3u8Downloader.__verificar_audio(path)
             has_video = M3u8Downloader.__verificar_video(path)
-            if has_audio:
-                Noaudio = None
-            else:
-                if logs:
-                    print(" NOT audio ")
-                Noaudio = True
-            if has_video:
-                Novideo = None
-            else:
-                Novideo = True
-                if logs:
-                    print(" NOT video ")
+            if not has_audio and logs:
+                print(" NOT audio ")
+            if not has_video and logs:
+                print(" NOT video ")
+            return has_audio, has_video
+        except M3u8AnalyzerExceptions:
+            raise
         except FileNotFoundError:
             raise M3u8FileError(f"Erro: Arquivo ou diretório '{path}' não encontrado.")
         except PermissionError:
@@ -955,8 +1815,6 @@ class M3u8Downloader:
             raise M3u8NetworkingError(f"Erro de decodificação de conteúdo: {e}")
         except requests.exceptions.BaseHTTPError as e:
             raise M3u8NetworkingError(f"Erro HTTP básico: {e}")
-        except Exception as e:  # Captura todas as outras exceções, incluindo OSError e IOError
-            raise M3u8FileError(f"Erro inesperado ao manipular arquivo: {e}")
         except requests.exceptions.SSLError as e:
             raise M3u8NetworkingError(f"Erro SSL: {e}")
         except requests.exceptions.ProxyError as e:
@@ -982,81 +1840,8 @@ class M3u8Downloader:
             raise M3u8NetworkingError("Erro: Corpo da solicitação não pode ser rebobinado.")
         except requests.exceptions.RequestException as e:
             raise M3u8NetworkingError(f"Erro de conexão: Não foi possível se conectar ao servidor. Detalhes: {e}")
-
-    @staticmethod
-    def __descriptografar_segmento(path: str, key: bytes, iv: bytes, logs=None):
-        """
-            Descriptografa um segmento de vídeo se necessário.
-
-            Args:
-                path (str): Caminho do arquivo a ser descriptografado.
-                key (bytes): Chave de descriptografia em bytes.
-                iv (bytes): IV (vetor de inicialização) em bytes.
-                logs (bool, optional): Se True, exibe a barra de progresso.
-            Returns:
-                None
-            """
-        try:
-            # Abre o arquivo e lê os bytes do segmento
-            with open(path, 'rb') as arquivo_segmento:
-                segmento_bytes = arquivo_segmento.read()
-
-            # Configura o backend e o cipher
-            backend = default_backend()
-            cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=backend)
-            decryptor = cipher.decryptor()
-            unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
-
-            # Define o tamanho do buffer e o progresso
-            buffer_size = 64 * 1024  # 64 KB
-            total_size = len(segmento_bytes)
-            decrypted_segment = bytearray()
-
-            if logs:
-                # Exibe a barra de progresso se logs for True
-                for i in range(0, total_size, buffer_size):
-                    chunk = segmento_bytes[i:i + buffer_size]
-                    decrypted_chunk = decryptor.update(chunk)
-                    decrypted_segment.extend(decrypted_chunk)
-
-                    # Atualiza a barra de progresso
-                    progress = (i + len(chunk)) / total_size * 100
-                    sys.stdout.write(f'\rDescriptografando: {progress:.2f}%')
-                    sys.stdout.flush()
-
-                decrypted_segment.extend(decryptor.finalize())
-                segment = unpadder.update(decrypted_segment) + unpadder.finalize()
-
-                # Conclui a barra de progresso
-                sys.stdout.write('\rDescriptografado com sucesso!            \n')
-                sys.stdout.flush()
-
-            else:
-                # Sem barra de progresso
-                for i in range(0, total_size, buffer_size):
-                    chunk = segmento_bytes[i:i + buffer_size]
-                    decrypted_chunk = decryptor.update(chunk)
-                    decrypted_segment.extend(decrypted_chunk)
-
-                decrypted_segment.extend(decryptor.finalize())
-                segment = unpadder.update(decrypted_segment) + unpadder.finalize()
-
-            # Escreve o segmento descriptografado de volta ao arquivo
-            with open(path, 'wb') as arquivo_segmento:
-                arquivo_segmento.write(segment)
-
-        except FileNotFoundError as e:
-            # Erro ao abrir ou localizar o arquivo
-            raise M3u8FileError(f"Erro: Arquivo não encontrado - {e}\n")
-        except IOError as e:
-            # Erro de I/O durante leitura ou escrita
-            raise M3u8FileError(f"Erro de I/O ao acessar o arquivo - {e}\n")
-        except ValueError as e:
-            # Erro relacionado ao valor fornecido (por exemplo, chave ou IV incorretos)
-            raise M3u8FileError(f"Erro de valor - {e}\n")
-        except Exception as e:
-            # Captura qualquer outro erro inesperado
-            raise M3u8Error(f"Erro inesperado: {e}\n")
+        except Exception as e:  # Captura todas as outras exceções, incluindo OSError e IOError
+            raise M3u8FileError(f"Erro inesperado ao manipular arquivo: {e}")
 
     @staticmethod
     def __verificar_audio(path: str) -> bool:
@@ -1173,13 +1958,16 @@ class M3u8Downloader:
             return False
 
     @staticmethod
-    def __ffmpeg_concatener(output: str, extension: str):
+    def __ffmpeg_concatener(output: str, extension: str, arquivos: List[str] = None, work_dir: str = temp_dir):
         """
             Concatena os segmentos de vídeo em um único arquivo de vídeo usando FFmpeg.
 
             Args:
                 output (str): Caminho de saída para o vídeo final, incluindo o nome do arquivo e extensão (ex: 'dir/nome.mp4').
                 extension (str): Extensão dos arquivos de vídeo a serem concatenados (ex: '.ts').
+                arquivos (list, optional): Segmentos já na ordem da playlist. Se omitido, os arquivos de `work_dir`
+                    com a extensão informada são ordenados pelo número no nome.
+                work_dir (str): Diretório dos segmentos e da lista de concatenação.
 
             Returns:
                 None
@@ -1187,23 +1975,25 @@ class M3u8Downloader:
         if not M3u8Downloader.__verific_path_bin(binPath=ffmpeg_bin, typePath='file'):
             parser.install_bins()
         # Defina o nome do arquivo de lista
-        arquivo_lista = fr'{temp_dir}\lista.txt'
+        arquivo_lista = os.path.join(work_dir, 'lista.txt')
 
         def extrair_numero(nome_arquivo):
             match = re.search(r'(\d+)', nome_arquivo)
             return int(match.group(1)) if match else float('inf')
 
         # Defina o diretório onde estão os arquivos .ts
-        diretorio_ts = temp_dir
-        # Abre o arquivo lista.txt para escrita
-        with open(arquivo_lista, 'w') as f:
+        diretorio_ts = work_dir
+        if arquivos is None:
             # Lista todos os arquivos no diretório e filtra apenas os arquivos .ts
-            arquivos_ts = [arquivo for arquivo in os.listdir(diretorio_ts) if arquivo.endswith(f'{extension}')]
+            arquivos = [os.path.join(diretorio_ts, arquivo) for arquivo in os.listdir(diretorio_ts)
+                        if arquivo.endswith(f'{extension}')]
             # Ordena os arquivos com base no número extraído
-            arquivos_ts.sort(key=extrair_numero)
+            arquivos.sort(key=lambda caminho: extrair_numero(os.path.basename(caminho)))
+        # Abre o arquivo lista.txt para escrita
+        with open(arquivo_lista, 'w', encoding='utf-8') as f:
             # Escreve cada arquivo no lista.txt
-            for arquivo in arquivos_ts:
-                caminho_absoluto = os.path.join(diretorio_ts, arquivo)
+            for arquivo in arquivos:
+                caminho_absoluto = os.path.abspath(arquivo).replace("'", "'\\''")
                 f.write(f"file '{caminho_absoluto}'\n")
         cmd = [
             fr'{ffmpeg_bin}',
@@ -1229,7 +2019,10 @@ class M3u8Downloader:
         else:
             process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
         index = 0
-        while True:
+        if process.stdout is None:
+            # Saída descartada (Linux/macOS): apenas aguarda o término
+            process.wait()
+        while process.stdout is not None:
             output = process.stdout.readline()
             # print(output.decode('utf-8').strip())
             if process.poll() is not None and output == b'':
@@ -1660,106 +2453,168 @@ class M3u8Downloader:
 class M3U8Playlist:
     """análise de maneira mais limpa de m3u8"""
 
-    def __init__(self, url: str, headers: dict = None):
+    def __init__(self, url: str, headers: dict = None, session: HttpSession = None, content: str = None,
+                 encryption: dict = None, retry: RetryPolicy = None, cache: HttpCache = None):
+        """
+        Args:
+            url (str): URL da playlist.
+            headers (dict, optional): Cabeçalhos HTTP das requisições.
+            session (HttpSession, optional): Sessão com pool de conexões usada para a playlist e a chave.
+            content (str, optional): Conteúdo da playlist já obtido; nesse caso nenhuma requisição é feita
+                                     na criação (usado pela API assíncrona).
+            encryption (dict, optional): Chave e IV já obtidos (mesmo formato de `this_encrypted()`), evitando
+                                         a requisição da chave.
+            retry (RetryPolicy, optional): Política de novas tentativas para a playlist e a chave.
+            cache (HttpCache, optional): Cache HTTP da playlist (também usado por `refresh()`).
+        """
         self.__parsing = M3u8Analyzer()
         self.__url = url
-        self.__version = ''
-        self.__number_segments = []
-        self.__uris = []
-        self.__codecs = []
-        self.__playlist_type = None
         self.__headers = headers
+        self.__session = session
+        self.__retry = retry
+        self.__cache = cache
+        self.__content = None
+        self.__playlist = None
+        self.__variant_index = None
+        self.__encryption = None
+        self.__encryption_loaded = False
         if not (url.startswith('https://') or url.startswith('http://')):
             raise ValueError("O Manifesto deve ser uma URL HTTPS ou HTTP!")
 
-        self.__load_playlist()
+        if content is None:
+            self.__load_playlist()
+        else:
+            self.__content = content
+        if encryption is not None:
+            self.__encryption = encryption
+            self.__encryption_loaded = True
 
     def __load_playlist(self):
         """
-        Método privado para carregar a playlist a partir de uma URL ou arquivo.
+        Método privado para carregar a playlist a partir da URL.
+
+        Faz uma única requisição; a análise e a verificação de criptografia são feitas sob demanda e
+        memorizadas na instância.
         """
-        self.__parsing = M3u8Analyzer()
-        self.__content = self.__parsing.get_m3u8(url_m3u8=self.__url, headers=self.__headers)
-        # Simulação do carregamento de uma playlist para este exemplo:
-        self.__uris = self.__parsing.get_segments(self.__content).get('enumerated_uris')
-        self.__number_segments = len(self.__uris)
-        self.__playlist_type = self.__parsing.get_type_m3u8_content(self.__content)
-        self.__version = self.__get_version_manifest(content=self.__content)
-        self.__resolutions = self.__parsing.get_segments(self.__content).get('resolutions')
-        self.__codecs = self.__parsing.get_segments(self.__content).get('codecs')
+        self.__content = self.__parsing.get_m3u8(url_m3u8=self.__url, headers=self.__headers,
+                                                 session=self.__session, retry=self.__retry,
+                                                 cache=self.__cache)
+        self.__playlist = None
+        self.__variant_index = None
+        self.__encryption = None
+        self.__encryption_loaded = False
+
+    def refresh(self):
+        """
+        Obtém novamente a playlist da URL e descarta os dados memorizados.
+
+        Use quando o manifesto pode ter mudado (ex.: playlists ao vivo) ou a chave foi rotacionada.
+
+        Returns:
+            M3U8Playlist: A própria instância, atualizada.
+        """
+        self.__load_playlist()
+        return self
+
+    @property
+    def playlist(self) -> Playlist:
+        """Modelo da playlist, analisado uma única vez a partir do conteúdo já carregado."""
+        if self.__playlist is None:
+            self.__playlist = self.__parsing.parse_playlist(self.__content)
+        return self.__playlist
 
-    def __get_version_manifest(self, content):
+    def variant_index(self) -> VariantIndex:
+        """
+        Retorna o índice das variantes (construído uma única vez por playlist carregada).
+
+        Returns:
+            VariantIndex: Índice para consultas como `best_under`, `nearest_resolution`, `highest_with_codec`
+            e `lowest_with_audio_group`.
+        """
+        if self.__variant_index is None:
+            self.__variant_index = VariantIndex.from_playlist(self.playlist)
+        return self.__variant_index
+
+    def __get_version_manifest(self):
         """
         Obtém a versão do manifesto #EXTM em uma playlist m3u8.
         #EXT-X-VERSION:4
         #EXT-X-VERSION:3
         etc...
-        :param content: Conteúdo da playlist m3u8.
-        :return: A versão do manifesto encontrada ou None se não for encontrado.
+        :return: A versão do manifesto encontrada ou '#EXT-X-VERSION:Undefined' se não for encontrada.
         """
-        # Expressão regular para encontrar o manifesto
-        pattern = re.compile(r'#EXT-X-VERSION:(\d*)')
-        match = pattern.search(content)
-
-        if match:
-            # Retorna a versão encontrada
-            ver = f"#EXT-X-VERSION:{match.group(1)}"
-            return ver
-
-        else:
-            return '#EXT-X-VERSION:Undefined'  # Default para versão 1 se não houver número
+        version = self.playlist.version
+        if version is None:
+            return '#EXT-X-VERSION:Undefined'
+        return f"#EXT-X-VERSION:{version}"
 
     def get_codecs(self):
         """obter codecs na playlist"""
-        return self.__codecs
+        return self.playlist.codecs
 
     def info(self):
         """
         Retorna informações básicas sobre a playlist.
 
+        Os dados vêm do conteúdo já carregado; a chave de criptografia é obtida no máximo uma vez.
+
         Returns:
             dict: Informações sobre a URL, versão do manifesto, número de segmentos, tipo da playlist, se é criptografada e URIs dos segmentos.
         """
         info = {
             "url": self.__url,
-            "version_manifest": self.__version,
-            "number_of_segments": self.__number_segments,
-            "playlist_type": self.__playlist_type,
-            "codecs": self.__codecs,
-            "encript": self.__is_encrypted(url=self.__url, headers=self.__headers),
-            "uris": self.__uris,
+            "version_manifest": self.version_manifest(),
+            "number_of_segments": self.number_segments(),
+            "playlist_type": self.playlist_type(),
+            "codecs": self.get_codecs(),
+            "encript": self.__is_encrypted(),
+            "uris": self.uris(),
         }
         return info
 
-    def __is_encrypted(self, url, headers: dict = None):
-        parser = M3u8Analyzer()
-        m3u8_content = parser.get_m3u8(url)
-        player = parser.get_player_playlist(url)
-        try:
-            cript = EncryptSuport.get_url_key_m3u8(m3u8_content=m3u8_content,
-                                                   player=player,
-                                                   headers=headers)
-        except Exception as e:
-            raise ValueError(f"erro {e}")
-        return cript
+    def __is_encrypted(self):
+        if not self.__encryption_loaded:
+            player = self.__parsing.get_player_playlist(self.__url)
+            try:
+                self.__encryption = EncryptSuport.get_url_key_m3u8(m3u8_content=self.__content,
+                                                                   player=player,
+                                                                   headers=self.__headers,
+                                                                   session=self.__session,
+                                                                   retry=self.__retry)
+            except Exception as e:
+                raise ValueError(f"erro {e}")
+            self.__encryption_loaded = True
+        return self.__encryption
 
     def this_encrypted(self):
         """
         Verifica se a playlist M3U8 está criptografada.
 
         Returns:
-            bool: True se a playlist estiver criptografada, False caso contrário.
+            dict: Chave e IV em hexadecimal se a playlist estiver criptografada, None caso contrário.
         """
-        return self.__is_encrypted(url=self.__url, headers=self.__headers)
+        return self.__is_encrypted()
 
     def uris(self):
         """
-        Retorna a lista de URIs dos segmentos.
+        Retorna a lista de URIs dos segmentos (ou das variantes, em uma playlist master).
 
         Returns:
-            list: Lista de URIs dos segmentos.
+            list: Lista de tuplas (ordem, URI), como `get_segments()['enumerated_uris']`.
         """
-        return self.__uris
+        playlist = self.playlist
+        if not playlist.variants:
+            return playlist.segments.enumerated_uris()
+        return list(enumerate(playlist.uris(), start=1))
+
+    def segments(self) -> SegmentTable:
+        """
+        Retorna a tabela compacta de segmentos da playlist.
+
+        Returns:
+            SegmentTable: Tabela com acesso por índice e fatiamento; cada item é um `Segment`.
+        """
+        return self.playlist.segments
 
     def version_manifest(self):
         """
@@ -1768,16 +2623,16 @@ class M3U8Playlist:
         Returns:
             str: Versão do manifesto.
         """
-        return self.__version
+        return self.__get_version_manifest()
 
     def number_segments(self):
         """
-        Retorna o número total de segmentos na playlist.
+        Retorna o número total de segmentos na playlist (ou de variantes, em uma playlist master).
 
         Returns:
             int: Número de segmentos.
         """
-        return self.__number_segments
+        return len(self.playlist.segments) + len(self.playlist.variants)
 
     def playlist_type(self):
         """
@@ -1786,7 +2641,7 @@ class M3U8Playlist:
         Returns:
             str: Tipo da playlist.
         """
-        return self.__playlist_type
+        return self.__parsing.get_type_playlist(self.playlist)
 
     def get_resolutions(self):
         """
@@ -1795,11 +2650,7 @@ class M3U8Playlist:
         Returns:
             list: Lista de resoluções.
         """
-        data = self.__resolutions
-        resolutions = []
-        for r in data:
-            resolutions.append(r)
-        return resolutions
+        return list(self.variant_index().resolutions())
 
     def filter_resolution(self, filtering: str):
         """
@@ -1811,18 +2662,16 @@ class M3U8Playlist:
         Returns:
             Optional[str]: URL do segmento correspondente à resolução, ou None se não encontrado.
         """
-        data = self.__resolutions
-        if filtering in data:
-            return data.get(filtering)
-        else:
-            return None
+        variant = self.variant_index().resolution(filtering)
+        return variant.uri if variant else None
 
 
 class Wrapper:
     """Classe para parsear playlists M3U8."""
 
     @staticmethod
-    def parsing_m3u8(url: str, headers: dict = None) -> M3U8Playlist:
+    def parsing_m3u8(url: str, headers: dict = None, session: HttpSession = None,
+                     retry: RetryPolicy = None, cache: HttpCache = None) -> M3U8Playlist:
         """
         Cria uma instância de M3U8Playlist a partir de uma URL de playlist M3U8.
 
@@ -1832,6 +2681,9 @@ class Wrapper:
         Args:
             url (str): URL da playlist M3U8 que deve ser parseada.
             headers (Optional[dict]): Cabeçalhos HTTP adicionais para a requisição (opcional).
+            session (Optional[HttpSession]): Sessão com pool de conexões (padrão: a sessão compartilhada).
+            retry (Optional[RetryPolicy]): Política de novas tentativas (padrão: `get_default_policy()`).
+            cache (Optional[HttpCache]): Cache HTTP da playlist (padrão: `get_default_cache()`).
 
         Returns:
             M3U8Playlist: Uma instância da classe `M3U8Playlist` inicializada com a URL fornecida.
@@ -1855,4 +2707,4 @@ class Wrapper:
             - Certifique-se de que a URL fornecida é uma URL válida e acessível.
             - Se os cabeçalhos forem fornecidos, eles serão utilizados na requisição para obter o conteúdo da playlist.
         """
-        return M3U8Playlist(url=url, headers=headers)
+        return M3U8Playlist(url=url, headers=headers, session=session, retry=retry, cache=cache)
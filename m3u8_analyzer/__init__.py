@@ -1,7 +1,27 @@
 # m3u8_analyzer/__init__.py
 
 from .M3u8Analyzer import M3u8Analyzer, Wrapper,EncryptSuport,M3u8Downloader
+from .network import HttpSession, get_default_session, set_default_session
+from .retry import CircuitBreaker, RetryPolicy, get_default_policy, set_default_policy
+from .throttle import Throttle, TokenBucket, get_default_throttle, set_default_throttle
+from .cache import HttpCache, get_default_cache, set_default_cache
+from .mirrors import Mirror, MirrorPool
+from .keys import KeyCache, get_default_key_cache, set_default_key_cache
+from .singleflight import SingleFlight, get_default_flight, set_default_flight
+from . import aio
+from .journal import DownloadJournal
+from .live import LiveDelta, LiveFollower, LivePlaylist
+from .playlist import Playlist, PlaylistParser
+from .segment_table import SegmentTable
+from .variant_index import VariantIndex
 
-__all__ = ['M3u8Analyzer', 'Wrapper','EncryptSuport','M3u8Downloader']
+__all__ = ['M3u8Analyzer', 'Wrapper','EncryptSuport','M3u8Downloader', 'Playlist', 'PlaylistParser', 'SegmentTable', 'VariantIndex',
+           'LivePlaylist', 'LiveDelta', 'LiveFollower',
+           'HttpSession', 'get_default_session', 'set_default_session', 'DownloadJournal',
+           'RetryPolicy', 'CircuitBreaker', 'get_default_policy', 'set_default_policy',
+           'Throttle', 'TokenBucket', 'get_default_throttle', 'set_default_throttle',
+           'HttpCache', 'get_default_cache', 'set_default_cache', 'Mirror', 'MirrorPool',
+           'KeyCache', 'get_default_key_cache', 'set_default_key_cache',
+           'SingleFlight', 'get_default_flight', 'set_default_flight']
 if __name__ == '__main__':
     raise RuntimeError("no escope!")
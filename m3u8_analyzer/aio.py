@@ -0,0 +1,795 @@
+"""
+API assíncrona (asyncio) para obter playlists, chaves e segmentos.
+
+Todas as requisições passam por um transporte plugável (`AsyncTransport`). Por padrão é usado o `aiohttp`, se
+estiver instalado (`pip install m3u8-analyzer[aio]`); caso contrário, um cliente HTTP/1.1 mínimo com pool de
+conexões keep-alive, implementado apenas com asyncio.
+"""
+import asyncio
+import os
+import ssl
+import tempfile
+import weakref
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urljoin, urlsplit
+
+from .exeptions import M3u8Error, M3u8FileError, M3u8NetworkingError
+from .keys import KeyCache, SegmentDecryptor, get_default_key_cache, segment_iv
+from .network import HEADERS_DEFAULT
+from .playlist import ByteRange, InitSection, PlaylistParser, Segment
+from .retry import RetryPolicy, get_default_policy
+from .throttle import Throttle, get_default_throttle, job_throttle
+
+_REDIRECTS = {301, 302, 303, 307, 308}
+_MAX_REDIRECTS = 10
+_NO_BODY = {204, 304}
+
+
+class AsyncResponse:
+    """Resposta HTTP retornada por um `AsyncTransport`. Use com `async with` para liberar a conexão."""
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str]):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        # Corpo já lido (preenchido por `_fetch`)
+        self.body: Optional[bytes] = None
+
+    def iter_chunks(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Gera o corpo da resposta em blocos (use com `async for`)."""
+        raise NotImplementedError
+
+    async def read(self) -> bytes:
+        """Lê o corpo inteiro."""
+        return b''.join([chunk async for chunk in self.iter_chunks()])
+
+    async def text(self, encoding: str = 'utf-8') -> str:
+        return (await self.read()).decode(encoding, errors='replace')
+
+    async def release(self):
+        """Devolve a conexão ao pool (ou a fecha, se o corpo não foi lido por completo)."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.release()
+
+
+class AsyncTransport:
+    """
+    Interface dos transportes HTTP assíncronos.
+
+    Implemente `request` para usar outro cliente (ou um servidor em processo, nos testes).
+    """
+
+    async def request(self, url: str, headers: Dict[str, str] = None, timeout: float = None) -> AsyncResponse:
+        """
+        Faz uma requisição GET, seguindo redirecionamentos.
+
+        Args:
+            url (str): URL do recurso.
+            headers (dict, optional): Cabeçalhos da requisição.
+            timeout (float, optional): Tempo limite, em segundos, de cada etapa (conexão e leituras).
+
+        Returns:
+            AsyncResponse: A resposta, com o corpo ainda não lido.
+
+        Raises:
+            M3u8NetworkingError: Em falhas de conexão ou tempo esgotado.
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        """Fecha as conexões abertas."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class _Connection:
+    __slots__ = ('reader', 'writer')
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class _StreamResponse(AsyncResponse):
+    def __init__(self, transport: 'StreamTransport', origin: tuple, limit: asyncio.Semaphore,
+                 connection: _Connection, url: str, status: int, headers: Dict[str, str], timeout: Optional[float]):
+        super().__init__(url, status, headers)
+        self._transport = transport
+        self._origin = origin
+        self._limit = limit
+        self._connection = connection
+        self._timeout = timeout
+        self._done = False
+        self._reusable = headers.get('connection', '').lower() != 'close'
+
+    async def _read(self, coroutine):
+        try:
+            return await asyncio.wait_for(coroutine, self._timeout)
+        except asyncio.TimeoutError:
+            raise M3u8NetworkingError(
+                "Erro de tempo esgotado: A conexão com o servidor demorou muito para responder.")
+        except (OSError, asyncio.IncompleteReadError) as e:
+            raise M3u8NetworkingError(f"Erro: O servidor encerrou a conexão durante a leitura: {e}")
+
+    async def iter_chunks(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        if self._done:
+            return
+        reader = self._connection.reader
+        if self.status in _NO_BODY or 100 <= self.status < 200:
+            # Sem corpo, mesmo sem Content-Length: ler até o EOF travaria numa conexão keep-alive
+            pass
+        elif self.headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size_line = await self._read(reader.readline())
+                size = int(size_line.split(b';', 1)[0].strip() or b'0', 16)
+                if size == 0:
+                    # Trailers, até a linha vazia
+                    while (await self._read(reader.readline())).strip():
+                        pass
+                    break
+                remaining = size
+                while remaining:
+                    chunk = await self._read(reader.read(min(chunk_size, remaining)))
+                    if not chunk:
+                        raise M3u8NetworkingError("Erro: resposta em partes incompleta.")
+                    remaining -= len(chunk)
+                    yield chunk
+                await self._read(reader.readexactly(2))
+        elif 'content-length' in self.headers:
+            remaining = int(self.headers['content-length'])
+            while remaining:
+                chunk = await self._read(reader.read(min(chunk_size, remaining)))
+                if not chunk:
+                    raise M3u8NetworkingError("Erro: resposta incompleta.",
+                                              errors=[f'faltam {remaining} bytes'])
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            self._reusable = False
+            while True:
+                chunk = await self._read(reader.read(chunk_size))
+                if not chunk:
+                    break
+                yield chunk
+        self._done = True
+
+    async def release(self):
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        if self._done and self._reusable:
+            self._transport._idle.setdefault(self._origin, []).append(connection)
+        else:
+            connection.close()
+        self._limit.release()
+
+
+class StreamTransport(AsyncTransport):
+    """
+    Cliente HTTP/1.1 mínimo sobre `asyncio.open_connection`, sem dependências externas.
+
+    Mantém conexões keep-alive por host (no máximo `limit_per_host` simultâneas) e segue redirecionamentos.
+    O corpo é sempre pedido sem compressão (`Accept-Encoding: identity`).
+    """
+
+    def __init__(self, limit_per_host: int = 16, ssl_context: ssl.SSLContext = None):
+        """
+        Args:
+            limit_per_host (int): Conexões simultâneas por host; as requisições excedentes aguardam.
+            ssl_context (ssl.SSLContext, optional): Contexto TLS. Padrão: `ssl.create_default_context()`.
+        """
+        self.limit_per_host = limit_per_host
+        self._ssl = ssl_context
+        self._idle: Dict[tuple, List[_Connection]] = {}
+        self._limits: Dict[tuple, asyncio.Semaphore] = {}
+
+    async def _connect(self, origin: tuple, timeout: Optional[float]) -> Tuple[_Connection, bool]:
+        idle = self._idle.get(origin)
+        while idle:
+            connection = idle.pop()
+            if not connection.reader.at_eof():
+                return connection, True
+            connection.close()
+        scheme, host, port = origin
+        context = None
+        if scheme == 'https':
+            context = self._ssl or ssl.create_default_context()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=context, limit=1024 * 1024), timeout)
+        return _Connection(reader, writer), False
+
+    async def _request_once(self, url: str, headers: Dict[str, str], timeout: Optional[float]) -> AsyncResponse:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise M3u8NetworkingError("Erro: URL inválida fornecida.", errors=[url])
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        origin = (parts.scheme, parts.hostname, port)
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        host = parts.netloc.rpartition('@')[2]
+        lines = [f'GET {target} HTTP/1.1', f'Host: {host}']
+        for name, value in (headers or {}).items():
+            if name.lower() not in ('host', 'connection', 'accept-encoding', 'content-length', 'content-type'):
+                lines.append(f'{name}: {value}')
+        lines += ['Accept-Encoding: identity', 'Connection: keep-alive', '', '']
+        payload = '\r\n'.join(lines).encode('latin-1', errors='replace')
+
+        # O semáforo conta as conexões em uso neste host; é liberado em `AsyncResponse.release()`
+        limit = self._limits.setdefault(origin, asyncio.Semaphore(self.limit_per_host))
+        await limit.acquire()
+        try:
+            connection, response_headers, status = await self._exchange(origin, payload, timeout)
+        except BaseException:
+            limit.release()
+            raise
+        return _StreamResponse(self, origin, limit, connection, url, status, response_headers, timeout)
+
+    async def _exchange(self, origin: tuple, payload: bytes, timeout: Optional[float]):
+        for attempt in range(2):
+            try:
+                connection, reused = await self._connect(origin, timeout)
+            except asyncio.TimeoutError:
+                raise M3u8NetworkingError(
+                    "Erro de tempo esgotado: A conexão com o servidor demorou muito para responder.")
+            except OSError as e:
+                raise M3u8NetworkingError(f"Erro: Não foi possível se conectar ao servidor: {e}")
+            try:
+                connection.writer.write(payload)
+                await asyncio.wait_for(connection.writer.drain(), timeout)
+                while True:
+                    status_line = await asyncio.wait_for(connection.reader.readline(), timeout)
+                    if not status_line:
+                        raise ConnectionResetError("conexão encerrada antes da resposta")
+                    headers = {}
+                    while True:
+                        line = await asyncio.wait_for(connection.reader.readline(), timeout)
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                    status = int(status_line.split()[1])
+                    # Respostas informativas (100 Continue, 103 Early Hints) precedem a resposta final
+                    if not 100 <= status < 200 or status == 101:
+                        return connection, headers, status
+            except asyncio.TimeoutError:
+                connection.close()
+                raise M3u8NetworkingError(
+                    "Erro de tempo esgotado: A conexão com o servidor demorou muito para responder.")
+            except (OSError, asyncio.IncompleteReadError) as e:
+                connection.close()
+                # Uma conexão ociosa pode ter sido encerrada pelo servidor: tenta uma vez com uma nova
+                if reused and attempt == 0:
+                    continue
+                raise M3u8NetworkingError(f"Erro: O servidor encerrou a conexão: {e}")
+            except (ValueError, IndexError):
+                connection.close()
+                raise M3u8NetworkingError("Erro: resposta HTTP inválida.", errors=[status_line[:100]])
+            except BaseException:
+                connection.close()
+                raise
+
+    async def request(self, url: str, headers: Dict[str, str] = None, timeout: float = None) -> AsyncResponse:
+        for _ in range(_MAX_REDIRECTS + 1):
+            response = await self._request_once(url, headers, timeout)
+            if response.status not in _REDIRECTS or 'location' not in response.headers:
+                return response
+            await response.read()
+            await response.release()
+            url = urljoin(url, response.headers['location'])
+        raise M3u8NetworkingError("Erro de redirecionamento: Muitos redirecionamentos.", errors=[url])
+
+    async def close(self):
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
+
+
+class _AiohttpResponse(AsyncResponse):
+    def __init__(self, response):
+        super().__init__(str(response.url), response.status, {k.lower(): v for k, v in response.headers.items()})
+        self._response = response
+
+    async def iter_chunks(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        import aiohttp
+        try:
+            async for chunk in self._response.content.iter_chunked(chunk_size):
+                yield chunk
+        except asyncio.TimeoutError:
+            raise M3u8NetworkingError(
+                "Erro de tempo esgotado: A conexão com o servidor demorou muito para responder.")
+        except aiohttp.ClientError as e:
+            raise M3u8NetworkingError(f"Erro de conexão: {e}")
+
+    async def release(self):
+        self._response.release()
+
+
+class AiohttpTransport(AsyncTransport):
+    """Transporte baseado em `aiohttp.ClientSession` (requer `pip install aiohttp`)."""
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 16):
+        """
+        Args:
+            limit (int): Conexões simultâneas no total.
+            limit_per_host (int): Conexões simultâneas por host.
+        """
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError as e:
+            raise M3u8Error("AiohttpTransport requer o pacote aiohttp: pip install m3u8-analyzer[aio]",
+                            errors=[str(e)])
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._session = None
+
+    async def request(self, url: str, headers: Dict[str, str] = None, timeout: float = None) -> AsyncResponse:
+        import aiohttp
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector)
+        try:
+            response = await self._session.get(url, headers=headers, max_redirects=_MAX_REDIRECTS,
+                                               timeout=aiohttp.ClientTimeout(sock_connect=timeout,
+                                                                             sock_read=timeout))
+        except asyncio.TimeoutError:
+            raise M3u8NetworkingError(
+                "Erro de tempo esgotado: A conexão com o servidor demorou muito para responder.")
+        except aiohttp.TooManyRedirects:
+            raise M3u8NetworkingError("Erro de redirecionamento: Muitos redirecionamentos.")
+        except aiohttp.InvalidURL:
+            raise M3u8NetworkingError("Erro: URL inválida fornecida.", errors=[url])
+        except aiohttp.ClientError as e:
+            raise M3u8NetworkingError(f"Erro de conexão: Não foi possível se conectar ao servidor. Detalhes: {e}")
+        return _AiohttpResponse(response)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def default_transport() -> AsyncTransport:
+    """Cria o transporte padrão: `AiohttpTransport` se o aiohttp estiver instalado, senão `StreamTransport`."""
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        return StreamTransport()
+    return AiohttpTransport()
+
+
+# Um transporte padrão por loop de eventos: conexões e semáforos pertencem ao loop em que foram criados
+_defaults: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncTransport]' = weakref.WeakKeyDictionary()
+
+
+def _transport(transport: Optional[AsyncTransport]) -> AsyncTransport:
+    if transport is not None:
+        return transport
+    loop = asyncio.get_running_loop()
+    default = _defaults.get(loop)
+    if default is None:
+        default = _defaults[loop] = default_transport()
+    return default
+
+
+async def _fetch(url: str, headers: dict, timeout: Optional[float], transport: Optional[AsyncTransport],
+                 retry: Optional[RetryPolicy], throttle: Optional[Throttle] = None) -> AsyncResponse:
+    """
+    Faz a requisição com novas tentativas e retorna a resposta já liberada, com o corpo em `body`.
+
+    Com `throttle`, cada tentativa aguarda a vez da requisição e cada bloco lido é contabilizado na banda.
+    """
+    async def attempt():
+        if throttle is not None:
+            await throttle.request_async(url)
+        async with await _transport(transport).request(url, headers=headers, timeout=timeout) as response:
+            if throttle is None:
+                response.body = await response.read()
+            else:
+                body = bytearray()
+                async for chunk in response.iter_chunks():
+                    await throttle.data_async(url, len(chunk))
+                    body += chunk
+                response.body = bytes(body)
+        return response
+
+    return await (retry or get_default_policy()).run_async(url, attempt)
+
+
+async def _download(url: str, path: str, headers: dict, timeout: Optional[float],
+                    transport: Optional[AsyncTransport], retry: Optional[RetryPolicy],
+                    throttle: Optional[Throttle] = None, key: bytes = None, iv: bytes = None,
+                    byte_range: ByteRange = None) -> AsyncResponse:
+    """
+    Como `_fetch`, mas grava o corpo em `path` à medida que chega, sem guardá-lo na memória.
+
+    Com `key` e `iv`, cada bloco é descriptografado (AES-128-CBC) antes de ser gravado e o padding PKCS7 é
+    removido no fim; cada tentativa regrava o arquivo do início. Com `byte_range`, só o intervalo é pedido
+    (#EXT-X-BYTERANGE); se o servidor ignorar o `Range` e enviar o recurso inteiro, o intervalo é recortado
+    durante a leitura.
+
+    Raises:
+        ValueError: Se os dados descriptografados forem inválidos (chave ou IV incorretos).
+    """
+    if byte_range is not None:
+        headers = {**headers, 'Range': byte_range.to_header()}
+
+    async def attempt():
+        if throttle is not None:
+            await throttle.request_async(url)
+        async with await _transport(transport).request(url, headers=headers, timeout=timeout) as response:
+            if response.status >= 400:
+                return response
+            # Bytes a descartar e a gravar quando o servidor responde 200 a um pedido de intervalo
+            skip, remaining = (byte_range.offset, byte_range.length) \
+                if byte_range is not None and response.status != 206 else (0, None)
+            with open(path, 'wb') as file:
+                target = SegmentDecryptor(file, key, iv) if key and iv else file
+                async for chunk in response.iter_chunks():
+                    if throttle is not None:
+                        await throttle.data_async(url, len(chunk))
+                    if skip:
+                        chunk, skip = chunk[skip:], max(skip - len(chunk), 0)
+                    if remaining is not None:
+                        chunk, remaining = chunk[:remaining], remaining - min(len(chunk), remaining)
+                    target.write(chunk)
+                    if remaining == 0:
+                        break
+                if key and iv:
+                    target.finish()
+        return response
+
+    return await (retry or get_default_policy()).run_async(url, attempt)
+
+
+async def get_m3u8(url_m3u8: str, headers: dict = None, timeout: float = 20,
+                   transport: AsyncTransport = None, retry: RetryPolicy = None) -> str:
+    """
+    Versão assíncrona de `M3u8Analyzer.get_m3u8`.
+
+    Args:
+        url_m3u8 (str): URL da playlist.
+        headers (dict, optional): Cabeçalhos HTTP. Padrão: cabeçalhos de navegador.
+        timeout (float): Tempo limite, em segundos.
+        transport (AsyncTransport, optional): Transporte HTTP. Padrão: o transporte compartilhado do módulo.
+        retry (RetryPolicy, optional): Política de novas tentativas. Padrão: `get_default_policy()`.
+
+    Returns:
+        str: O conteúdo da playlist, ou "NULL" se o servidor não responder com 200.
+
+    Raises:
+        M3u8Error: Se a URL ou os cabeçalhos forem inválidos, ou o conteúdo não for uma playlist M3U8.
+        M3u8NetworkingError: Em erros de rede.
+
+    Examples:
+        ```python
+        content = await aio.get_m3u8("https://example.com/playlist.m3u8")
+        ```
+    """
+    if headers and not isinstance(headers, dict):
+        raise M3u8Error("headers deve ser um dicionário válido!", errors=['headers not dict'])
+    if not (url_m3u8.startswith('https://') or url_m3u8.startswith('http://')):
+        raise M3u8Error(f"Este valor não se parece ser uma url válida!")
+    response = await _fetch(url_m3u8, headers or HEADERS_DEFAULT, timeout, transport, retry)
+    content = response.body.decode('utf-8', errors='replace')
+    if response.status != 200:
+        return "NULL"
+    if "#EXTM3U" not in content:
+        raise M3u8Error("A URL fornecida não parece ser um arquivo M3U8 válido.")
+    return content
+
+
+async def _get_key(url_key: str, headers: Optional[dict], timeout: Optional[float],
+                   transport: Optional[AsyncTransport], retry: Optional[RetryPolicy], throttle: Optional[Throttle],
+                   key_cache: Optional[KeyCache]) -> bytes:
+    """Bytes da chave em `url_key`, pelo cache de chaves (padrão: `get_default_key_cache()`)."""
+    key_cache = key_cache if key_cache is not None else get_default_key_cache()
+    headers = headers or HEADERS_DEFAULT
+    key_bytes = key_cache.peek(url_key, headers) if key_cache is not None else None
+    if key_bytes is None:
+        response = await _fetch(url_key, headers, timeout, transport, retry,
+                                throttle if throttle is not None else get_default_throttle())
+        if response.status >= 400:
+            raise M3u8NetworkingError(f"Erro HTTP: {response.status} ao obter a chave", errors=[url_key])
+        key_bytes = response.body
+        if key_cache is not None:
+            key_cache.put(url_key, key_bytes, headers)
+    return key_bytes
+
+
+async def get_url_key_m3u8(m3u8_content: str, player: str, headers: dict = None, timeout: float = 20,
+                           transport: AsyncTransport = None, retry: RetryPolicy = None,
+                           throttle: Throttle = None, key_cache: KeyCache = None) -> Optional[dict]:
+    """
+    Versão assíncrona de `EncryptSuport.get_url_key_m3u8`.
+
+    A chave é consultada no cache de chaves (padrão: `get_default_key_cache()`, o mesmo dos downloads
+    síncronos) antes de qualquer requisição e guardada nele depois.
+
+    Returns:
+        dict: {'key': chave em hexadecimal, 'iv': IV em hexadecimal (se declarado)}, ou None se a playlist não
+        declarar uma chave AES-128 com URI.
+    """
+    chave = next((k for k in PlaylistParser.parse(m3u8_content).keys if k.method == 'AES-128' and k.uri), None)
+    if chave is None:
+        return None
+    url_key = chave.uri
+    if player and not (url_key.startswith('https://') or url_key.startswith('http://')):
+        url_key = f"{player}{url_key}"
+    key_bytes = await _get_key(url_key, headers, timeout, transport, retry, throttle, key_cache)
+    data = {'key': key_bytes.hex()}
+    if chave.iv:
+        data['iv'] = segment_iv(chave, 0).hex()
+    return data
+
+
+class AsyncWrapper:
+    """Versão assíncrona de `Wrapper`."""
+
+    @staticmethod
+    async def parsing_m3u8(url: str, headers: dict = None, transport: AsyncTransport = None,
+                           retry: RetryPolicy = None):
+        """
+        Obtém a playlist (e a chave, se houver) sem bloquear o loop e retorna um `M3U8Playlist` pronto.
+
+        Nenhuma requisição síncrona é feita depois: o conteúdo e a chave já são entregues ao objeto.
+
+        Args:
+            url (str): URL da playlist.
+            headers (dict, optional): Cabeçalhos HTTP.
+            transport (AsyncTransport, optional): Transporte HTTP.
+            retry (RetryPolicy, optional): Política de novas tentativas.
+
+        Returns:
+            M3U8Playlist: A playlist analisada.
+
+        Examples:
+            ```python
+            playlist = await AsyncWrapper.parsing_m3u8("https://example.com/playlist.m3u8")
+            print(playlist.info())
+            ```
+        """
+        # Importação tardia: M3u8Analyzer importa este módulo
+        from .M3u8Analyzer import M3u8Analyzer, M3U8Playlist
+        content = await get_m3u8(url, headers=headers, transport=transport, retry=retry)
+        encryption = None
+        if isinstance(content, str) and '#EXT-X-KEY' in content:
+            encryption = await get_url_key_m3u8(content, M3u8Analyzer.get_player_playlist(url), headers=headers,
+                                                transport=transport, retry=retry)
+        return M3U8Playlist(url=url, headers=headers, content=content, encryption=encryption, retry=retry)
+
+
+class AsyncSegmentDownloader:
+    """
+    Baixa segmentos de forma concorrente em um único loop de eventos.
+
+    A concorrência é limitada por um `asyncio.Semaphore`. Cada segmento vai direto da rede para o disco: os blocos
+    são descriptografados (AES-128) e gravados assim que chegam, então a memória usada não depende do tamanho
+    dos segmentos nem da concorrência.
+
+    Examples:
+        ```python
+        downloader = AsyncSegmentDownloader(concurrency=16)
+        paths = await downloader.download(urls, 'segmentos/')
+        await downloader.remux(paths, 'video.mp4')
+        ```
+    """
+
+    def __init__(self, concurrency: int = 8, headers: dict = None, timeout: float = 20,
+                 transport: AsyncTransport = None, key: bytes = None, iv: bytes = None,
+                 progress: Callable[[int, int], None] = None, retry: RetryPolicy = None,
+                 throttle: Throttle = None):
+        """
+        Args:
+            concurrency (int): Downloads simultâneos.
+            headers (dict, optional): Cabeçalhos HTTP. Padrão: cabeçalhos de navegador.
+            timeout (float): Tempo limite de cada etapa da requisição, em segundos.
+            transport (AsyncTransport, optional): Transporte HTTP.
+            key (bytes, optional): Chave AES-128 para descriptografar os segmentos.
+            iv (bytes, optional): IV usado com a chave.
+            progress (callable, optional): Chamado com (concluídos, total) a cada segmento.
+            retry (RetryPolicy, optional): Política de novas tentativas de cada segmento.
+            throttle (Throttle, optional): Limites de banda e de requisições. Padrão: `get_default_throttle()`.
+        """
+        if concurrency < 1:
+            raise M3u8Error("concurrency deve ser maior que zero!")
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.headers = headers or HEADERS_DEFAULT
+        self.timeout = timeout
+        self.transport = transport
+        self.key = key
+        self.iv = iv
+        self.progress = progress
+        self.retry = retry
+        self.throttle = throttle if throttle is not None else get_default_throttle()
+
+    async def fetch(self, url: str, path: str, byte_range: ByteRange = None) -> str:
+        """
+        Baixa um segmento (ou o intervalo `byte_range` dele) para `path`, descriptografando se houver chave.
+
+        Returns:
+            str: O caminho gravado.
+        """
+        return await self._fetch_unit(url, path, byte_range, self.key, self.iv)
+
+    async def _fetch_unit(self, url: str, path: str, byte_range: Optional[ByteRange], key: Optional[bytes],
+                          iv: Optional[bytes]) -> str:
+        try:
+            async with self.semaphore:
+                response = await _download(url, path, self.headers, self.timeout, self.transport, self.retry,
+                                           self.throttle, key, iv, byte_range)
+        except ValueError as e:
+            raise M3u8FileError(f"Erro de valor - {e}")
+        except OSError as e:
+            raise M3u8FileError(f"Erro ao gravar o segmento '{path}': {e}")
+        if response.status >= 400:
+            raise M3u8NetworkingError(f"Erro HTTP: {response.status}", errors=[url])
+        return path
+
+    async def download(self, urls: List[str], directory: str, extension: str = '.ts',
+                       ranges: List[Optional[ByteRange]] = None,
+                       keys: List[Optional[Tuple[bytes, bytes]]] = None) -> List[str]:
+        """
+        Baixa todos os segmentos para `directory`, em arquivos nomeados pela posição na playlist.
+
+        Se um segmento falhar, os demais downloads são cancelados antes de o erro ser propagado.
+
+        Args:
+            urls (list): URLs dos segmentos, na ordem da playlist.
+            directory (str): Diretório dos arquivos.
+            extension (str): Extensão dos arquivos.
+            ranges (list, optional): Intervalo (#EXT-X-BYTERANGE) de cada URL, ou None para o recurso inteiro.
+            keys (list, optional): Par (chave, IV) de cada URL, ou None para gravá-la como veio. Quando informado,
+                substitui a chave do downloader.
+
+        Returns:
+            list: Caminhos dos arquivos, na ordem de `urls`.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = [os.path.join(directory, f'seg_{i:06d}{extension}') for i in range(len(urls))]
+        ranges = ranges if ranges is not None else [None] * len(urls)
+        if keys is None:
+            keys = [(self.key, self.iv) if self.key and self.iv else None] * len(urls)
+        total = len(urls)
+        done = 0
+
+        async def one(url: str, path: str, byte_range: Optional[ByteRange], key: Optional[Tuple[bytes, bytes]]):
+            nonlocal done
+            await self._fetch_unit(url, path, byte_range, *(key or (None, None)))
+            done += 1
+            if self.progress:
+                self.progress(done, total)
+
+        tasks = [asyncio.ensure_future(one(*unit)) for unit in zip(urls, paths, ranges, keys)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return paths
+
+    @staticmethod
+    async def remux(paths: List[str], output: str):
+        """
+        Concatena os segmentos com o ffmpeg (processo assíncrono) na ordem informada.
+
+        Raises:
+            M3u8FileError: Se o ffmpeg terminar com erro.
+        """
+        from .M3u8Analyzer import ffmpeg_bin
+        directory = os.path.dirname(paths[0]) if paths else tempfile.gettempdir()
+        lista = os.path.join(directory, 'lista.txt')
+        with open(lista, 'w', encoding='utf-8') as f:
+            for path in paths:
+                caminho = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{caminho}'\n")
+        process = await asyncio.create_subprocess_exec(
+            ffmpeg_bin, '-y', '-f', 'concat', '-safe', '0', '-i', lista, '-c', 'copy', output,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE)
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise M3u8FileError("Erro ao concatenar os segmentos com o ffmpeg",
+                                errors=[stderr.decode('utf-8', errors='replace')[-500:]])
+
+
+def _resolve(uri: str, player: Optional[str], url_playlist: str) -> str:
+    if uri.startswith('https://') or uri.startswith('http://'):
+        return uri
+    return f"{player}{uri}" if player else urljoin(url_playlist, uri)
+
+
+async def downloader_and_remuxer_segments(url_playlist: str, output: str, key_hex: str = None, iv_hex: str = None,
+                                          player: str = None, headers: dict = None, segmentsType: str = None,
+                                          concurrency: int = 8, transport: AsyncTransport = None,
+                                          progress: Callable[[int, int], None] = None,
+                                          retry: RetryPolicy = None, throttle: Throttle = None,
+                                          max_bandwidth: float = None, requests_per_second: float = None,
+                                          key_cache: KeyCache = None) -> None:
+    """
+    Versão assíncrona de `M3u8Downloader.downloader_and_remuxer_segments`.
+
+    Os segmentos vêm do `PlaylistParser`, como no download síncrono: a seção de inicialização (#EXT-X-MAP) é
+    gravada antes dos segmentos que a usam, intervalos #EXT-X-BYTERANGE são pedidos com `Range`, e cada
+    segmento é descriptografado com a #EXT-X-KEY em vigor nele (inclusive chaves que mudam ao longo da
+    playlist). Com `key_hex` e `iv_hex`, essa chave substitui as da playlist.
+
+    Args:
+        url_playlist (str): URL da playlist de mídia.
+        output (str): Arquivo de saída (ex.: 'video.mp4').
+        key_hex (str, optional): Chave AES-128 em hexadecimal.
+        iv_hex (str, optional): IV em hexadecimal.
+        player (str, optional): URL base para URIs relativas. Sem ela, as URIs são resolvidas a partir da URL da
+            playlist.
+        headers (dict, optional): Cabeçalhos HTTP.
+        segmentsType (str, optional): '.ts' (padrão) ou '.m4s'.
+        concurrency (int): Downloads simultâneos.
+        transport (AsyncTransport, optional): Transporte HTTP.
+        progress (callable, optional): Chamado com (concluídos, total) a cada segmento.
+        retry (RetryPolicy, optional): Política de novas tentativas da playlist e dos segmentos.
+        throttle (Throttle, optional): Limites compartilhados com outros downloads. Padrão: `get_default_throttle()`.
+        max_bandwidth (float, optional): Limite de banda deste download, em bytes por segundo.
+        requests_per_second (float, optional): Limite de requisições de segmentos por segundo deste download.
+        key_cache (KeyCache, optional): Cache das chaves da playlist. Padrão: `get_default_key_cache()`.
+
+    Examples:
+        ```python
+        await aio.downloader_and_remuxer_segments(url, 'video.mp4', concurrency=16)
+        ```
+    """
+    content = await get_m3u8(url_playlist, headers=headers, transport=transport, retry=retry)
+    if content == "NULL":
+        raise M3u8NetworkingError("Erro: o servidor não retornou a playlist.", errors=[url_playlist])
+    # Seção de inicialização antes do primeiro segmento que a usa (e a cada troca de #EXT-X-MAP)
+    units: List[Union[Segment, InitSection]] = []
+    init_section = None
+    for segment in PlaylistParser.parse(content).segments:
+        if segment.init_section is not None and segment.init_section != init_section:
+            units.append(segment.init_section)
+        init_section = segment.init_section
+        units.append(segment)
+    job = job_throttle(throttle, max_bandwidth=max_bandwidth, requests_per_second=requests_per_second)
+    keys: List[Optional[Tuple[bytes, bytes]]] = []
+    fetched: Dict[str, bytes] = {}
+    for unit in units:
+        key = unit.key
+        encrypted = key is not None and key.method == 'AES-128'
+        if key_hex and iv_hex:
+            # A chave do usuário só não se aplica a uma seção de inicialização em texto claro
+            user_key = (bytes.fromhex(key_hex), bytes.fromhex(iv_hex))
+            keys.append(user_key if isinstance(unit, Segment) or encrypted else None)
+            continue
+        if not encrypted or not key.uri:
+            keys.append(None)
+            continue
+        url_key = _resolve(key.uri, player, url_playlist)
+        if url_key not in fetched:
+            fetched[url_key] = await _get_key(url_key, headers, None, transport, retry, job, key_cache)
+        # A RFC exige o IV na #EXT-X-KEY de uma seção de inicialização criptografada; sem ele, usa zero
+        keys.append((fetched[url_key], segment_iv(key, unit.sequence if isinstance(unit, Segment) else 0)))
+    extension = '.m4s' if segmentsType and '.m4s' in segmentsType else '.ts'
+    downloader = AsyncSegmentDownloader(concurrency=concurrency, headers=headers, transport=transport,
+                                        progress=progress, retry=retry, throttle=job)
+    work_dir = tempfile.mkdtemp(prefix='m3u8_analyzer_')
+    try:
+        paths = await downloader.download([_resolve(unit.uri, player, url_playlist) for unit in units], work_dir,
+                                          extension, ranges=[unit.byterange for unit in units], keys=keys)
+        await downloader.remux(paths, output)
+    finally:
+        await asyncio.to_thread(_remove_tree, work_dir)
+
+
+def _remove_tree(path: str):
+    import shutil
+    shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,127 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator, List, Union
+
+from .exeptions import M3u8AnalyzerExceptions, M3u8Error, M3u8FileError
+from .playlist import Playlist, PlaylistParser
+
+Source = Union[str, bytes, os.PathLike]
+
+
+def _read_source(item: Source) -> str:
+    """Retorna o conteúdo da playlist: o próprio item ou o arquivo para o qual ele aponta."""
+    if isinstance(item, (bytes, bytearray)):
+        return bytes(item).decode('utf-8-sig', errors='replace')
+    if isinstance(item, str) and ('#EXTM3U' in item or '\n' in item):
+        return item
+    if isinstance(item, (str, os.PathLike)):
+        try:
+            with open(item, 'r', encoding='utf-8-sig', errors='replace') as f:
+                return f.read()
+        except OSError as e:
+            raise M3u8FileError(f"Erro ao ler a playlist '{item}': {e}")
+    raise M3u8Error("Cada item deve ser o conteúdo de uma playlist ou o caminho de um arquivo .m3u8",
+                    errors=[type(item).__name__])
+
+
+def _parse_one(item: Source) -> Playlist:
+    playlist = PlaylistParser.parse(_read_source(item))
+    # Compacta a tabela antes de enviar o resultado de volta ao processo principal
+    playlist.segments.compact()
+    return playlist
+
+
+def _parse_chunk(items: List[Source], return_exceptions: bool) -> list:
+    results = []
+    for item in items:
+        try:
+            results.append(_parse_one(item))
+        except M3u8AnalyzerExceptions as e:
+            if not return_exceptions:
+                raise
+            results.append(e)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            # Qualquer outra falha vira M3u8Error: não derruba o lote e sempre pode voltar do processo filho
+            results.append(M3u8Error(f"Erro inesperado ao analisar a playlist: {e}", errors=[type(e).__name__]))
+    return results
+
+
+def _chunks(items: Iterable[Source], size: int) -> Iterator[List[Source]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_many(items: Iterable[Source], workers: int = None, chunksize: int = 32, ordered: bool = True,
+               return_exceptions: bool = False) -> Iterator[Union[Playlist, M3u8AnalyzerExceptions]]:
+    """
+    Analisa muitas playlists em paralelo, usando um pool de processos.
+
+    A entrada é consumida aos poucos: no máximo `2 * workers` lotes ficam em andamento ao mesmo tempo, então o
+    uso de memória é limitado mesmo para centenas de milhares de manifestos.
+
+    Args:
+        items: Conteúdos de playlists (`str`/`bytes`) ou caminhos de arquivos `.m3u8`.
+        workers (int, optional): Número de processos. Padrão: `os.cpu_count()`. Com 1, a análise é feita
+                                 no próprio processo.
+        chunksize (int): Quantidade de playlists enviadas a cada processo por vez.
+        ordered (bool): Se True, os resultados saem na ordem da entrada; se False, à medida que ficam prontos.
+        return_exceptions (bool): Se True, erros de análise/leitura são entregues no lugar do resultado em vez
+                                  de interromper o lote (falhas inesperadas como `M3u8Error`).
+
+    Yields:
+        Playlist: O modelo de cada playlist (com `SegmentTable` compacta), ou a exceção correspondente quando
+        `return_exceptions=True`.
+
+    Examples:
+        ```python
+        import glob
+
+        for playlist in parse_many(glob.glob('manifests/*.m3u8'), workers=8):
+            print(len(playlist.segments), playlist.total_duration)
+        ```
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunksize < 1:
+        raise M3u8Error("chunksize deve ser maior que zero!")
+    chunks = _chunks(items, chunksize)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _parse_chunk(chunk, return_exceptions)
+        return
+
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque() if ordered else set()
+        try:
+            for chunk in chunks:
+                future = executor.submit(_parse_chunk, chunk, return_exceptions)
+                if ordered:
+                    pending.append(future)
+                    if len(pending) >= max_pending:
+                        yield from pending.popleft().result()
+                else:
+                    pending.add(future)
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for finished in done:
+                            yield from finished.result()
+            if ordered:
+                while pending:
+                    yield from pending.popleft().result()
+            else:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        yield from finished.result()
+        finally:
+            # Se o consumidor parar no meio ou ocorrer um erro, descarta os lotes que ainda não começaram
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,360 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+from .exeptions import M3u8FileError
+
+_MAX_AGE_RE = re.compile(r'(?:^|,)\s*(?:s-)?max-age\s*=\s*"?(\d+)"?', re.IGNORECASE)
+# Cabeçalhos da requisição que identificam quem pede: o mesmo URL pode ter respostas diferentes para cada um
+_PRIVATE_HEADERS = ('authorization', 'cookie')
+
+
+def default_cache_dir() -> str:
+    """Diretório padrão do cache HTTP."""
+    return os.path.join(tempfile.gettempdir(), 'm3u8_analyzer_cache')
+
+
+def _header(headers: Optional[dict], name: str) -> Optional[str]:
+    """Valor de um cabeçalho da requisição, sem diferenciar maiúsculas (`name` em minúsculas)."""
+    for header, value in (headers or {}).items():
+        if header.lower() == name:
+            return value
+    return None
+
+
+def _credentials(headers: Optional[dict]) -> Tuple[Tuple[str, str], ...]:
+    """Pares (nome, valor) de `Authorization` e `Cookie` da requisição: identificam quem pede."""
+    return tuple((name, value) for name in _PRIVATE_HEADERS if (value := _header(headers, name)) is not None)
+
+
+def _vary(response) -> Optional[list]:
+    """Cabeçalhos listados em `Vary` (em minúsculas), ou None para `Vary: *` (não armazenar)."""
+    names = [name.strip().lower() for name in (response.headers.get('Vary') or '').split(',') if name.strip()]
+    return None if '*' in names else names
+
+
+def _freshness(headers) -> Optional[float]:
+    """
+    Segundos em que a resposta pode ser usada sem revalidar, segundo `Cache-Control` (e `Age`).
+
+    Returns:
+        float: 0 para `no-cache` ou sem `max-age` (revalidar sempre), None para `no-store` (não armazenar).
+    """
+    control = (headers.get('Cache-Control') or '').lower()
+    if 'no-store' in control:
+        return None
+    if 'no-cache' in control:
+        return 0.0
+    match = _MAX_AGE_RE.search(control)
+    if not match:
+        return 0.0
+    try:
+        age = float(headers.get('Age') or 0)
+    except ValueError:
+        age = 0.0
+    return max(float(match.group(1)) - age, 0.0)
+
+
+class CachedResponse:
+    """Resposta servida pelo cache, com a mesma interface usada de `requests.Response`."""
+
+    def __init__(self, url: str, content: bytes, headers: Dict[str, str], encoding: str = None):
+        self.url = url
+        self.status_code = 200
+        self.content = content
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.encoding = encoding or 'utf-8'
+        self.from_cache = True
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class HttpCache:
+    """
+    Cache HTTP em disco para playlists, com revalidação condicional e remoção LRU por tamanho.
+
+    Cada entrada guarda o corpo e os validadores (`ETag`, `Last-Modified`) da resposta. Enquanto estiver fresca
+    (`Cache-Control: max-age`), a entrada é servida sem nenhuma requisição; depois disso, a requisição vai com
+    `If-None-Match`/`If-Modified-Since` e um `304 Not Modified` é respondido com o corpo do cache, custando só a
+    troca de cabeçalhos. Respostas com `no-store` não são guardadas.
+
+    Os cabeçalhos `Authorization` e `Cookie` da requisição fazem parte da chave, então usuários diferentes não
+    recebem a playlist um do outro. Os demais cabeçalhos listados no `Vary` da resposta são guardados com a
+    entrada, que só é usada por requisições com os mesmos valores; respostas com `Vary: *` não são guardadas.
+
+    Quando o total ultrapassa `max_size`, as entradas usadas há mais tempo são removidas. Os arquivos são
+    gravados de forma atômica, e a mesma instância pode ser usada por várias threads (e o mesmo diretório por
+    vários processos).
+
+    Examples:
+        ```python
+        cache = HttpCache(max_size=64 * 1024 * 1024)
+        content = M3u8Analyzer.get_m3u8(url, cache=cache)   # transfere a playlist
+        content = M3u8Analyzer.get_m3u8(url, cache=cache)   # 304: só cabeçalhos
+        ```
+    """
+
+    def __init__(self, directory: str = None, max_size: int = 64 * 1024 * 1024,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            directory (str, optional): Diretório das entradas. Padrão: `default_cache_dir()`.
+            max_size (int): Tamanho máximo, em bytes, somando os corpos guardados.
+            clock (callable): Relógio em segundos (substituível nos testes).
+        """
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+        self.clock = clock
+        self._lock = threading.Lock()
+        # chave -> tamanho do corpo, da entrada usada há mais tempo para a mais recente
+        self._index: 'OrderedDict[str, int]' = OrderedDict()
+        self._size = 0
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            raise M3u8FileError(f"Erro ao criar o diretório do cache '{self.directory}': {e}")
+        self._scan()
+
+    def _scan(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            key = name[:-5]
+            try:
+                used = os.path.getmtime(os.path.join(self.directory, name))
+                size = os.path.getsize(self._body_path(key))
+            except OSError:
+                continue
+            entries.append((used, key, size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._size += size
+        # O limite pode ter diminuído desde a última execução
+        self._evict()
+
+    @staticmethod
+    def key(url: str, headers: dict = None) -> str:
+        """Nome da entrada de `url` pedida com `headers` (só `Authorization` e `Cookie` são considerados)."""
+        material = url
+        for name, value in _credentials(headers):
+            material += f'\n{name}: {value}'
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()[:32]
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.body')
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def size(self) -> int:
+        """Bytes ocupados pelos corpos guardados."""
+        return self._size
+
+    def lookup(self, url: str, headers: dict = None) -> Optional[dict]:
+        """
+        Metadados da entrada de `url` pedida com `headers` (url, etag, last_modified, expires, encoding, vary),
+        ou None se não houver uma entrada para esses cabeçalhos.
+        """
+        key = self.key(url, headers)
+        try:
+            with open(self._meta_path(key), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url:
+            return None
+        if any(_header(headers, name) != value for name, value in (meta.get('vary') or {}).items()):
+            return None
+        return meta
+
+    def _read_body(self, url: str, headers: dict = None) -> Optional[bytes]:
+        key = self.key(url, headers)
+        try:
+            with open(self._body_path(key), 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        try:
+            os.utime(self._meta_path(key))
+        except OSError:
+            pass
+        return body
+
+    def _write(self, path: str, data: bytes):
+        # Nome único entre threads e processos que compartilham o diretório
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            raise
+
+    def store(self, url: str, response, max_age: float, headers: dict = None):
+        """Guarda o corpo e os validadores de uma resposta 200 à requisição feita com `headers`."""
+        body = response.content
+        vary = _vary(response)
+        if len(body) > self.max_size or vary is None:
+            return
+        key = self.key(url, headers)
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'expires': self.clock() + max_age,
+            'encoding': response.encoding,
+            'content_type': response.headers.get('Content-Type'),
+            'vary': {name: _header(headers, name) for name in vary},
+        }
+        try:
+            self._write(self._body_path(key), body)
+            self._write(self._meta_path(key), json.dumps(meta).encode('utf-8'))
+        except OSError as e:
+            raise M3u8FileError(f"Erro ao gravar no cache '{self.directory}': {e}")
+        with self._lock:
+            self._size += len(body) - self._index.pop(key, 0)
+            self._index[key] = len(body)
+            self._evict()
+
+    def _refresh(self, url: str, meta: dict, max_age: float, headers, request_headers: dict = None):
+        meta['expires'] = self.clock() + max_age
+        for header, field in (('ETag', 'etag'), ('Last-Modified', 'last_modified')):
+            if headers.get(header):
+                meta[field] = headers[header]
+        try:
+            self._write(self._meta_path(self.key(url, request_headers)), json.dumps(meta).encode('utf-8'))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._size > self.max_size and self._index:
+            key, size = self._index.popitem(last=False)
+            self._size -= size
+            for path in (self._meta_path(key), self._body_path(key)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def invalidate(self, url: str, headers: dict = None):
+        """Remove a entrada de `url` pedida com `headers`."""
+        key = self.key(url, headers)
+        with self._lock:
+            self._size -= self._index.pop(key, 0)
+        for path in (self._meta_path(key), self._body_path(key)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove todas as entradas."""
+        with self._lock:
+            keys = list(self._index)
+        for key in keys:
+            for path in (self._meta_path(key), self._body_path(key)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        with self._lock:
+            self._index.clear()
+            self._size = 0
+
+    def _cached(self, url: str, meta: dict, headers: dict = None) -> Optional[CachedResponse]:
+        body = self._read_body(url, headers)
+        if body is None:
+            return None
+        headers = {}
+        for header, field in (('ETag', 'etag'), ('Last-Modified', 'last_modified'),
+                              ('Content-Type', 'content_type')):
+            if meta.get(field):
+                headers[header] = meta[field]
+        return CachedResponse(url, body, headers, meta.get('encoding'))
+
+    def get(self, url: str, fetch: Callable[[Dict[str, str]], requests.Response], headers: dict = None):
+        """
+        Obtém `url` pelo cache.
+
+        Args:
+            url (str): URL do recurso.
+            fetch (callable): Faz a requisição com os cabeçalhos condicionais recebidos (dict, possivelmente
+                              vazio) somados aos do chamador, e retorna a resposta.
+            headers (dict, optional): Cabeçalhos com que `fetch` faz a requisição; escolhem a entrada do cache
+                                      (`Authorization`, `Cookie` e os listados no `Vary` da resposta).
+
+        Returns:
+            requests.Response | CachedResponse: A resposta do servidor, ou a do cache (`from_cache=True`) se a
+            entrada estiver fresca ou o servidor responder 304.
+        """
+        meta = self.lookup(url, headers)
+        if meta is not None and self.clock() < meta.get('expires', 0):
+            cached = self._cached(url, meta, headers)
+            if cached is not None:
+                return cached
+        conditional = {}
+        if meta is not None:
+            if meta.get('etag'):
+                conditional['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                conditional['If-Modified-Since'] = meta['last_modified']
+        response = fetch(conditional)
+        max_age = _freshness(response.headers)
+        if response.status_code == 304 and meta is not None:
+            cached = self._cached(url, meta, headers)
+            if cached is not None:
+                self._refresh(url, meta, max_age or 0.0, response.headers, headers)
+                return cached
+            # Entrada removida entre a consulta e a resposta: busca o corpo sem condicionais
+            response = fetch({})
+            max_age = _freshness(response.headers)
+        if response.status_code == 200 and max_age is not None:
+            self.store(url, response, max_age, headers)
+        return response
+
+
+_default_cache: Optional[HttpCache] = None
+
+
+def get_default_cache() -> Optional[HttpCache]:
+    """Cache usado quando nenhum é informado (None = sem cache)."""
+    return _default_cache
+
+
+def set_default_cache(cache: Optional[HttpCache]):
+    """
+    Define o cache HTTP usado por padrão em `get_m3u8`, `M3U8Playlist` e no download da playlist.
+
+    Args:
+        cache (HttpCache, optional): Cache compartilhado. Com None, o cache é desativado.
+    """
+    global _default_cache
+    _default_cache = cache
@@ -80,3 +80,15 @@ class M3u8FileError(M3u8AnalyzerExceptions):
             errors (list, optional): Lista de erros adicionais ou detalhes para diagnóstico. Padrão é None.
         """
         super().__init__(message, errors)
+
+
+class M3u8CircuitOpenError(M3u8NetworkingError):
+    def __init__(self, message="Circuito aberto: o servidor está indisponível", errors=None):
+        """
+        Exceção lançada sem fazer a requisição quando o circuito do host está aberto (falhas seguidas recentes).
+
+        Args:
+            message (str): Mensagem descritiva do erro. Padrão é "Circuito aberto: o servidor está indisponível".
+            errors (list, optional): Lista de erros adicionais ou detalhes para diagnóstico. Padrão é None.
+        """
+        super().__init__(message, errors)
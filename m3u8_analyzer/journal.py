@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+from .exeptions import M3u8FileError
+
+_VERSION = 1
+_JOURNAL = 'journal.jsonl'
+
+
+def default_jobs_dir() -> str:
+    """Diretório padrão dos trabalhos retomáveis."""
+    return os.path.join(tempfile.gettempdir(), 'm3u8_analyzer_jobs')
+
+
+def job_id(url_playlist: str, output: str) -> str:
+    """Identificador determinístico de um trabalho: a mesma playlist e saída sempre caem no mesmo diretório."""
+    return hashlib.sha256(f'{url_playlist}\n{os.path.abspath(output)}'.encode('utf-8')).hexdigest()[:20]
+
+
+def file_digest(path: str, buffer_size: int = 1024 * 1024) -> Tuple[int, str]:
+    """Tamanho e SHA-256 de um arquivo."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(buffer_size)
+            if not block:
+                break
+            digest.update(block)
+            size += len(block)
+    return size, digest.hexdigest()
+
+
+class DownloadJournal:
+    """
+    Diário em disco de um trabalho de download, para retomar de onde parou.
+
+    Cada segmento concluído gera um registro (índice, URI, bytes, SHA-256, tem áudio/vídeo) acrescentado a um
+    arquivo JSON Lines com uma única escrita seguida de `fsync`; um registro incompleto no fim do arquivo (queda
+    no meio da escrita) é ignorado na leitura. Ao abrir, o diário é compactado e regravado de forma atômica
+    (arquivo temporário + `os.replace`).
+
+    O diretório do trabalho é determinístico (ver `job_id`), então executar de novo o mesmo download encontra os
+    segmentos já baixados e busca apenas os que faltam.
+
+    Examples:
+        ```python
+        journal = DownloadJournal.for_job(url_playlist, 'video.mp4')
+        if not journal.is_complete(0, uri, journal.segment_path(0, '.ts')):
+            ...  # baixa o segmento
+            journal.record(0, uri, journal.segment_path(0, '.ts'))
+        ```
+    """
+
+    def __init__(self, work_dir: str, verify_checksums: bool = False):
+        """
+        Args:
+            work_dir (str): Diretório do trabalho (segmentos e diário).
+            verify_checksums (bool): Se True, recalcula o SHA-256 de cada segmento antes de considerá-lo
+                                     concluído; caso contrário, confere apenas o tamanho.
+        """
+        self.work_dir = work_dir
+        self.path = os.path.join(work_dir, _JOURNAL)
+        self.verify_checksums = verify_checksums
+        self._entries: Dict[int, dict] = {}
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(work_dir, exist_ok=True)
+        except OSError as e:
+            raise M3u8FileError(f"Erro ao criar o diretório do trabalho '{work_dir}': {e}")
+        self._load()
+        self._compact()
+
+    @classmethod
+    def for_job(cls, url_playlist: str, output: str, jobs_dir: str = None,
+                verify_checksums: bool = False) -> 'DownloadJournal':
+        """
+        Abre (ou cria) o diário do trabalho identificado pela playlist e pelo arquivo de saída.
+
+        Args:
+            url_playlist (str): URL da playlist.
+            output (str): Arquivo de saída do trabalho.
+            jobs_dir (str, optional): Diretório base dos trabalhos. Padrão: `default_jobs_dir()`.
+            verify_checksums (bool): Ver `DownloadJournal`.
+        """
+        work_dir = os.path.join(jobs_dir or default_jobs_dir(), job_id(url_playlist, output))
+        return cls(work_dir, verify_checksums=verify_checksums)
+
+    def _load(self):
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Registro truncado por uma queda durante a escrita
+                        continue
+                    if entry.get('v') == _VERSION and entry.get('completed'):
+                        self._entries[entry['index']] = entry
+        except OSError as e:
+            raise M3u8FileError(f"Erro ao ler o diário '{self.path}': {e}")
+
+    def _compact(self):
+        temporary = f'{self.path}.tmp'
+        try:
+            with open(temporary, 'w', encoding='utf-8') as f:
+                for index in sorted(self._entries):
+                    f.write(json.dumps(self._entries[index], separators=(',', ':')) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self.path)
+        except OSError as e:
+            raise M3u8FileError(f"Erro ao gravar o diário '{self.path}': {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def segment_path(self, index: int, extension: str) -> str:
+        """Caminho do arquivo do segmento `index` dentro do diretório do trabalho."""
+        return os.path.join(self.work_dir, f'seg_{index:06d}{extension}')
+
+    def is_complete(self, index: int, uri: str, path: str) -> bool:
+        """
+        Indica se o segmento já foi baixado por completo.
+
+        O segmento só conta como concluído se a URI for a mesma do registro e o arquivo existir com o tamanho
+        (e, com `verify_checksums`, o SHA-256) registrado.
+        """
+        entry = self._entries.get(index)
+        if entry is None or entry['uri'] != uri:
+            return False
+        try:
+            if os.path.getsize(path) != entry['bytes']:
+                return False
+            if self.verify_checksums:
+                return file_digest(path)[1] == entry['sha256']
+        except OSError:
+            return False
+        return True
+
+    def flags(self, index: int) -> Optional[Tuple[bool, bool]]:
+        """(tem áudio, tem vídeo) registrados para o segmento, ou None."""
+        entry = self._entries.get(index)
+        if entry is None:
+            return None
+        return entry.get('audio', True), entry.get('video', True)
+
+    def record(self, index: int, uri: str, path: str, flags: Tuple[bool, bool] = (True, True)):
+        """
+        Registra um segmento concluído (seguro para uso por várias threads).
+
+        Args:
+            index (int): Posição do segmento na playlist.
+            uri (str): URI do segmento.
+            path (str): Arquivo já gravado (após a descriptografia, se houver).
+            flags (tuple): (tem áudio, tem vídeo).
+        """
+        size, digest = file_digest(path)
+        entry = {'v': _VERSION, 'index': index, 'uri': uri, 'bytes': size, 'sha256': digest,
+                 'audio': bool(flags[0]), 'video': bool(flags[1]), 'completed': True}
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+        with self._lock:
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                raise M3u8FileError(f"Erro ao gravar o diário '{self.path}': {e}")
+            self._entries[index] = entry
+
+    def discard(self):
+        """Remove o diretório do trabalho (segmentos e diário), após o término com sucesso."""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
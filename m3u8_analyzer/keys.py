@@ -0,0 +1,254 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Optional, Tuple
+
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from .cache import _credentials
+from .exeptions import M3u8Error
+from .playlist import Key
+from .singleflight import SingleFlight
+
+
+def segment_iv(key: Key, sequence: int) -> bytes:
+    """
+    IV de um segmento criptografado com AES-128.
+
+    Usa o atributo IV da #EXT-X-KEY quando declarado; caso contrário, o media sequence do segmento como um
+    inteiro de 128 bits big-endian (RFC 8216, 5.2).
+
+    Args:
+        key (Key): Chave em vigor no segmento.
+        sequence (int): Media sequence do segmento.
+
+    Returns:
+        bytes: IV de 16 bytes.
+    """
+    if key.iv:
+        value = key.iv[2:] if key.iv[:2].lower() == '0x' else key.iv
+        try:
+            return bytes.fromhex(value.rjust(32, '0'))
+        except ValueError:
+            raise M3u8Error("IV inválido na #EXT-X-KEY!", errors=[key.iv])
+    return sequence.to_bytes(16, 'big')
+
+
+_BLOCK = algorithms.AES.block_size // 8
+
+
+class SegmentDecryptor:
+    """
+    Arquivo de escrita que descriptografa AES-128-CBC à medida que os dados chegam.
+
+    Cada bloco recebido (ex.: por `read_into_file`) é descriptografado em um buffer reaproveitado e gravado em
+    `file` na mesma passada, sem guardar o segmento em memória nem regravá-lo. Com `unpad`, o último bloco
+    decifrado fica retido até `finish()`, que remove o padding PKCS7; sem ele (partes intermediárias de um
+    segmento baixado em sub-faixas), tudo é gravado como está.
+
+    Sem `iv`, os primeiros 16 bytes recebidos são usados como IV: é o bloco cifrado anterior ao trecho, o que
+    permite descriptografar uma sub-faixa que começa no meio do segmento.
+    """
+
+    def __init__(self, file: BinaryIO, key: bytes, iv: Optional[bytes] = None, unpad: bool = True):
+        """
+        Args:
+            file: Arquivo binário de destino (texto claro).
+            key (bytes): Chave AES-128.
+            iv (bytes, optional): IV do trecho; sem ele, lido dos primeiros 16 bytes recebidos.
+            unpad (bool): Se o trecho termina o segmento e carrega o padding PKCS7.
+        """
+        self.file = file
+        self.key = key
+        self.unpad = unpad
+        self.written = 0
+        self._iv = bytearray()
+        self._decryptor = None if iv is None else self._cipher(iv)
+        self._held = b''
+        self._buffer = bytearray()
+
+    def _cipher(self, iv: bytes):
+        return Cipher(algorithms.AES(self.key), modes.CBC(iv)).decryptor()
+
+    def _emit(self, data):
+        view = memoryview(data)
+        self.written += len(view)
+        while view:
+            written = self.file.write(view)
+            view = view[written:] if written is not None else view[:0]
+
+    def write(self, data) -> int:
+        size = len(data)
+        view = memoryview(data)
+        if self._decryptor is None:
+            missing = _BLOCK - len(self._iv)
+            self._iv += view[:missing]
+            view = view[missing:]
+            if len(self._iv) < _BLOCK:
+                return size
+            self._decryptor = self._cipher(bytes(self._iv))
+        # update_into exige espaço para um bloco incompleto guardado de uma escrita anterior
+        if len(self._buffer) < len(view) + _BLOCK - 1:
+            self._buffer = bytearray(len(view) + _BLOCK - 1)
+        count = self._decryptor.update_into(view, self._buffer)
+        output = memoryview(self._buffer)[:count]
+        if self.unpad and count:
+            # Só em finish() se sabe que o bloco é o último, o que carrega o padding
+            self._emit(self._held)
+            self._held = bytes(output[-_BLOCK:])
+            output = output[:-_BLOCK]
+        self._emit(output)
+        return size
+
+    def finish(self) -> int:
+        """
+        Conclui a descriptografia e grava o último bloco sem o padding.
+
+        Returns:
+            int: Bytes de texto claro gravados.
+
+        Raises:
+            ValueError: Se os dados não formarem blocos completos ou o padding for inválido (chave ou IV
+                        incorretos).
+        """
+        if self._decryptor is None:
+            raise ValueError("Trecho cifrado menor que um bloco.")
+        self._decryptor.finalize()
+        if self.unpad:
+            unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+            self._emit(unpadder.update(self._held) + unpadder.finalize())
+            self._held = b''
+        return self.written
+
+
+class KeyCache:
+    """
+    Cache em memória de chaves AES-128 por URL, com validade (TTL) e busca única por chave.
+
+    Os cabeçalhos `Authorization` e `Cookie` da requisição fazem parte da entrada: uma chave obtida com as
+    credenciais de um chamador não é entregue a quem pede com outras credenciais (ou sem nenhuma).
+
+    Cada URI de chave é buscada uma única vez enquanto a entrada for válida; várias threads que pedirem a mesma
+    chave ao mesmo tempo aguardam a mesma requisição em vez de repeti-la. Uma falha não é guardada: o próximo
+    pedido tenta de novo. Quando há mais de `max_entries` chaves, as usadas há mais tempo são descartadas.
+
+    Uma instância é compartilhada por padrão entre todos os downloads do processo (`get_default_key_cache()`),
+    então playlists com rotação de chave fazem uma requisição por rotação, não por segmento ou por download.
+
+    Examples:
+        ```python
+        keys = KeyCache(ttl=60)
+        key = keys.get('https://example.com/key1.bin', lambda: requests.get(url).content)
+        ```
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl (float): Segundos em que uma chave é reutilizada sem nova requisição.
+            max_entries (int): Quantidade máxima de chaves guardadas.
+            clock (callable): Relógio em segundos (substituível nos testes).
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        # (url, credenciais) -> (chave, expira em), da usada há mais tempo para a mais recente
+        self._entries: 'OrderedDict[tuple, Tuple[bytes, float]]' = OrderedDict()
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entry(url: str, headers: Optional[dict]) -> tuple:
+        return url, _credentials(headers)
+
+    def peek(self, url: str, headers: dict = None) -> Optional[bytes]:
+        """Chave válida guardada para `url` pedida com `headers`, sem buscar, ou None."""
+        with self._lock:
+            return self._lookup(self._entry(url, headers))
+
+    def _lookup(self, entry_key: tuple) -> Optional[bytes]:
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            return None
+        if self.clock() >= entry[1]:
+            del self._entries[entry_key]
+            return None
+        self._entries.move_to_end(entry_key)
+        return entry[0]
+
+    def put(self, url: str, key: bytes, headers: dict = None):
+        """Guarda `key` como a chave de `url` pedida com `headers`."""
+        entry_key = self._entry(url, headers)
+        with self._lock:
+            self._entries[entry_key] = (key, self.clock() + self.ttl)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, url: str, fetch: Callable[[], bytes], headers: dict = None) -> bytes:
+        """
+        Obtém a chave de `url`, chamando `fetch()` apenas se ela não estiver guardada nem sendo buscada.
+
+        Args:
+            url (str): URL da chave.
+            fetch (callable): Busca a chave e retorna seus bytes; pode levantar exceção.
+            headers (dict, optional): Cabeçalhos com que `fetch` faz a requisição; `Authorization` e `Cookie`
+                                      separam as entradas.
+
+        Returns:
+            bytes: A chave.
+        """
+        entry_key = self._entry(url, headers)
+        with self._lock:
+            key = self._lookup(entry_key)
+            if key is not None:
+                self.hits += 1
+                return key
+
+        def buscar() -> bytes:
+            with self._lock:
+                # Outra thread pode ter guardado a chave entre a consulta acima e o início desta busca
+                cached = self._lookup(entry_key)
+                if cached is not None:
+                    return cached
+                self.misses += 1
+            value = fetch()
+            self.put(url, value, headers)
+            return value
+
+        return self._flight.do(entry_key, buscar)
+
+    def invalidate(self, url: str, headers: dict = None):
+        """Descarta a chave de `url` pedida com `headers` (ex.: depois de uma falha de descriptografia)."""
+        with self._lock:
+            self._entries.pop(self._entry(url, headers), None)
+
+    def clear(self):
+        """Descarta todas as chaves."""
+        with self._lock:
+            self._entries.clear()
+
+
+_default_key_cache: Optional[KeyCache] = KeyCache()
+
+
+def get_default_key_cache() -> Optional[KeyCache]:
+    """Cache de chaves compartilhado pelos downloads do processo (None = sem cache)."""
+    return _default_key_cache
+
+
+def set_default_key_cache(cache: Optional[KeyCache]):
+    """
+    Define o cache de chaves usado por padrão em `EncryptSuport` e nos downloads.
+
+    Args:
+        cache (KeyCache, optional): Cache compartilhado. Com None, toda chave é buscada a cada uso.
+    """
+    global _default_key_cache
+    _default_key_cache = cache
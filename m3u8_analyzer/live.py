@@ -0,0 +1,642 @@
+import io
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+
+from .exeptions import M3u8Error, M3u8FileError, M3u8NetworkingError
+from .keys import KeyCache, SegmentDecryptor, segment_iv
+from .network import HEADERS_DEFAULT, HttpSession, get_default_session, read_into_file
+from .retry import RetryPolicy, get_default_policy
+from .playlist import InitSection, Part, Playlist, PlaylistParser, PreloadHint, Segment, _to_int
+from .throttle import Throttle, get_default_throttle
+
+_MEDIA_SEQUENCE_TAG = '#EXT-X-MEDIA-SEQUENCE:'
+_EXTINF_TAG = '#EXTINF:'
+# Falhas de um segmento (ou parte, ou chave) que não encerram a gravação
+_SEGMENT_ERRORS = (M3u8NetworkingError, requests.exceptions.RequestException)
+
+
+@dataclass(slots=True)
+class LiveDelta:
+    """Diferença entre duas recargas de uma playlist ao vivo."""
+    added: List[Segment] = field(default_factory=list)
+    removed: List[Segment] = field(default_factory=list)
+    media_sequence: int = 0
+    reset: bool = False
+    # Partes (LL-HLS) anunciadas desde a última recarga
+    parts: List[Part] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.reset or self.parts)
+
+
+def _media_sequence_of(content: str) -> int:
+    start = content.find(_MEDIA_SEQUENCE_TAG)
+    if start < 0:
+        return 0
+    start += len(_MEDIA_SEQUENCE_TAG)
+    end = content.find('\n', start)
+    return _to_int(content[start:end if end >= 0 else len(content)].strip()) or 0
+
+
+def _uri_line_before(content: str, position: int):
+    """
+    Procura, voltando a partir de `position`, a última linha de URI (linha que não é tag).
+
+    Returns:
+        tuple: (uri, offset logo após a linha), ou (None, 0) se não houver.
+    """
+    end = position
+    while end > 0:
+        start = content.rfind('\n', 0, end - 1) + 1
+        line = content[start:end].strip()
+        if line and line[0] != '#':
+            return line, end
+        end = start
+    return None, 0
+
+
+class LivePlaylist:
+    """
+    Playlist de mídia ao vivo analisada de forma incremental.
+
+    Guarda a janela de segmentos atual e o último #EXT-X-MEDIA-SEQUENCE visto. A cada recarga, os segmentos
+    já conhecidos são pulados sem análise (apenas buscas de texto) e somente os segmentos acrescentados desde
+    a última recarga passam pelo parser, que é iniciado com o estado (KEY, MAP, BYTERANGE) do último segmento
+    conhecido. O custo de cada recarga é proporcional aos segmentos novos, não ao tamanho da janela.
+
+    Se a playlist for reiniciada (media sequence menor que a anterior, ou conteúdo que não corresponde à
+    janela conhecida), é feita uma análise completa e o delta retornado tem `reset=True`.
+
+    Examples:
+        ```python
+        live = LivePlaylist('https://example.com/live/index.m3u8')
+        while not live.endlist:
+            delta = live.reload()
+            for segment in delta.added:
+                print(segment.sequence, segment.uri)
+            time.sleep(live.target_duration or 6)
+        ```
+    """
+
+    def __init__(self, url: str = None, headers: dict = None, session: HttpSession = None,
+                 retry: RetryPolicy = None):
+        """
+        Args:
+            url (str, optional): URL da playlist de mídia, usada por `reload()`. Sem URL, o conteúdo deve ser
+                                 fornecido a `update()`.
+            headers (dict, optional): Cabeçalhos HTTP usados por `reload()`.
+            session (HttpSession, optional): Sessão com pool de conexões usada por `reload()`.
+            retry (RetryPolicy, optional): Política de novas tentativas usada por `reload()`.
+        """
+        if url is not None and not (url.startswith('https://') or url.startswith('http://')):
+            raise M3u8Error("O Manifesto deve ser uma URL HTTPS ou HTTP!", errors=[url])
+        self.url = url
+        self.headers = headers
+        self.session = session
+        self.retry = retry
+        self.playlist: Optional[Playlist] = None
+        self._window: Deque[Segment] = deque()
+        # (sequence, index) da última parte já reportada em um delta
+        self._last_part: Optional[Tuple[int, int]] = None
+
+    @property
+    def media_sequence(self) -> int:
+        """Número de sequência do primeiro segmento da janela atual."""
+        return self._window[0].sequence if self._window else (self.playlist.media_sequence if self.playlist else 0)
+
+    @property
+    def next_sequence(self) -> int:
+        """Número de sequência esperado para o próximo segmento."""
+        return self._window[-1].sequence + 1 if self._window else self.media_sequence
+
+    @property
+    def target_duration(self) -> Optional[int]:
+        return self.playlist.target_duration if self.playlist else None
+
+    @property
+    def endlist(self) -> bool:
+        """True quando a transmissão terminou (#EXT-X-ENDLIST)."""
+        return bool(self.playlist and self.playlist.endlist)
+
+    @property
+    def can_block_reload(self) -> bool:
+        """True se o servidor aceita recargas bloqueantes (#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES)."""
+        return bool(self.playlist and self.playlist.server_control and self.playlist.server_control.can_block_reload)
+
+    @property
+    def next_part(self) -> Tuple[int, Optional[int]]:
+        """
+        (media sequence, índice da parte) do próximo conteúdo a ser anunciado, como pedido em `_HLS_msn` e
+        `_HLS_part`. Sem partes na playlist, o índice é None e a espera é pelo próximo segmento completo.
+        """
+        parts = self.playlist.parts if self.playlist else None
+        if not parts:
+            return self.next_sequence, None
+        last = parts[-1]
+        if last.sequence < self.next_sequence:
+            # A última parte fecha um segmento já listado: a próxima é a primeira do segmento seguinte
+            return self.next_sequence, 0
+        return last.sequence, last.index + 1
+
+    @property
+    def preload_hint(self) -> Optional[PreloadHint]:
+        """Dica de pré-carregamento da próxima parte (#EXT-X-PRELOAD-HINT:TYPE=PART), se houver."""
+        for hint in (self.playlist.preload_hints if self.playlist else ()):
+            if hint.type == 'PART':
+                return hint
+        return None
+
+    def __len__(self) -> int:
+        return len(self._window)
+
+    def segments(self) -> List[Segment]:
+        """Segmentos da janela atual, em ordem."""
+        return list(self._window)
+
+    def reload(self, block: bool = False, timeout: float = None) -> LiveDelta:
+        """
+        Obtém a playlist novamente da URL e aplica as mudanças.
+
+        Args:
+            block (bool): Faz uma recarga bloqueante (`_HLS_msn`/`_HLS_part`): o servidor só responde quando
+                          `next_part` estiver disponível. Ignorado se o servidor não anunciar CAN-BLOCK-RELOAD.
+            timeout (float, optional): Tempo limite da requisição. Padrão nas recargas bloqueantes: 3 × target
+                                       duration, o máximo que o servidor pode segurar a resposta.
+
+        Returns:
+            LiveDelta: Segmentos acrescentados e removidos desde a última recarga.
+
+        Raises:
+            M3u8Error: Se a instância não tiver URL ou o servidor não retornar uma playlist.
+            M3u8NetworkingError: Em erros de rede.
+        """
+        if self.url is None:
+            raise M3u8Error("LivePlaylist sem URL: use update(content)")
+        # Importação tardia: M3u8Analyzer importa este módulo
+        from .M3u8Analyzer import M3u8Analyzer
+        url = self.url
+        if block and self.can_block_reload:
+            sequence, part = self.next_part
+            query = f'_HLS_msn={sequence}' if part is None else f'_HLS_msn={sequence}&_HLS_part={part}'
+            url = f"{url}{'&' if '?' in url else '?'}{query}"
+            if timeout is None:
+                timeout = (self.target_duration or 6) * 3 + 1
+        return self.update(M3u8Analyzer.get_m3u8(url, headers=self.headers, session=self.session,
+                                                 retry=self.retry, timeout=timeout))
+
+    def update(self, content: str) -> LiveDelta:
+        """
+        Aplica um novo conteúdo da playlist à janela atual.
+
+        Args:
+            content (str): Conteúdo da playlist de mídia.
+
+        Returns:
+            LiveDelta: Segmentos acrescentados e removidos desde a última atualização.
+        """
+        if not isinstance(content, str) or '#EXTM3U' not in content:
+            raise M3u8Error("O conteúdo fornecido não é uma playlist M3U8 válida!",
+                            errors=[content if isinstance(content, str) else type(content).__name__])
+        sequence = _media_sequence_of(content)
+        delta = None
+        if self._window and self.media_sequence <= sequence < self.next_sequence:
+            delta = self._update_incremental(content, sequence)
+        if delta is None:
+            delta = self._update_full(content, sequence)
+        if delta.reset:
+            self._last_part = None
+        last = self._last_part
+        delta.parts = [p for p in self.playlist.parts if last is None or (p.sequence, p.index) > last]
+        if delta.parts:
+            self._last_part = (delta.parts[-1].sequence, delta.parts[-1].index)
+        return delta
+
+    def _expire(self, sequence: int) -> List[Segment]:
+        removed = []
+        window = self._window
+        while window and window[0].sequence < sequence:
+            removed.append(window.popleft())
+        return removed
+
+    def _update_incremental(self, content: str, sequence: int) -> Optional[LiveDelta]:
+        known = self.next_sequence - sequence
+        new = content.count(_EXTINF_TAG) - known
+        if new < 0:
+            return None
+        first = content.find(_EXTINF_TAG)
+        # Posição do #EXTINF do primeiro segmento novo, procurando a partir do fim
+        position = len(content)
+        for _ in range(new):
+            position = content.rfind(_EXTINF_TAG, 0, position)
+        last = self._window[-1]
+        uri, boundary = _uri_line_before(content, position)
+        if uri != last.uri or boundary <= first:
+            return None
+
+        parser = PlaylistParser(keep_segments=False)
+        feed = parser.feed
+        # Cabeçalho (tudo antes do primeiro segmento) e, em seguida, o estado do último segmento conhecido
+        for line in content[:first].splitlines():
+            feed(line)
+        parser._count = known
+        parser._key = last.key
+        parser._init_section = last.init_section
+        parser._next_offset = last.byterange.end if last.byterange else 0
+        parser._discontinuity = False
+        parser._program_date_time = None
+        # Depois da última URI conhecida começam as partes de um segmento novo
+        parser._part_index = 0
+        parser._part_next_offset = (None, 0)
+        added = []
+        for line in content[boundary:].splitlines():
+            segment = feed(line)
+            if segment is not None:
+                added.append(segment)
+        self.playlist = parser.close()
+        removed = self._expire(sequence)
+        self._window.extend(added)
+        return LiveDelta(added=added, removed=removed, media_sequence=sequence)
+
+    def _update_full(self, content: str, sequence: int) -> LiveDelta:
+        parser = PlaylistParser(keep_segments=False)
+        feed = parser.feed
+        segments = []
+        for line in content.splitlines():
+            segment = feed(line)
+            if segment is not None:
+                segments.append(segment)
+        self.playlist = parser.close()
+        removed = list(self._window)
+        # Se todos os segmentos conhecidos expiraram entre as recargas, não é um reinício
+        reset = bool(removed) and sequence < self.next_sequence
+        self._window = deque(segments)
+        return LiveDelta(added=segments, removed=removed, media_sequence=sequence, reset=reset)
+
+
+class LiveFollower:
+    """
+    Acompanha uma playlist de mídia ao vivo e grava cada segmento novo, em ordem, até o #EXT-X-ENDLIST.
+
+    As recargas seguem a cadência recomendada pela especificação (RFC 8216, 6.3.4), medida a partir do início
+    de cada recarga: depois de uma recarga com segmentos novos, espera-se a duração do último segmento (no
+    máximo o #EXT-X-TARGETDURATION); se a playlist não mudou, espera-se metade do target duration, aumentando
+    por `backoff` a cada recarga seguida sem mudança, até `max_delay`. Só segmentos com media sequence ainda não
+    gravado são baixados; segmentos que saem da janela antes de serem baixados são contados em `dropped`.
+
+    Em playlists Low-Latency HLS (#EXT-X-PART), as partes são baixadas assim que anunciadas, e a próxima
+    parte anunciada por #EXT-X-PRELOAD-HINT é pedida antes mesmo de existir; se o servidor aceitar recargas
+    bloqueantes (CAN-BLOCK-RELOAD), a playlist é pedida com `_HLS_msn`/`_HLS_part` logo em seguida, sem
+    temporizador. Um segmento cujas partes foram gravadas não é baixado de novo; se o acompanhamento começar
+    no meio de um segmento, ele é baixado inteiro quando se completar. Com criptografia AES-128 as partes não
+    são usadas (o CBC encadeia o segmento inteiro).
+
+    Sem `key_hex`/`iv_hex`, cada segmento é descriptografado com a #EXT-X-KEY AES-128 em vigor (rotação de
+    chaves), obtida pelo cache de chaves compartilhado: uma requisição por chave, não por segmento.
+
+    Os segmentos são acrescentados diretamente ao arquivo de saída (MPEG-TS/fMP4 concatenado, com a seção
+    #EXT-X-MAP gravada antes do primeiro segmento e sempre que mudar), então a gravação pode ser lida enquanto
+    acontece. Cada instância usa uma thread (`run()` bloqueia); para gravar
+    vários canais, crie um follower por canal, compartilhando a mesma `HttpSession`.
+
+    Examples:
+        ```python
+        follower = LiveFollower('https://example.com/live/index.m3u8', 'gravacao.ts')
+        threading.Thread(target=follower.run).start()
+        ...
+        follower.stop()
+        ```
+    """
+
+    def __init__(self, url: str, output: str, headers: dict = None, session: HttpSession = None,
+                 retry: RetryPolicy = None, throttle: Throttle = None, key_hex: str = None, iv_hex: str = None,
+                 player: str = None, backoff: float = 1.5, max_delay: float = None, max_errors: int = 5,
+                 low_latency: bool = True, key_cache: KeyCache = None, on_segment: Callable[[Segment, int], None] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            url (str): URL da playlist de mídia ao vivo.
+            output (str): Arquivo em que os segmentos são acrescentados (criado ou truncado em `run()`).
+            headers (dict, optional): Cabeçalhos HTTP. Padrão: cabeçalhos de navegador.
+            session (HttpSession, optional): Sessão com pool de conexões (padrão: a compartilhada).
+            retry (RetryPolicy, optional): Política de novas tentativas da playlist e dos segmentos.
+            throttle (Throttle, optional): Limites de banda e de requisições. Padrão: `get_default_throttle()`.
+            key_hex (str, optional): Chave AES-128 em hexadecimal.
+            iv_hex (str, optional): IV em hexadecimal, usado com a chave.
+            player (str, optional): URL base para URIs relativas. Padrão: resolvidas a partir de `url`.
+            backoff (float): Fator aplicado à espera a cada recarga seguida sem mudança.
+            max_delay (float, optional): Espera máxima entre recargas. Padrão: 1,5 × target duration.
+            max_errors (int): Falhas de rede seguidas toleradas antes de desistir.
+            low_latency (bool): Usa partes, dicas de pré-carregamento e recargas bloqueantes do LL-HLS quando a
+                                playlist as anunciar.
+            key_cache (KeyCache, optional): Cache das chaves da playlist. Padrão: `get_default_key_cache()`.
+            on_segment (callable, optional): Chamado com (segmento, bytes gravados) após cada segmento.
+            clock (callable): Relógio em segundos (substituível nos testes).
+        """
+        self.playlist = LivePlaylist(url, headers=headers, session=session, retry=retry)
+        self.url = url
+        self.output = output
+        self.headers = headers or HEADERS_DEFAULT
+        self.session = session
+        self.retry = retry
+        self.throttle = throttle if throttle is not None else get_default_throttle()
+        self.key = bytes.fromhex(key_hex) if key_hex and iv_hex else None
+        self.iv = bytes.fromhex(iv_hex) if key_hex and iv_hex else None
+        self.player = player
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.max_errors = max_errors
+        self.low_latency = low_latency
+        self.key_cache = key_cache
+        self.on_segment = on_segment
+        self.clock = clock
+        self.reloads = 0
+        self.segments = 0
+        self.bytes = 0
+        self.dropped = 0
+        self.parts = 0
+        self.last_sequence: Optional[int] = None
+        # Segmento sendo gravado por partes e a próxima parte esperada dele
+        self._assembling: Optional[int] = None
+        self._next_index = 0
+        self._init: Optional[InitSection] = None
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Interrompe o acompanhamento após o segmento em andamento."""
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def reload_delay(self, changed: bool, unchanged: int) -> float:
+        """
+        Espera antes da próxima recarga.
+
+        Args:
+            changed (bool): Se a última recarga trouxe segmentos novos.
+            unchanged (int): Recargas seguidas sem mudança (incluindo a última).
+        """
+        target = float(self.playlist.target_duration or 6)
+        max_delay = self.max_delay if self.max_delay is not None else target * 1.5
+        if self._use_parts() and self.playlist.playlist.part_target:
+            # Sem recarga bloqueante, partes novas aparecem a cada PART-TARGET
+            part_target = self.playlist.playlist.part_target
+            return part_target if changed else min(part_target * self.backoff ** max(unchanged - 1, 0), max_delay)
+        if changed:
+            window = self.playlist.segments()
+            last = window[-1].duration if window and window[-1].duration else target
+            return min(last, target)
+        return min(target / 2 * self.backoff ** max(unchanged - 1, 0), max_delay)
+
+    def _use_parts(self) -> bool:
+        playlist = self.playlist.playlist
+        return self.low_latency and self.key is None and playlist is not None and playlist.low_latency \
+            and all(key.method == 'NONE' for key in playlist.keys)
+
+    def _segment_key(self, segment: Segment) -> Tuple[Optional[bytes], Optional[bytes]]:
+        if self.key is not None:
+            return self.key, self.iv
+        key = segment.key
+        if key is None or key.method != 'AES-128' or not key.uri:
+            return None, None
+        # Importação tardia: M3u8Analyzer importa este módulo
+        from .M3u8Analyzer import EncryptSuport
+        data = EncryptSuport.get_key(self._resolve(key.uri), headers=self.headers, session=self.session,
+                                     retry=self.retry, throttle=self.throttle, key_cache=self.key_cache)
+        return data, segment_iv(key, segment.sequence)
+
+    def _resolve(self, uri: str) -> str:
+        if uri.startswith('https://') or uri.startswith('http://'):
+            return uri
+        return f'{self.player}{uri}' if self.player else urljoin(self.url, uri)
+
+    def _fetch(self, url: str, byte_range: str = None, key: bytes = None, iv: bytes = None) -> bytes:
+        session = self.session or get_default_session()
+        throttle = self.throttle
+        body = io.BytesIO()
+
+        def chunk(size: int):
+            if throttle is not None:
+                throttle.data(url, size)
+
+        headers = self.headers if byte_range is None else {**self.headers, 'Range': byte_range}
+        decryptor: Optional[SegmentDecryptor] = None
+
+        def attempt():
+            nonlocal decryptor
+            body.seek(0)
+            body.truncate()
+            decryptor = None
+            if throttle is not None:
+                throttle.request(url)
+            with session.get(url, headers=headers, stream=True) as response:
+                if response.status_code < 400:
+                    # Descriptografa à medida que lê; se o servidor ignorar o Range, a faixa só pode ser recortada
+                    # depois, do recurso inteiro
+                    if key is not None and (byte_range is None or response.status_code == 206):
+                        decryptor = SegmentDecryptor(body, key, iv)
+                    read_into_file(response, body if decryptor is None else decryptor, on_chunk=chunk)
+            return response
+
+        response = (self.retry or get_default_policy()).run(url, attempt)
+        if response.status_code >= 400:
+            raise M3u8NetworkingError(f"Erro HTTP: {response.status_code}", errors=[url])
+        try:
+            if decryptor is not None:
+                decryptor.finish()
+                return body.getvalue()
+            data = body.getvalue()
+            if byte_range is not None and response.status_code != 206:
+                # Servidor ignorou o Range: recorta a faixa pedida do recurso inteiro
+                start, _, end = byte_range[len('bytes='):].partition('-')
+                data = data[int(start):int(end) + 1] if end else data[int(start):]
+            if key is None:
+                return data
+            body = io.BytesIO()
+            decryptor = SegmentDecryptor(body, key, iv)
+            decryptor.write(data)
+            decryptor.finish()
+            return body.getvalue()
+        except ValueError as e:
+            raise M3u8FileError(f"Erro de valor - {e}")
+
+    def _write_init(self, output, init_section: Optional[InitSection]):
+        if init_section is None or init_section == self._init:
+            return
+        byterange = init_section.byterange
+        data = self._fetch(self._resolve(init_section.uri), byterange.to_header() if byterange else None)
+        output.write(data)
+        self.bytes += len(data)
+        self._init = init_section
+
+    def _finish(self, segment: Segment, size: int):
+        self.segments += 1
+        self.last_sequence = segment.sequence
+        if self.on_segment is not None:
+            self.on_segment(segment, size)
+
+    def _write(self, output, segments: List[Segment]):
+        for segment in segments:
+            if self._stop.is_set():
+                return
+            if segment.sequence == self._assembling:
+                # Já gravado parte a parte
+                self._assembling = None
+                self._finish(segment, 0)
+                continue
+            if self.last_sequence is not None and segment.sequence <= self.last_sequence:
+                continue
+            if self.last_sequence is not None and segment.sequence > self.last_sequence + 1:
+                # A janela andou mais rápido do que as recargas: esses segmentos não estão mais disponíveis
+                self.dropped += segment.sequence - self.last_sequence - 1
+            try:
+                self._write_init(output, segment.init_section)
+                byterange = segment.byterange
+                key, iv = self._segment_key(segment)
+                data = self._fetch(self._resolve(segment.uri), byterange.to_header() if byterange else None, key, iv)
+            except _SEGMENT_ERRORS:
+                # Um segmento indisponível (404, tempo esgotado) não encerra a gravação: conta como perdido
+                self.dropped += 1
+                self.last_sequence = segment.sequence
+                continue
+            output.write(data)
+            output.flush()
+            self.bytes += len(data)
+            self._finish(segment, len(data))
+
+    def _accept_part(self, sequence: int, index: int) -> bool:
+        """Decide se a parte (sequence, index) deve ser gravada agora, atualizando o segmento em montagem."""
+        if self.last_sequence is not None and sequence <= self.last_sequence:
+            return False
+        if self._assembling is not None and sequence != self._assembling:
+            # O segmento em montagem terminou sem aparecer completo na playlist: dá-o por gravado
+            self.segments += 1
+            self.last_sequence = self._assembling
+            self._assembling = None
+        if self._assembling is None:
+            if index != 0:
+                # Começo do segmento perdido: ele será baixado inteiro quando se completar
+                return False
+            if self.last_sequence is not None and sequence > self.last_sequence + 1:
+                self.dropped += sequence - self.last_sequence - 1
+            self._assembling, self._next_index = sequence, 0
+        if index < self._next_index:
+            return False
+        if index > self._next_index:
+            # Partes perdidas: o restante do segmento é descartado
+            self.dropped += 1
+            self.last_sequence = self._assembling
+            self._assembling = None
+            return False
+        return True
+
+    def _write_part(self, output, uri: str, byte_range: Optional[str]):
+        if self._next_index == 0:
+            window = self.playlist.segments()
+            self._write_init(output, window[-1].init_section if window else None)
+        data = self._fetch(self._resolve(uri), byte_range)
+        output.write(data)
+        output.flush()
+        self.parts += 1
+        self.bytes += len(data)
+        self._next_index += 1
+
+    def _write_parts(self, output, parts: List[Part]):
+        for part in parts:
+            if self._stop.is_set():
+                return
+            if part.gap or not self._accept_part(part.sequence, part.index):
+                continue
+            byterange = part.byterange
+            try:
+                self._write_part(output, part.uri, byterange.to_header() if byterange else None)
+            except _SEGMENT_ERRORS:
+                self._part_failed()
+
+    def _part_failed(self):
+        """Abandona o segmento em montagem depois de uma parte que falhou."""
+        if self._next_index > 0:
+            # Parte do segmento já está no arquivo: o restante é descartado
+            self.dropped += 1
+            self.last_sequence = self._assembling
+        # Sem nenhuma parte gravada, o segmento é baixado inteiro quando se completar
+        self._assembling = None
+
+    def _write_low_latency(self, output, delta: LiveDelta):
+        parts = delta.parts
+        position = 0
+        for segment in delta.added:
+            # As últimas partes de um segmento vêm antes dele na playlist
+            end = position
+            while end < len(parts) and parts[end].sequence <= segment.sequence:
+                end += 1
+            self._write_parts(output, parts[position:end])
+            position = end
+            self._write(output, [segment])
+        self._write_parts(output, parts[position:])
+        hint = self.playlist.preload_hint
+        if hint is not None and not hint.open_ended and not self._stop.is_set() and not self.playlist.endlist:
+            # A próxima parte já foi anunciada: o servidor responde assim que ela existir. Dicas sem fim
+            # trariam o restante do segmento, então essa parte espera ser listada
+            sequence, index = self.playlist.next_part
+            if index is not None and self._accept_part(sequence, index):
+                try:
+                    self._write_part(output, hint.uri, hint.to_header())
+                except _SEGMENT_ERRORS:
+                    # A parte anunciada ainda não pôde ser obtida: é pedida de novo quando for listada
+                    pass
+
+    def run(self):
+        """
+        Acompanha a playlist até o #EXT-X-ENDLIST ou `stop()`.
+
+        Um segmento (ou parte) que falha depois das novas tentativas é contado em `dropped` e a gravação segue
+        no próximo; só falhas seguidas da playlist encerram o acompanhamento.
+
+        Raises:
+            M3u8NetworkingError: Se a playlist falhar `max_errors` vezes seguidas.
+        """
+        errors = 0
+        unchanged = 0
+        try:
+            output = open(self.output, 'wb')
+        except OSError as e:
+            raise M3u8FileError(f"Erro ao criar o arquivo de saída '{self.output}': {e}")
+        with output:
+            while not self._stop.is_set():
+                started = self.clock()
+                blocking = self.low_latency and self.playlist.can_block_reload
+                try:
+                    delta = self.playlist.reload(block=blocking)
+                except M3u8NetworkingError:
+                    errors += 1
+                    if errors >= self.max_errors:
+                        raise
+                    self._stop.wait(float(self.playlist.target_duration or 6) / 2)
+                    continue
+                errors = 0
+                self.reloads += 1
+                if delta.reset:
+                    # Playlist reiniciada: a numeração recomeça
+                    self.last_sequence = None
+                    self._assembling = None
+                if self._use_parts():
+                    self._write_low_latency(output, delta)
+                else:
+                    self._write(output, delta.added)
+                if self.playlist.endlist:
+                    break
+                if self.low_latency and self.playlist.can_block_reload:
+                    # A próxima recarga é bloqueante: o servidor segura a resposta até haver novidade
+                    continue
+                changed = bool(delta.added or (self._use_parts() and delta.parts))
+                unchanged = 0 if changed else unchanged + 1
+                delay = self.reload_delay(changed, unchanged)
+                self._stop.wait(max(delay - (self.clock() - started), 0.0))
@@ -0,0 +1,267 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Deque, List, Optional, Sequence
+
+from .exeptions import M3u8DownloadError, M3u8Error
+
+# download(url, destino, interromper): baixa `url` em `destino`; deve abortar quando `interromper` for sinalizado
+Download = Callable[[str, str, threading.Event], None]
+
+
+class Mirror:
+    """
+    Um espelho (CDN) e sua saúde.
+
+    `health` é uma média móvel exponencial de sucessos (1) e falhas (0), começando em 1; `latency` é a média
+    móvel do tempo de download bem-sucedido, em segundos. `score` combina as duas: espelhos que falham perdem
+    posição rapidamente e voltam aos poucos conforme acertam.
+    """
+
+    def __init__(self, base: str, alpha: float = 0.2):
+        self.base = base
+        self.alpha = alpha
+        self.health = 1.0
+        self.latency: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+
+    @property
+    def score(self) -> float:
+        return self.health / (1.0 + (self.latency or 0.0))
+
+    def url(self, path: str) -> str:
+        return f'{self.base}{path}'
+
+    def _success(self, elapsed: float):
+        self.successes += 1
+        self.health += self.alpha * (1.0 - self.health)
+        self.latency = elapsed if self.latency is None else self.latency + self.alpha * (elapsed - self.latency)
+
+    def _failure(self):
+        self.failures += 1
+        self.health -= self.alpha * self.health
+
+    def __repr__(self):
+        return (f'Mirror({self.base!r}, health={self.health:.2f}, latency={self.latency}, '
+                f'ok={self.successes}, erros={self.failures})')
+
+
+class MirrorPool:
+    """
+    Espelhos que servem os mesmos caminhos, com failover automático e requisições de cobertura (hedging).
+
+    Cada download vai primeiro para o espelho de maior `score`; se falhar, o próximo espelho é tentado, e assim
+    por diante. Com `hedge_percentile`, se o download não terminar dentro desse percentil dos tempos recentes
+    (ex.: 0.95), uma cópia da requisição é enviada ao próximo espelho e vale a primeira que terminar; a outra é
+    interrompida. O hedging só começa depois de `hedge_min_samples` downloads medidos.
+
+    Examples:
+        ```python
+        pool = MirrorPool(['https://cdn-a.example.com/', 'https://cdn-b.example.com/'], hedge_percentile=0.95)
+        M3u8Downloader.downloader_and_remuxer_segments(url, 'video.mp4', mirrors=pool, workers=8)
+        print(pool.mirrors)
+        ```
+    """
+
+    def __init__(self, bases: Sequence[str], hedge_percentile: float = None, hedge_min_samples: int = 20,
+                 hedge_min_delay: float = 0.05, window: int = 200, hedge_workers: int = 32,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            bases (list): URLs base dos espelhos, na ordem de preferência inicial.
+            hedge_percentile (float, optional): Percentil (0 a 1) dos tempos de download após o qual uma cópia
+                                                da requisição vai para outro espelho. Padrão: sem hedging.
+            hedge_min_samples (int): Downloads medidos antes de o hedging começar.
+            hedge_min_delay (float): Espera mínima, em segundos, antes de uma cópia.
+            window (int): Quantidade de tempos recentes usados no percentil.
+            hedge_workers (int): Threads usadas pelos downloads com hedging.
+            clock (callable): Relógio em segundos usado para medir os downloads (substituível nos testes).
+        """
+        if not bases:
+            raise M3u8Error("Informe ao menos um espelho!")
+        for base in bases:
+            if not (base.startswith('https://') or base.startswith('http://')):
+                raise M3u8Error("Os espelhos devem ser URLs HTTPS ou HTTP!", errors=[base])
+        if hedge_percentile is not None and not 0 < hedge_percentile < 1:
+            raise M3u8Error("hedge_percentile deve estar entre 0 e 1!", errors=[hedge_percentile])
+        self.mirrors: List[Mirror] = [Mirror(base) for base in bases]
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_workers = hedge_workers
+        self.clock = clock
+        self.hedges = 0
+        self.hedges_won = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def relative(self, url: str) -> Optional[str]:
+        """Caminho de `url` relativo ao espelho que a serve, ou None se não pertencer a nenhum."""
+        for mirror in self.mirrors:
+            if url.startswith(mirror.base):
+                return url[len(mirror.base):]
+        return None
+
+    def ranked(self) -> List[Mirror]:
+        """Espelhos do mais saudável para o menos (empates mantêm a ordem informada)."""
+        with self._lock:
+            return sorted(self.mirrors, key=lambda mirror: -mirror.score)
+
+    def record(self, mirror: Mirror, ok: bool, elapsed: float = 0.0):
+        """Contabiliza o resultado de um download no espelho."""
+        with self._lock:
+            if ok:
+                mirror._success(elapsed)
+                self._latencies.append(elapsed)
+            else:
+                mirror._failure()
+
+    def hedge_delay(self) -> Optional[float]:
+        """Espera antes de uma cópia da requisição, ou None se o hedging estiver desligado ou sem amostras."""
+        if self.hedge_percentile is None or len(self.mirrors) < 2:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        position = min(int(len(ordered) * self.hedge_percentile), len(ordered) - 1)
+        return max(ordered[position], self.hedge_min_delay)
+
+    def fetch(self, path: str, destination: str, download: Download, cancel: threading.Event = None) -> Mirror:
+        """
+        Baixa `path` de um dos espelhos para `destination`.
+
+        Args:
+            path (str): Caminho relativo às bases dos espelhos.
+            destination (str): Arquivo de destino.
+            download (callable): `download(url, destino, interromper)`; levanta exceção em caso de falha.
+            cancel (threading.Event, optional): Cancelamento do download como um todo.
+
+        Returns:
+            Mirror: O espelho que entregou o arquivo.
+
+        Raises:
+            Exception: O erro do último espelho, se todos falharem.
+        """
+        ranked = self.ranked()
+        delay = self.hedge_delay()
+        if delay is not None:
+            return self._hedged(ranked, path, destination, download, delay, cancel)
+        return self._failover(ranked, path, destination, download, cancel)
+
+    def _attempt(self, mirror: Mirror, path: str, destination: str, download: Download,
+                 stop: threading.Event) -> Mirror:
+        start = self.clock()
+        try:
+            download(mirror.url(path), destination, stop)
+        except BaseException:
+            # Uma cópia interrompida por ter perdido a corrida não conta como falha do espelho
+            if not stop.is_set():
+                self.record(mirror, False)
+            raise
+        self.record(mirror, True, self.clock() - start)
+        return mirror
+
+    def _failover(self, ranked: List[Mirror], path: str, destination: str, download: Download,
+                  cancel: Optional[threading.Event]) -> Mirror:
+        error = None
+        for mirror in ranked:
+            if cancel is not None and cancel.is_set():
+                break
+            try:
+                return self._attempt(mirror, path, destination, download, cancel or threading.Event())
+            except M3u8DownloadError as e:
+                if cancel is not None and cancel.is_set():
+                    raise
+                error = e
+            except Exception as e:
+                error = e
+        if error is None:
+            raise M3u8DownloadError(f"Download de '{path}' cancelado.")
+        raise error
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.hedge_workers,
+                                                        thread_name_prefix='m3u8_hedge')
+        return self._executor
+
+    def _hedged(self, ranked: List[Mirror], path: str, destination: str, download: Download, delay: float,
+                cancel: Optional[threading.Event]) -> Mirror:
+        executor = self._pool()
+        races = []
+
+        def start(mirror: Mirror):
+            stop = threading.Event()
+            temporary = f'{destination}.{len(races)}.part'
+
+            def run():
+                # Repassa o cancelamento geral para esta tentativa
+                if cancel is not None and cancel.is_set():
+                    stop.set()
+                return self._attempt(mirror, path, temporary, download, stop)
+
+            races.append((executor.submit(run), stop, temporary))
+
+        def finish(winner):
+            future, _, temporary = winner
+            os.replace(temporary, destination)
+            for other in races:
+                if other is not winner:
+                    other[1].set()
+                    other[0].add_done_callback(lambda _, path=other[2]: _remove(path))
+            return future.result()
+
+        start(ranked[0])
+        pending = {races[0][0]}
+        remaining = list(ranked[1:])
+        error = None
+        while pending or remaining:
+            timeout = delay if remaining else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if cancel is not None and cancel.is_set():
+                for _, stop, _ in races:
+                    stop.set()
+            for race in races:
+                if race[0] in done:
+                    if race[0].exception() is None:
+                        if race is not races[0]:
+                            with self._lock:
+                                self.hedges_won += 1
+                        return finish(race)
+                    error = race[0].exception()
+                    _remove(race[2])
+            if cancel is not None and cancel.is_set():
+                raise M3u8DownloadError(f"Download de '{path}' cancelado.")
+            if not remaining:
+                continue
+            if not pending:
+                # Todas as tentativas falharam: failover para o próximo espelho
+                start(remaining.pop(0))
+                pending.add(races[-1][0])
+            elif not done:
+                # Lento demais: manda uma cópia para o próximo espelho
+                with self._lock:
+                    self.hedges += 1
+                start(remaining.pop(0))
+                pending.add(races[-1][0])
+        raise error
+
+    def close(self):
+        """Encerra as threads do hedging."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
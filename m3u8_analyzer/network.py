@@ -0,0 +1,215 @@
+import threading
+from typing import BinaryIO, Callable, Optional, Tuple, Union
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+Timeout = Union[float, Tuple[float, float]]
+
+# Cabeçalhos de navegador usados quando nenhuma requisição informa os seus
+HEADERS_DEFAULT = {
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Encoding": "gzip, deflate, br, zstd",
+    "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
+    "Sec-Fetch-Dest": "empty",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Site": "same-origin",
+    "Sec-Ch-Ua": "\"Not:A-Brand\";v=\"99\", \"Google Chrome\";v=\"118\", \"Chromium\";v=\"118\"",
+    "Sec-Ch-Ua-Mobile": "?0",
+    "Sec-Ch-Ua-Platform": "\"Windows\"",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/118.0.0.0 Safari/537.36"
+}
+
+# Cabeçalhos de corpo: um GET não tem corpo, e um Content-Length copiado de uma requisição do navegador faria o
+# servidor ler a próxima requisição da conexão reaproveitada como corpo desta
+_BODY_HEADERS = ('content-length', 'content-type')
+
+
+def _without_body_headers(headers: Optional[dict]) -> Optional[dict]:
+    if not headers or not any(name.lower() in _BODY_HEADERS for name in headers):
+        return headers
+    return {name: value for name, value in headers.items() if name.lower() not in _BODY_HEADERS}
+
+
+# Maior bloco lido de uma vez por `read_into_file` (ajustável por download)
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+_MIN_CHUNK_SIZE = 64 * 1024
+_buffers = threading.local()
+
+
+def _buffer(size: int) -> memoryview:
+    """Buffer reaproveitado pela thread atual, para não alocar um por segmento."""
+    buffer = getattr(_buffers, 'buffer', None)
+    if buffer is None or len(buffer) < size:
+        buffer = memoryview(bytearray(size))
+        _buffers.buffer = buffer
+    return buffer
+
+
+def read_into_file(response: requests.Response, file: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   on_chunk: Callable[[int], None] = None) -> int:
+    """
+    Copia o corpo de uma resposta `stream=True` para um arquivo usando um buffer pré-alocado.
+
+    Os dados são lidos com `readinto` direto em um `bytearray` reaproveitado pela thread e gravados a partir de
+    um `memoryview`, sem criar um objeto `bytes` por bloco. O bloco começa em 64 KB e dobra a cada leitura que
+    enche o buffer, até `chunk_size`, então segmentos pequenos não pagam por um buffer grande e os grandes
+    passam por poucas chamadas de leitura e escrita. Use um arquivo sem buffer (`open(path, 'wb',
+    buffering=0)`) para evitar mais uma cópia.
+
+    Args:
+        response (requests.Response): Resposta obtida com `stream=True`.
+        file: Arquivo binário de destino.
+        chunk_size (int): Maior bloco lido de uma vez, em bytes.
+        on_chunk (callable, optional): Chamado com o tamanho de cada bloco antes de gravá-lo (progresso,
+                                       limites de banda ou cancelamento, levantando uma exceção).
+
+    Returns:
+        int: Bytes gravados.
+
+    Raises:
+        requests.exceptions.RequestException: Nas mesmas situações de `iter_content` (conexão encerrada,
+                                              tempo esgotado, corpo compactado inválido).
+    """
+    raw = response.raw
+    # O adaptador do requests desliga a descompressão no urllib3; `iter_content` a faz por conta própria
+    raw.decode_content = True
+    chunk_size = max(chunk_size, 1)
+    buffer = _buffer(chunk_size)
+    size = min(_MIN_CHUNK_SIZE, chunk_size)
+    total = 0
+    while True:
+        try:
+            count = raw.readinto(buffer[:size])
+        except urllib3.exceptions.ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except urllib3.exceptions.DecodeError as e:
+            raise requests.exceptions.ContentDecodingError(e)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e)
+        if not count:
+            break
+        if on_chunk is not None:
+            on_chunk(count)
+        view = buffer[:count]
+        while view:
+            written = file.write(view)
+            view = view[written:] if written is not None else view[:0]
+        total += count
+        if count == size and size < chunk_size:
+            size = min(size * 2, chunk_size)
+    return total
+
+
+class HttpSession:
+    """
+    Sessão HTTP com pool de conexões, compartilhada entre playlist, chave e segmentos.
+
+    As conexões TCP/TLS são reaproveitadas entre requisições ao mesmo host (keep-alive), evitando um
+    handshake por segmento. Uma única instância pode ser usada por várias threads.
+
+    Examples:
+        ```python
+        session = HttpSession(pool_maxsize=16, headers={"Referer": "https://example.com/"}, timeout=(5, 30))
+        content = M3u8Analyzer.get_m3u8(url, session=session)
+        M3u8Downloader.downloader_and_remuxer_segments(url, 'video.mp4', session=session)
+        ```
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 32, keep_alive: bool = True,
+                 headers: dict = None, timeout: Optional[Timeout] = 20, max_retries: int = 0,
+                 verify: Union[bool, str] = True, proxies: dict = None):
+        """
+        Args:
+            pool_connections (int): Quantidade de hosts distintos mantidos no pool.
+            pool_maxsize (int): Conexões abertas mantidas por host (use ao menos o número de downloads
+                                simultâneos).
+            keep_alive (bool): Se False, envia `Connection: close` e cada requisição abre uma nova conexão.
+            headers (dict, optional): Cabeçalhos enviados em todas as requisições da sessão.
+            timeout (float | tuple, optional): Tempo limite padrão em segundos, ou (conexão, leitura).
+            max_retries (int): Tentativas de reconexão feitas pelo urllib3 em falhas de conexão.
+            verify (bool | str): Verificação do certificado TLS (ou caminho de um bundle de CAs).
+            proxies (dict, optional): Proxies no formato do `requests`.
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              max_retries=max_retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.verify = verify
+        if proxies:
+            self.session.proxies.update(proxies)
+        if headers:
+            self.session.headers.update(_without_body_headers(headers))
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+    @property
+    def headers(self) -> dict:
+        """Cabeçalhos padrão da sessão (podem ser alterados)."""
+        return self.session.headers
+
+    def get(self, url: str, headers: dict = None, timeout: Optional[Timeout] = None, stream: bool = False,
+            **kwargs) -> requests.Response:
+        """
+        Faz uma requisição GET usando o pool de conexões.
+
+        Args:
+            url (str): URL do recurso.
+            headers (dict, optional): Cabeçalhos desta requisição (combinados com os da sessão). `Content-Length`
+                e `Content-Type` são ignorados: a requisição não tem corpo.
+            timeout (float | tuple, optional): Tempo limite desta requisição. Padrão: o da sessão.
+            stream (bool): Se True, o corpo é lido sob demanda (`iter_content`).
+
+        Returns:
+            requests.Response: A resposta. Com `stream=True`, feche-a (ou use `with`) para devolver a
+            conexão ao pool.
+        """
+        return self.session.get(url, headers=_without_body_headers(headers),
+                                timeout=self.timeout if timeout is None else timeout,
+                                stream=stream, **kwargs)
+
+    def request_headers(self, url: str, headers: dict = None) -> dict:
+        """Cabeçalhos que um GET a `url` enviaria: os da sessão, os `headers` e os cookies guardados para a URL."""
+        request = requests.Request('GET', url, headers=_without_body_headers(headers))
+        return dict(self.session.prepare_request(request).headers)
+
+    def close(self):
+        """Fecha todas as conexões do pool."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_default_session: Optional[HttpSession] = None
+_default_lock = threading.Lock()
+
+
+def get_default_session() -> HttpSession:
+    """Sessão compartilhada usada quando nenhuma sessão é informada (criada na primeira chamada)."""
+    global _default_session
+    if _default_session is None:
+        with _default_lock:
+            if _default_session is None:
+                _default_session = HttpSession()
+    return _default_session
+
+
+def set_default_session(session: Optional[HttpSession]):
+    """
+    Substitui a sessão compartilhada usada por padrão em toda a biblioteca.
+
+    Args:
+        session (HttpSession, optional): Nova sessão padrão. Com None, uma nova sessão padrão é criada na
+                                         próxima requisição.
+    """
+    global _default_session
+    with _default_lock:
+        _default_session = session
@@ -0,0 +1,635 @@
+import codecs
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Generator, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .exeptions import M3u8Error
+
+# Atributos no formato CHAVE=valor ou CHAVE="valor, com vírgulas"
+_ATTR_RE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+def parse_attributes(value: str) -> Dict[str, str]:
+    """
+    Converte uma lista de atributos de uma tag M3U8 em um dicionário.
+
+    Os valores são mantidos exatamente como aparecem no manifesto (inclusive as aspas), para que a
+    playlist possa ser reescrita sem perdas.
+
+    Args:
+        value (str): Texto após os dois pontos da tag (ex.: 'BANDWIDTH=500000,CODECS="avc1,mp4a"').
+
+    Returns:
+        dict: Dicionário ordenado com os atributos encontrados.
+    """
+    return {m.group(1): m.group(2) for m in _ATTR_RE.finditer(value)}
+
+
+def unquote(value: Optional[str]) -> Optional[str]:
+    """Remove as aspas de um valor de atributo, se houver."""
+    if value and len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_byterange(value: Optional[str]) -> Optional[Tuple[int, Optional[int]]]:
+    """(tamanho, offset ou None) de um valor `<n>[@<o>]`, ou None se for inválido."""
+    length, _, offset = (value or '').partition('@')
+    length = _to_int(length)
+    start = _to_int(offset) if offset else None
+    if length is None or length < 0 or (offset and (start is None or start < 0)):
+        return None
+    return length, start
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class ByteRange:
+    """Sub-intervalo de um recurso (#EXT-X-BYTERANGE), com offset já resolvido."""
+    length: int
+    offset: int
+
+    @property
+    def end(self) -> int:
+        """Offset do primeiro byte após o intervalo."""
+        return self.offset + self.length
+
+    def to_header(self) -> str:
+        """Valor do cabeçalho HTTP `Range` correspondente."""
+        return f"bytes={self.offset}-{self.end - 1}"
+
+
+@dataclass(frozen=True, slots=True)
+class Key:
+    """Chave de criptografia em vigor (#EXT-X-KEY / #EXT-X-SESSION-KEY)."""
+    method: str
+    uri: Optional[str] = None
+    iv: Optional[str] = None
+    keyformat: Optional[str] = None
+    keyformatversions: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class InitSection:
+    """
+    Seção de inicialização (#EXT-X-MAP) usada por segmentos fMP4.
+
+    `key` é a #EXT-X-KEY em vigor na tag #EXT-X-MAP: com METHOD=AES-128, a seção também é criptografada
+    (RFC 8216, 4.3.2.5).
+    """
+    uri: str
+    byterange: Optional[ByteRange] = None
+    key: Optional[Key] = None
+
+
+@dataclass(slots=True)
+class Segment:
+    """Segmento de mídia com o contexto de tags que se aplica a ele."""
+    uri: str
+    duration: Optional[float] = None
+    title: str = ''
+    sequence: int = 0
+    index: int = 1
+    byterange: Optional[ByteRange] = None
+    key: Optional[Key] = None
+    init_section: Optional[InitSection] = None
+    discontinuity: bool = False
+    program_date_time: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Part:
+    """Segmento parcial do LL-HLS (#EXT-X-PART)."""
+    uri: str
+    duration: Optional[float] = None
+    # Media sequence do segmento ao qual a parte pertence e sua posição nele (0 = primeira)
+    sequence: int = 0
+    index: int = 0
+    independent: bool = False
+    gap: bool = False
+    byterange: Optional[ByteRange] = None
+
+
+@dataclass(frozen=True, slots=True)
+class PreloadHint:
+    """Recurso anunciado antes de existir (#EXT-X-PRELOAD-HINT), que pode ser pedido imediatamente."""
+    type: str
+    uri: str
+    # BYTERANGE-START e BYTERANGE-LENGTH; com início e sem tamanho, o intervalo vai até o fim do recurso
+    start: Optional[int] = None
+    length: Optional[int] = None
+
+    @property
+    def open_ended(self) -> bool:
+        """True se a dica é um intervalo sem fim conhecido (o restante de um recurso ainda em produção)."""
+        return self.start is not None and self.length is None
+
+    def to_header(self) -> Optional[str]:
+        """Valor do cabeçalho HTTP `Range` da dica, ou None se for o recurso inteiro."""
+        if self.start is None and self.length is None:
+            return None
+        start = self.start or 0
+        return f"bytes={start}-" if self.length is None else f"bytes={start}-{start + self.length - 1}"
+
+
+@dataclass(slots=True)
+class ServerControl:
+    """Recursos de entrega do servidor (#EXT-X-SERVER-CONTROL)."""
+    attributes: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def can_block_reload(self) -> bool:
+        """True se o servidor aceita recargas bloqueantes (`_HLS_msn`/`_HLS_part`)."""
+        return self.attributes.get('CAN-BLOCK-RELOAD') == 'YES'
+
+    @property
+    def can_skip_until(self) -> Optional[float]:
+        return _to_float(self.attributes.get('CAN-SKIP-UNTIL'))
+
+    @property
+    def can_skip_dateranges(self) -> bool:
+        return self.attributes.get('CAN-SKIP-DATERANGES') == 'YES'
+
+    @property
+    def hold_back(self) -> Optional[float]:
+        return _to_float(self.attributes.get('HOLD-BACK'))
+
+    @property
+    def part_hold_back(self) -> Optional[float]:
+        return _to_float(self.attributes.get('PART-HOLD-BACK'))
+
+
+@dataclass(slots=True)
+class Variant:
+    """Variante de uma playlist master (#EXT-X-STREAM-INF ou #EXT-X-I-FRAME-STREAM-INF)."""
+    uri: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+    iframe: bool = False
+
+    @property
+    def bandwidth(self) -> Optional[int]:
+        return _to_int(self.attributes.get('BANDWIDTH'))
+
+    @property
+    def average_bandwidth(self) -> Optional[int]:
+        return _to_int(self.attributes.get('AVERAGE-BANDWIDTH'))
+
+    @property
+    def resolution(self) -> Optional[str]:
+        return self.attributes.get('RESOLUTION')
+
+    @property
+    def pixels(self) -> int:
+        """Número de pixels da resolução (largura x altura), ou 0 se não houver resolução."""
+        width, _, height = (self.resolution or '').partition('x')
+        try:
+            return int(width) * int(height)
+        except ValueError:
+            return 0
+
+    @property
+    def codecs(self) -> Optional[str]:
+        return unquote(self.attributes.get('CODECS'))
+
+    @property
+    def frame_rate(self) -> Optional[float]:
+        return _to_float(self.attributes.get('FRAME-RATE'))
+
+    @property
+    def audio(self) -> Optional[str]:
+        return unquote(self.attributes.get('AUDIO'))
+
+    @property
+    def video(self) -> Optional[str]:
+        return unquote(self.attributes.get('VIDEO'))
+
+    @property
+    def subtitles(self) -> Optional[str]:
+        return unquote(self.attributes.get('SUBTITLES'))
+
+
+@dataclass(slots=True)
+class Rendition:
+    """Mídia alternativa declarada por #EXT-X-MEDIA (áudio, legendas, etc.)."""
+    attributes: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def type(self) -> Optional[str]:
+        return self.attributes.get('TYPE')
+
+    @property
+    def group_id(self) -> Optional[str]:
+        return unquote(self.attributes.get('GROUP-ID'))
+
+    @property
+    def name(self) -> Optional[str]:
+        return unquote(self.attributes.get('NAME'))
+
+    @property
+    def language(self) -> Optional[str]:
+        return unquote(self.attributes.get('LANGUAGE'))
+
+    @property
+    def uri(self) -> Optional[str]:
+        return unquote(self.attributes.get('URI'))
+
+    @property
+    def default(self) -> bool:
+        return self.attributes.get('DEFAULT') == 'YES'
+
+
+def _segment_table():
+    # Importação tardia: segment_table depende dos registros definidos neste módulo
+    from .segment_table import SegmentTable
+    return SegmentTable()
+
+
+@dataclass(slots=True)
+class Playlist:
+    """
+    Modelo tipado de uma playlist M3U8 (master ou de mídia).
+
+    É produzido por `PlaylistParser` em uma única passada sobre o texto. Os segmentos ficam em uma
+    `SegmentTable` compacta; `segments[i]` retorna um `Segment`.
+    """
+    is_master: bool = False
+    version: Optional[int] = None
+    target_duration: Optional[int] = None
+    media_sequence: int = 0
+    discontinuity_sequence: int = 0
+    playlist_type: Optional[str] = None
+    endlist: bool = False
+    independent_segments: bool = False
+    i_frames_only: bool = False
+    has_extinf: bool = False
+    segments: 'SegmentTable' = field(default_factory=_segment_table)
+    variants: List[Variant] = field(default_factory=list)
+    iframe_variants: List[Variant] = field(default_factory=list)
+    renditions: List[Rendition] = field(default_factory=list)
+    keys: List[Key] = field(default_factory=list)
+    session_keys: List[Key] = field(default_factory=list)
+    codecs: List[str] = field(default_factory=list)
+    # LL-HLS: #EXT-X-PART-INF, #EXT-X-SERVER-CONTROL, #EXT-X-PART e #EXT-X-PRELOAD-HINT
+    part_target: Optional[float] = None
+    server_control: Optional[ServerControl] = None
+    parts: List[Part] = field(default_factory=list)
+    preload_hints: List[PreloadHint] = field(default_factory=list)
+
+    @property
+    def encrypted(self) -> bool:
+        """True se a playlist declara alguma #EXT-X-KEY que criptografa (METHOD diferente de NONE)."""
+        return any(key.method != 'NONE' for key in self.keys)
+
+    @property
+    def total_duration(self) -> float:
+        """Soma das durações (#EXTINF) de todos os segmentos."""
+        return self.segments.total_duration
+
+    @property
+    def low_latency(self) -> bool:
+        """True se a playlist anuncia segmentos parciais (LL-HLS)."""
+        return bool(self.parts) or self.part_target is not None
+
+    def uris(self) -> List[str]:
+        """URIs de todas as linhas que não são tags: segmentos seguidos das variantes."""
+        return self.segments.uris() + [v.uri for v in self.variants]
+
+
+class PlaylistParser:
+    """
+    Tokenizador de playlists M3U8 orientado a linhas.
+
+    Lê cada linha exatamente uma vez e mantém o estado das tags que se aplicam ao próximo segmento
+    (#EXTINF, #EXT-X-KEY, #EXT-X-MAP, #EXT-X-BYTERANGE, ...). Pode ser usado de uma vez com `parse()`
+    ou linha a linha com `feed()`/`close()`.
+
+    Examples:
+        ```python
+        playlist = PlaylistParser.parse(content)
+        print(playlist.is_master, len(playlist.segments))
+        ```
+    """
+
+    def __init__(self, keep_segments: bool = True):
+        """
+        Args:
+            keep_segments (bool): Se False, os segmentos não são acumulados em `Playlist.segments`; apenas
+                                  retornados por `feed()`. Útil para playlists muito grandes.
+        """
+        self.playlist = Playlist()
+        self.keep_segments = keep_segments
+        self._count = 0
+        self._duration = None
+        self._title = ''
+        self._byterange = None
+        self._next_offset = 0
+        self._key = None
+        self._init_section = None
+        self._discontinuity = False
+        self._program_date_time = None
+        self._stream_inf = None
+        self._part_index = 0
+        # (uri, offset seguinte) da última parte com BYTERANGE, para offsets implícitos
+        self._part_next_offset = (None, 0)
+        self._handlers = {
+            '#EXTINF': self._on_extinf,
+            '#EXT-X-BYTERANGE': self._on_byterange,
+            '#EXT-X-KEY': self._on_key,
+            '#EXT-X-MAP': self._on_map,
+            '#EXT-X-DISCONTINUITY': self._on_discontinuity,
+            '#EXT-X-PROGRAM-DATE-TIME': self._on_program_date_time,
+            '#EXT-X-STREAM-INF': self._on_stream_inf,
+            '#EXT-X-I-FRAME-STREAM-INF': self._on_iframe_stream_inf,
+            '#EXT-X-MEDIA': self._on_media,
+            '#EXT-X-VERSION': self._on_version,
+            '#EXT-X-TARGETDURATION': self._on_target_duration,
+            '#EXT-X-MEDIA-SEQUENCE': self._on_media_sequence,
+            '#EXT-X-DISCONTINUITY-SEQUENCE': self._on_discontinuity_sequence,
+            '#EXT-X-PLAYLIST-TYPE': self._on_playlist_type,
+            '#EXT-X-ENDLIST': self._on_endlist,
+            '#EXT-X-INDEPENDENT-SEGMENTS': self._on_independent_segments,
+            '#EXT-X-I-FRAMES-ONLY': self._on_i_frames_only,
+            '#EXT-X-SESSION-KEY': self._on_session_key,
+            '#EXT-X-PART': self._on_part,
+            '#EXT-X-PART-INF': self._on_part_inf,
+            '#EXT-X-PRELOAD-HINT': self._on_preload_hint,
+            '#EXT-X-SERVER-CONTROL': self._on_server_control,
+        }
+
+    @classmethod
+    def parse(cls, content: str) -> Playlist:
+        """
+        Analisa o conteúdo completo de uma playlist.
+
+        Args:
+            content (str): Conteúdo da playlist M3U8.
+
+        Returns:
+            Playlist: O modelo da playlist.
+        """
+        if not isinstance(content, str):
+            raise M3u8Error("O conteúdo da playlist deve ser uma string!", errors=[type(content).__name__])
+        parser = cls()
+        feed = parser.feed
+        for line in content.splitlines():
+            feed(line)
+        return parser.close()
+
+    def feed(self, line: str) -> Optional[Segment]:
+        """
+        Processa uma linha da playlist.
+
+        Args:
+            line (str): Linha do manifesto (com ou sem quebra de linha).
+
+        Returns:
+            Optional[Segment]: O segmento concluído por esta linha, se houver.
+        """
+        line = line.strip()
+        if not line:
+            return None
+        if line[0] != '#':
+            return self._on_uri(line)
+        tag, _, value = line.partition(':')
+        handler = self._handlers.get(tag)
+        if handler is not None:
+            handler(value)
+        return None
+
+    def close(self) -> Playlist:
+        """Finaliza a análise e retorna o modelo construído."""
+        return self.playlist
+
+    def _on_uri(self, uri: str) -> Optional[Segment]:
+        if self._stream_inf is not None:
+            variant = Variant(uri=uri, attributes=self._stream_inf)
+            self._stream_inf = None
+            self.playlist.variants.append(variant)
+            return None
+        segment = Segment(
+            uri=uri,
+            duration=self._duration,
+            title=self._title,
+            sequence=self.playlist.media_sequence + self._count,
+            index=self._count + 1,
+            byterange=self._byterange,
+            key=self._key,
+            init_section=self._init_section,
+            discontinuity=self._discontinuity,
+            program_date_time=self._program_date_time,
+        )
+        self._count += 1
+        self._part_index = 0
+        self._duration = None
+        self._title = ''
+        self._byterange = None
+        self._discontinuity = False
+        self._program_date_time = None
+        if self.keep_segments:
+            self.playlist.segments.append(segment)
+        return segment
+
+    def _add_codecs(self, attributes: Dict[str, str]):
+        codecs = unquote(attributes.get('CODECS'))
+        if codecs and codecs not in self.playlist.codecs:
+            self.playlist.codecs.append(codecs)
+
+    def _on_extinf(self, value: str):
+        self.playlist.has_extinf = True
+        duration, _, self._title = value.partition(',')
+        self._duration = _to_float(duration)
+
+    def _on_byterange(self, value: str):
+        parsed = _to_byterange(value)
+        if parsed is None:
+            # Tag malformada: ignorada, como as demais tags com valores inválidos
+            return
+        length, start = parsed
+        if start is None:
+            start = self._next_offset
+        self._byterange = ByteRange(length=length, offset=start)
+        self._next_offset = start + length
+
+    @staticmethod
+    def _make_key(value: str) -> Key:
+        attrs = parse_attributes(value)
+        return Key(
+            method=attrs.get('METHOD', 'NONE'),
+            uri=unquote(attrs.get('URI')),
+            iv=attrs.get('IV'),
+            keyformat=unquote(attrs.get('KEYFORMAT')),
+            keyformatversions=unquote(attrs.get('KEYFORMATVERSIONS')),
+        )
+
+    def _on_key(self, value: str):
+        key = self._make_key(value)
+        self.playlist.keys.append(key)
+        self._key = None if key.method == 'NONE' else key
+
+    def _on_session_key(self, value: str):
+        self.playlist.session_keys.append(self._make_key(value))
+
+    def _on_map(self, value: str):
+        attrs = parse_attributes(value)
+        byterange = None
+        parsed = _to_byterange(unquote(attrs.get('BYTERANGE')))
+        if parsed is not None:
+            byterange = ByteRange(length=parsed[0], offset=parsed[1] or 0)
+        self._init_section = InitSection(uri=unquote(attrs.get('URI')), byterange=byterange, key=self._key)
+
+    def _on_discontinuity(self, value: str):
+        self._discontinuity = True
+
+    def _on_program_date_time(self, value: str):
+        self._program_date_time = value
+
+    def _on_stream_inf(self, value: str):
+        self.playlist.is_master = True
+        self._stream_inf = parse_attributes(value)
+        self._add_codecs(self._stream_inf)
+
+    def _on_iframe_stream_inf(self, value: str):
+        attrs = parse_attributes(value)
+        self._add_codecs(attrs)
+        self.playlist.iframe_variants.append(Variant(uri=unquote(attrs.get('URI')), attributes=attrs, iframe=True))
+
+    def _on_media(self, value: str):
+        self.playlist.renditions.append(Rendition(attributes=parse_attributes(value)))
+
+    def _on_version(self, value: str):
+        self.playlist.version = _to_int(value)
+
+    def _on_target_duration(self, value: str):
+        self.playlist.target_duration = _to_int(value)
+
+    def _on_media_sequence(self, value: str):
+        self.playlist.media_sequence = _to_int(value) or 0
+
+    def _on_discontinuity_sequence(self, value: str):
+        self.playlist.discontinuity_sequence = _to_int(value) or 0
+
+    def _on_playlist_type(self, value: str):
+        self.playlist.playlist_type = value.strip()
+
+    def _on_endlist(self, value: str):
+        self.playlist.endlist = True
+
+    def _on_independent_segments(self, value: str):
+        self.playlist.independent_segments = True
+
+    def _on_i_frames_only(self, value: str):
+        self.playlist.i_frames_only = True
+
+    def _on_part(self, value: str):
+        attrs = parse_attributes(value)
+        uri = unquote(attrs.get('URI'))
+        byterange = None
+        parsed = _to_byterange(unquote(attrs.get('BYTERANGE')))
+        if parsed is not None:
+            length, start = parsed
+            last_uri, next_offset = self._part_next_offset
+            if start is None:
+                start = next_offset if last_uri == uri else 0
+            byterange = ByteRange(length=length, offset=start)
+            self._part_next_offset = (uri, byterange.end)
+        self.playlist.parts.append(Part(
+            uri=uri,
+            duration=_to_float(attrs.get('DURATION')),
+            sequence=self.playlist.media_sequence + self._count,
+            index=self._part_index,
+            independent=attrs.get('INDEPENDENT') == 'YES',
+            gap=attrs.get('GAP') == 'YES',
+            byterange=byterange,
+        ))
+        self._part_index += 1
+
+    def _on_part_inf(self, value: str):
+        self.playlist.part_target = _to_float(parse_attributes(value).get('PART-TARGET'))
+
+    def _on_preload_hint(self, value: str):
+        attrs = parse_attributes(value)
+        self.playlist.preload_hints.append(PreloadHint(
+            type=attrs.get('TYPE', 'PART'),
+            uri=unquote(attrs.get('URI')),
+            start=_to_int(attrs.get('BYTERANGE-START')),
+            length=_to_int(attrs.get('BYTERANGE-LENGTH')),
+        ))
+
+    def _on_server_control(self, value: str):
+        self.playlist.server_control = ServerControl(attributes=parse_attributes(value))
+
+
+def iter_lines(source: Union[Iterable[bytes], Iterable[str], bytes, str], encoding: str = 'utf-8-sig',
+               chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """
+    Gera as linhas de uma playlist à medida que os dados chegam.
+
+    Aceita qualquer iterável de blocos `bytes`/`str` (ex.: `response.iter_content()`, um arquivo aberto em
+    modo binário ou texto), uma resposta `requests` aberta com `stream=True` ou o conteúdo completo. Apenas
+    o bloco atual e a linha incompleta ficam em memória.
+
+    Args:
+        source: Origem dos dados.
+        encoding (str): Codificação usada para decodificar blocos em bytes.
+        chunk_size (int): Tamanho dos blocos lidos quando `source` for uma resposta `requests`.
+
+    Yields:
+        str: Cada linha, sem a quebra de linha final (pode conter '\r').
+    """
+    if hasattr(source, 'iter_content'):
+        chunks = source.iter_content(chunk_size=chunk_size)
+    elif isinstance(source, (bytes, bytearray, str)):
+        chunks = (source,)
+    else:
+        chunks = source
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    pending = ''
+    for chunk in chunks:
+        if not isinstance(chunk, str):
+            chunk = decoder.decode(chunk)
+        if not chunk:
+            continue
+        lines = (pending + chunk).split('\n')
+        pending = lines.pop()
+        yield from lines
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def iter_segments(source: Union[Iterable[bytes], Iterable[str], bytes, str],
+                  encoding: str = 'utf-8-sig') -> Generator[Segment, None, Playlist]:
+    """
+    Analisa uma playlist de mídia em fluxo, gerando cada segmento assim que sua linha de URI chega.
+
+    Os segmentos não são acumulados, então o uso de memória é constante independentemente do tamanho da
+    playlist. Ao final, o gerador retorna (via `StopIteration.value`) o modelo da playlist sem os segmentos,
+    com as informações de cabeçalho (#EXT-X-TARGETDURATION, #EXT-X-ENDLIST, ...).
+
+    Args:
+        source: Origem dos dados (ver `iter_lines`).
+        encoding (str): Codificação usada para decodificar blocos em bytes.
+
+    Yields:
+        Segment: Cada segmento, em ordem, com o contexto de KEY/MAP/BYTERANGE em vigor.
+    """
+    parser = PlaylistParser(keep_segments=False)
+    feed = parser.feed
+    for line in iter_lines(source, encoding=encoding):
+        segment = feed(line)
+        if segment is not None:
+            yield segment
+    return parser.close()
@@ -0,0 +1,293 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Tuple, Type
+from urllib.parse import urlsplit
+
+import requests
+
+from .exeptions import M3u8CircuitOpenError, M3u8NetworkingError
+
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+RETRYABLE_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    M3u8NetworkingError,
+)
+# Subclasses das anteriores que não se resolvem com uma nova tentativa
+FATAL_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    requests.exceptions.SSLError,
+    requests.exceptions.InvalidURL,
+)
+
+
+def host_of(url: str) -> str:
+    """Host (com porta) de uma URL, usado como chave do circuito."""
+    return urlsplit(url).netloc.rpartition('@')[2].lower()
+
+
+class CircuitBreaker:
+    """
+    Disjuntor por host: depois de `failure_threshold` falhas seguidas, as requisições ao host falham na hora
+    (`M3u8CircuitOpenError`) durante `recovery_time` segundos. Passado esse tempo, uma única requisição de teste
+    é liberada (meio-aberto): se der certo o circuito fecha, senão volta a abrir.
+
+    Seguro para uso por várias threads; pode ser compartilhado entre trabalhos.
+
+    Examples:
+        ```python
+        breaker = CircuitBreaker(failure_threshold=5, recovery_time=30)
+        policy = RetryPolicy(attempts=4, breaker=breaker)
+        ```
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            failure_threshold (int): Falhas seguidas que abrem o circuito.
+            recovery_time (float): Segundos com o circuito aberto antes da requisição de teste.
+            clock (callable): Relógio em segundos (substituível nos testes).
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.clock = clock
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def state(self, host: str) -> str:
+        """'closed', 'open' ou 'half-open'."""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return 'closed'
+            return 'half-open' if self.clock() - opened_at >= self.recovery_time else 'open'
+
+    def before(self, host: str) -> bool:
+        """
+        Chamado antes de cada requisição.
+
+        Returns:
+            bool: True se esta for a requisição de teste do circuito meio-aberto; ela deve terminar com
+                  `success`, `failure` ou `release`.
+
+        Raises:
+            M3u8CircuitOpenError: Se o circuito do host estiver aberto (ou já houver uma requisição de teste).
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return False
+            remaining = self.recovery_time - (self.clock() - opened_at)
+            if remaining <= 0 and not self._probing.get(host):
+                self._probing[host] = True
+                return True
+        raise M3u8CircuitOpenError(f"Circuito aberto para {host}: requisição não enviada",
+                                   errors=[f'nova tentativa em {max(remaining, 0):.1f}s'])
+
+    def success(self, host: str):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._probing.pop(host, None)
+
+    def failure(self, host: str):
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if self._probing.pop(host, False) or failures >= self.failure_threshold:
+                self._opened_at[host] = self.clock()
+
+    def release(self, host: str):
+        """
+        Libera a requisição de teste sem contabilizá-la (ex.: cancelada ou interrompida por um erro que não é
+        do host), para que a próxima requisição possa testar o circuito.
+        """
+        with self._lock:
+            self._probing.pop(host, None)
+
+
+class RetryPolicy:
+    """
+    Política de novas tentativas para playlists, chaves e segmentos.
+
+    Cada tentativa que falha com uma exceção de `exceptions` ou responde com um status de `statuses` é repetida
+    após um atraso exponencial (`backoff * 2 ** (tentativa - 1)`, limitado a `max_backoff`) com jitter
+    aleatório; `Retry-After` é respeitado quando presente. Com um `CircuitBreaker`, falhas e sucessos são
+    contabilizados por host e hosts fora do ar deixam de ser chamados.
+
+    Examples:
+        ```python
+        policy = RetryPolicy(attempts=5, backoff=0.5, breaker=CircuitBreaker())
+        M3u8Downloader.downloader_and_remuxer_segments(url, 'video.mp4', retry=policy)
+        ```
+    """
+
+    def __init__(self, attempts: int = 3, backoff: float = 0.5, max_backoff: float = 30.0, jitter: float = 0.5,
+                 statuses: Iterable[int] = RETRYABLE_STATUSES,
+                 exceptions: Tuple[Type[BaseException], ...] = RETRYABLE_EXCEPTIONS,
+                 respect_retry_after: bool = True, breaker: Optional[CircuitBreaker] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            attempts (int): Número máximo de tentativas (1 = sem novas tentativas).
+            backoff (float): Atraso base, em segundos.
+            max_backoff (float): Atraso máximo entre tentativas, em segundos.
+            jitter (float): Fração aleatória do atraso (0 a 1) sorteada a cada tentativa, para espalhar clientes.
+            statuses: Status HTTP que disparam nova tentativa.
+            exceptions: Exceções que disparam nova tentativa.
+            respect_retry_after (bool): Usa o cabeçalho `Retry-After` (em segundos) como atraso, se presente.
+            breaker (CircuitBreaker, optional): Disjuntor por host.
+            sleep (callable): Função de espera (substituível nos testes).
+        """
+        if attempts < 1:
+            raise ValueError("attempts deve ser maior que zero!")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses: FrozenSet[int] = frozenset(statuses)
+        self.exceptions = exceptions
+        self.respect_retry_after = respect_retry_after
+        self.breaker = breaker
+        self.sleep = sleep
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Atraso antes da tentativa seguinte à tentativa `attempt` (começando em 1)."""
+        if self.respect_retry_after and retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        return delay * (1 - self.jitter * random.random())
+
+    def _status(self, result) -> Tuple[Optional[int], Optional[str]]:
+        status = getattr(result, 'status_code', None)
+        if status is None:
+            status = getattr(result, 'status', None)
+        headers = getattr(result, 'headers', None) or {}
+        return status, headers.get('Retry-After') or headers.get('retry-after')
+
+    def _before(self, host: str) -> bool:
+        return self.breaker.before(host) if self.breaker is not None else False
+
+    def _outcome(self, host: str, ok: bool):
+        if self.breaker is not None:
+            if ok:
+                self.breaker.success(host)
+            else:
+                self.breaker.failure(host)
+
+    def _abandon(self, host: str, probe: bool):
+        # Uma requisição de teste que termina sem resposta nem erro de rede não pode deixar o circuito
+        # esperando por ela para sempre
+        if probe:
+            self.breaker.release(host)
+
+    def _should_retry(self, result) -> Tuple[bool, Optional[str]]:
+        status, retry_after = self._status(result)
+        return status in self.statuses, retry_after
+
+    def run(self, url: str, attempt: Callable[[], object]):
+        """
+        Executa `attempt` com novas tentativas.
+
+        Args:
+            url (str): URL da requisição (define o host do circuito).
+            attempt (callable): Faz uma tentativa completa e retorna a resposta (com `status_code`/`status`).
+
+        Returns:
+            A resposta da última tentativa. Se todas responderem com status repetível, a última é retornada
+            para que o chamador trate o status.
+
+        Raises:
+            M3u8CircuitOpenError: Se o circuito do host estiver aberto.
+            Exception: A exceção da última tentativa, se todas falharem.
+        """
+        host = host_of(url)
+        for number in range(1, self.attempts + 1):
+            probe = self._before(host)
+            try:
+                result = attempt()
+            except M3u8CircuitOpenError:
+                self._abandon(host, probe)
+                raise
+            except FATAL_EXCEPTIONS:
+                self._outcome(host, False)
+                raise
+            except self.exceptions:
+                self._outcome(host, False)
+                if number == self.attempts:
+                    raise
+                self.sleep(self.delay(number))
+                continue
+            except BaseException:
+                self._abandon(host, probe)
+                raise
+            retry, retry_after = self._should_retry(result)
+            self._outcome(host, not retry)
+            if not retry or number == self.attempts:
+                return result
+            close = getattr(result, 'close', None)
+            if close is not None:
+                close()
+            self.sleep(self.delay(number, retry_after))
+        return result
+
+    async def run_async(self, url: str, attempt: Callable[[], object]):
+        """Versão assíncrona de `run`: `attempt` é uma função que retorna uma corrotina."""
+        host = host_of(url)
+        for number in range(1, self.attempts + 1):
+            probe = self._before(host)
+            try:
+                result = await attempt()
+            except M3u8CircuitOpenError:
+                self._abandon(host, probe)
+                raise
+            except FATAL_EXCEPTIONS:
+                self._outcome(host, False)
+                raise
+            except self.exceptions:
+                self._outcome(host, False)
+                if number == self.attempts:
+                    raise
+                await asyncio.sleep(self.delay(number))
+                continue
+            except BaseException:
+                self._abandon(host, probe)
+                raise
+            retry, retry_after = self._should_retry(result)
+            self._outcome(host, not retry)
+            if not retry or number == self.attempts:
+                return result
+            release = getattr(result, 'release', None)
+            if release is not None:
+                await release()
+            await asyncio.sleep(self.delay(number, retry_after))
+        return result
+
+
+NO_RETRY = RetryPolicy(attempts=1)
+
+_default_policy: RetryPolicy = RetryPolicy()
+
+
+def get_default_policy() -> RetryPolicy:
+    """Política usada quando nenhuma é informada (3 tentativas, sem disjuntor)."""
+    return _default_policy
+
+
+def set_default_policy(policy: Optional[RetryPolicy]):
+    """
+    Substitui a política padrão usada em toda a biblioteca.
+
+    Args:
+        policy (RetryPolicy, optional): Nova política. Com None, volta ao padrão (3 tentativas, sem disjuntor).
+    """
+    global _default_policy
+    _default_policy = policy if policy is not None else RetryPolicy()
@@ -0,0 +1,296 @@
+import math
+import os
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .playlist import ByteRange, InitSection, Key, Segment
+
+_NONE = -1
+
+# Colunas numéricas; podem ser `array`s ou, em tabelas carregadas de snapshot, `memoryview`s somente leitura
+_COLUMNS = ('_uri_start', '_uri_len', '_durations', '_sequences', '_br_offsets', '_br_lengths', '_key_ids',
+            '_map_ids', '_discontinuities')
+
+
+class SegmentTable:
+    """
+    Tabela compacta de segmentos, armazenada em colunas.
+
+    Durações, números de sequência e byte-ranges ficam em `array`s; as URIs são trechos de um único buffer
+    de texto compartilhado, após um prefixo base comum (ex.: 'https://cdn.example.com/video/'). Chaves e
+    seções #EXT-X-MAP, que se repetem entre segmentos, são guardadas uma única vez e referenciadas por índice.
+
+    O acesso por índice e o fatiamento são O(1) por elemento e retornam, respectivamente, um `Segment` e uma
+    nova `SegmentTable` que compartilha o buffer de URIs.
+
+    Examples:
+        ```python
+        table = SegmentTable.from_segments(segments)
+        print(len(table), table.uri(0), table[-1].duration)
+        first_ten = table[:10]
+        ```
+    """
+
+    __slots__ = ('_base', '_buffer', '_uri_start', '_uri_len', '_pending', '_durations', '_sequences',
+                 '_br_offsets', '_br_lengths', '_key_ids', '_map_ids', '_discontinuities', '_keys',
+                 '_maps', '_lookup', '_titles', '_dates', '_origin')
+
+    def __init__(self):
+        self._base = ''
+        self._buffer = ''
+        self._uri_start = array('I')
+        self._uri_len = array('I')
+        self._pending: List[str] = []
+        self._durations = array('d')
+        self._sequences = array('q')
+        self._br_offsets = array('q')
+        self._br_lengths = array('q')
+        self._key_ids = array('i')
+        self._map_ids = array('i')
+        self._discontinuities = array('B')
+        self._keys: List[Key] = []
+        self._maps: List[InitSection] = []
+        self._lookup: Dict[object, int] = {}
+        # Títulos de #EXTINF e #EXT-X-PROGRAM-DATE-TIME são raros: guardados de forma esparsa
+        self._titles: Dict[int, str] = {}
+        self._dates: Dict[int, str] = {}
+        self._origin: Optional[int] = None
+
+    @classmethod
+    def from_segments(cls, segments) -> 'SegmentTable':
+        """Constrói uma tabela a partir de um iterável de `Segment`."""
+        table = cls()
+        for segment in segments:
+            table.append(segment)
+        table.compact()
+        return table
+
+    @classmethod
+    def _from_columns(cls, base: str, buffer: str, columns: Dict[str, object], keys: List[Key],
+                      maps: List[InitSection], titles: Dict[int, str], dates: Dict[int, str],
+                      origin: Optional[int]) -> 'SegmentTable':
+        """Monta uma tabela a partir de colunas já prontas (usado pelo carregamento de snapshots)."""
+        table = cls()
+        table._base = base
+        table._buffer = buffer
+        for name in _COLUMNS:
+            setattr(table, name, columns[name])
+        table._keys = keys
+        table._maps = maps
+        table._titles = titles
+        table._dates = dates
+        table._origin = origin
+        return table
+
+    def _columns(self) -> Dict[str, object]:
+        """Colunas numéricas da tabela, por nome (usado pela gravação de snapshots)."""
+        if self._pending:
+            self.compact()
+        return {name: getattr(self, name) for name in _COLUMNS}
+
+    def _thaw(self):
+        """Converte colunas somente leitura (memoryview de um snapshot) em `array`s editáveis."""
+        if isinstance(self._durations, array):
+            return
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, array(column.format, column))
+        self._keys = list(self._keys)
+        self._maps = list(self._maps)
+        self._lookup = {(type(v), v): i for items in (self._keys, self._maps) for i, v in enumerate(items)}
+
+    def __getstate__(self) -> dict:
+        self._thaw()
+        self.compact()
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _ref(self, items: list, value) -> int:
+        if value is None:
+            return _NONE
+        # Chaves e MAPs iguais compartilham o mesmo índice
+        token = (type(value), value)
+        ref = self._lookup.get(token)
+        if ref is None:
+            ref = self._lookup[token] = len(items)
+            items.append(value)
+        return ref
+
+    def append(self, segment: Segment):
+        """Adiciona um segmento ao final da tabela."""
+        self._thaw()
+        i = len(self._durations)
+        if self._origin is None:
+            self._origin = segment.sequence - segment.index + 1
+        self._pending.append(segment.uri)
+        self._durations.append(math.nan if segment.duration is None else segment.duration)
+        self._sequences.append(segment.sequence)
+        # As colunas de byte-range só são alocadas quando a playlist usa #EXT-X-BYTERANGE
+        if segment.byterange is not None:
+            if len(self._br_lengths) < i:
+                self._br_offsets.extend(array('q', [_NONE]) * (i - len(self._br_offsets)))
+                self._br_lengths.extend(array('q', [_NONE]) * (i - len(self._br_lengths)))
+            self._br_offsets.append(segment.byterange.offset)
+            self._br_lengths.append(segment.byterange.length)
+        elif self._br_lengths:
+            self._br_offsets.append(_NONE)
+            self._br_lengths.append(_NONE)
+        self._key_ids.append(self._ref(self._keys, segment.key))
+        self._map_ids.append(self._ref(self._maps, segment.init_section))
+        self._discontinuities.append(1 if segment.discontinuity else 0)
+        if segment.title:
+            self._titles[i] = segment.title
+        if segment.program_date_time:
+            self._dates[i] = segment.program_date_time
+
+    def compact(self):
+        """
+        Move as URIs pendentes para o buffer compartilhado.
+
+        É chamado automaticamente na primeira leitura após `append()`; o prefixo base é recalculado apenas
+        quando uma nova URI não o compartilha.
+        """
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = []
+        if self._uri_start and not all(uri.startswith(self._base) for uri in pending):
+            pending = [self.uri(i) for i in range(len(self._uri_start))] + pending
+            self._base = ''
+            self._buffer = ''
+            self._uri_start = array('I')
+            self._uri_len = array('I')
+        if not self._uri_start:
+            self._base = os.path.commonprefix(pending)
+        cut = len(self._base)
+        position = len(self._buffer)
+        parts = [self._buffer]
+        starts = self._uri_start
+        lengths = self._uri_len
+        for uri in pending:
+            size = len(uri) - cut
+            starts.append(position)
+            lengths.append(size)
+            parts.append(uri[cut:])
+            position += size
+        self._buffer = ''.join(parts)
+
+    def __len__(self) -> int:
+        return len(self._durations)
+
+    def __bool__(self) -> bool:
+        return len(self._durations) > 0
+
+    def uri(self, i: int) -> str:
+        """URI completa do segmento `i`, sem construir o `Segment`."""
+        if self._pending:
+            self.compact()
+        start = self._uri_start[i]
+        return self._base + self._buffer[start:start + self._uri_len[i]]
+
+    def iter_uris(self) -> Iterator[str]:
+        """Itera sobre as URIs dos segmentos em ordem."""
+        if self._pending:
+            self.compact()
+        base = self._base
+        buffer = self._buffer
+        for start, size in zip(self._uri_start, self._uri_len):
+            yield base + buffer[start:start + size]
+
+    def uris(self) -> List[str]:
+        """Lista das URIs dos segmentos."""
+        return list(self.iter_uris())
+
+    def enumerated_uris(self) -> List[Tuple[int, str]]:
+        """Lista de tuplas (ordem, URI), no formato de `get_segments()['enumerated_uris']`."""
+        return list(enumerate(self.iter_uris(), start=1))
+
+    @property
+    def base(self) -> str:
+        """Prefixo comum a todas as URIs."""
+        if self._pending:
+            self.compact()
+        return self._base
+
+    @property
+    def durations(self) -> array:
+        """Coluna de durações (NaN quando o segmento não tem #EXTINF)."""
+        return self._durations
+
+    @property
+    def sequences(self) -> array:
+        """Coluna de números de sequência (#EXT-X-MEDIA-SEQUENCE + posição)."""
+        return self._sequences
+
+    @property
+    def total_duration(self) -> float:
+        """Soma das durações conhecidas."""
+        return math.fsum(d for d in self._durations if d == d)
+
+    def _segment(self, i: int) -> Segment:
+        duration = self._durations[i]
+        length = self._br_lengths[i] if self._br_lengths else _NONE
+        key_id = self._key_ids[i]
+        map_id = self._map_ids[i]
+        sequence = self._sequences[i]
+        return Segment(
+            uri=self.uri(i),
+            duration=None if duration != duration else duration,
+            title=self._titles.get(i, ''),
+            sequence=sequence,
+            index=sequence - self._origin + 1,
+            byterange=None if length == _NONE else ByteRange(length=length, offset=self._br_offsets[i]),
+            key=None if key_id == _NONE else self._keys[key_id],
+            init_section=None if map_id == _NONE else self._maps[map_id],
+            discontinuity=bool(self._discontinuities[i]),
+            program_date_time=self._dates.get(i),
+        )
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[Segment, 'SegmentTable']:
+        if isinstance(item, slice):
+            return self._slice(item)
+        size = len(self._durations)
+        if item < 0:
+            item += size
+        if not 0 <= item < size:
+            raise IndexError("índice de segmento fora do intervalo")
+        return self._segment(item)
+
+    def _slice(self, item: slice) -> 'SegmentTable':
+        if self._pending:
+            self.compact()
+        table = SegmentTable()
+        table._base = self._base
+        table._buffer = self._buffer
+        table._keys = self._keys
+        table._maps = self._maps
+        table._lookup = self._lookup
+        table._origin = self._origin
+        for name in _COLUMNS:
+            setattr(table, name, getattr(self, name)[item])
+        positions = range(len(self._durations))[item]
+        if self._titles or self._dates:
+            remap = {old: new for new, old in enumerate(positions)}
+            table._titles = {remap[i]: v for i, v in self._titles.items() if i in remap}
+            table._dates = {remap[i]: v for i, v in self._dates.items() if i in remap}
+        return table
+
+    def __iter__(self) -> Iterator[Segment]:
+        for i in range(len(self._durations)):
+            yield self._segment(i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (SegmentTable, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SegmentTable(len={len(self)}, base={self.base!r})"
+
+    def memory_usage(self) -> int:
+        """Estimativa, em bytes, da memória ocupada pelas colunas e pelo buffer de URIs."""
+        size = sum(getattr(self, name).itemsize * len(getattr(self, name)) for name in _COLUMNS)
+        return size + len(self._buffer) + len(self._base) + sum(len(u) for u in self._pending)
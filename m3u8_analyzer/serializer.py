@@ -0,0 +1,360 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from dataclasses import fields
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from .exeptions import M3u8FileError
+from .playlist import (ByteRange, InitSection, Key, Part, Playlist, PreloadHint, Rendition, ServerControl,
+                       Variant)
+from .segment_table import SegmentTable
+
+_SNAPSHOT_MAGIC = b'M3U8SNAP'
+_SNAPSHOT_VERSION = 1
+_PREAMBLE = struct.Struct('<8sII')
+_ALIGN = 8
+# Campos de `Playlist` gravados de forma estruturada; os demais são escalares copiados diretamente
+_STRUCTURED = {'segments', 'variants', 'iframe_variants', 'renditions', 'keys', 'session_keys', 'server_control',
+               'parts', 'preload_hints'}
+
+
+def _format_duration(duration: float) -> str:
+    return '%.15g' % duration
+
+
+def _format_key(key: Optional[Key]) -> str:
+    if key is None:
+        return '#EXT-X-KEY:METHOD=NONE'
+    parts = [f'METHOD={key.method}']
+    if key.uri is not None:
+        parts.append(f'URI="{key.uri}"')
+    if key.iv:
+        parts.append(f'IV={key.iv}')
+    if key.keyformat:
+        parts.append(f'KEYFORMAT="{key.keyformat}"')
+    if key.keyformatversions:
+        parts.append(f'KEYFORMATVERSIONS="{key.keyformatversions}"')
+    return '#EXT-X-KEY:' + ','.join(parts)
+
+
+def _format_map(init_section: InitSection) -> str:
+    tag = f'#EXT-X-MAP:URI="{init_section.uri}"'
+    if init_section.byterange is not None:
+        tag += f',BYTERANGE="{init_section.byterange.length}@{init_section.byterange.offset}"'
+    return tag
+
+
+def _format_attributes(attributes: Dict[str, str]) -> str:
+    return ','.join(f'{name}={value}' for name, value in attributes.items())
+
+
+def _format_part(part: Part) -> str:
+    tag = f'#EXT-X-PART:DURATION={_format_duration(part.duration or 0.0)},URI="{part.uri}"'
+    if part.independent:
+        tag += ',INDEPENDENT=YES'
+    if part.byterange is not None:
+        tag += f',BYTERANGE="{part.byterange.length}@{part.byterange.offset}"'
+    if part.gap:
+        tag += ',GAP=YES'
+    return tag
+
+
+def _format_preload_hint(hint: PreloadHint) -> str:
+    tag = f'#EXT-X-PRELOAD-HINT:TYPE={hint.type},URI="{hint.uri}"'
+    if hint.start is not None:
+        tag += f',BYTERANGE-START={hint.start}'
+    if hint.length is not None:
+        tag += f',BYTERANGE-LENGTH={hint.length}'
+    return tag
+
+
+def dumps(playlist: Playlist) -> str:
+    """
+    Converte o modelo de uma playlist de volta em texto M3U8 válido.
+
+    As tags de chave (#EXT-X-KEY) e de inicialização (#EXT-X-MAP) são emitidas apenas quando mudam; os
+    byte-ranges são escritos sempre com offset explícito. As linhas são acumuladas e unidas uma única vez.
+
+    Args:
+        playlist (Playlist): Modelo retornado por `M3u8Analyzer.parse_playlist`.
+
+    Returns:
+        str: Conteúdo da playlist.
+
+    Examples:
+        ```python
+        playlist = M3u8Analyzer.parse_playlist(content)
+        with open('copia.m3u8', 'w', encoding='utf-8') as f:
+            f.write(dumps(playlist))
+        ```
+    """
+    lines: List[str] = ['#EXTM3U']
+    append = lines.append
+    if playlist.version is not None:
+        append(f'#EXT-X-VERSION:{playlist.version}')
+    if playlist.independent_segments:
+        append('#EXT-X-INDEPENDENT-SEGMENTS')
+    for key in playlist.session_keys:
+        append(_format_key(key).replace('#EXT-X-KEY:', '#EXT-X-SESSION-KEY:', 1))
+
+    for rendition in playlist.renditions:
+        append(f'#EXT-X-MEDIA:{_format_attributes(rendition.attributes)}')
+    for variant in playlist.variants:
+        append(f'#EXT-X-STREAM-INF:{_format_attributes(variant.attributes)}')
+        append(variant.uri)
+    for variant in playlist.iframe_variants:
+        append(f'#EXT-X-I-FRAME-STREAM-INF:{_format_attributes(variant.attributes)}')
+
+    if playlist.target_duration is not None:
+        append(f'#EXT-X-TARGETDURATION:{playlist.target_duration}')
+    if playlist.server_control is not None:
+        append(f'#EXT-X-SERVER-CONTROL:{_format_attributes(playlist.server_control.attributes)}')
+    if playlist.part_target is not None:
+        append(f'#EXT-X-PART-INF:PART-TARGET={_format_duration(playlist.part_target)}')
+    if playlist.segments or not playlist.is_master:
+        if playlist.media_sequence:
+            append(f'#EXT-X-MEDIA-SEQUENCE:{playlist.media_sequence}')
+        if playlist.discontinuity_sequence:
+            append(f'#EXT-X-DISCONTINUITY-SEQUENCE:{playlist.discontinuity_sequence}')
+        if playlist.playlist_type:
+            append(f'#EXT-X-PLAYLIST-TYPE:{playlist.playlist_type}')
+        if playlist.i_frames_only:
+            append('#EXT-X-I-FRAMES-ONLY')
+
+    # Partes agrupadas pelo segmento a que pertencem; as do segmento ainda incompleto vêm após o último
+    parts = defaultdict(list)
+    for part in playlist.parts:
+        parts[part.sequence].append(part)
+    _dump_segments(playlist.segments, append, parts)
+    for sequence in sorted(parts):
+        for part in parts[sequence]:
+            append(_format_part(part))
+    for hint in playlist.preload_hints:
+        append(_format_preload_hint(hint))
+
+    if playlist.endlist:
+        append('#EXT-X-ENDLIST')
+    append('')
+    return '\n'.join(lines)
+
+
+def _dump_segments(table: SegmentTable, append, parts: Dict[int, List[Part]] = None):
+    """
+    Escreve os segmentos lendo diretamente as colunas da tabela, sem criar objetos `Segment`.
+
+    As partes (#EXT-X-PART) de cada segmento são escritas antes dele e removidas de `parts`.
+    """
+    columns = table._columns()
+    base = table._base
+    buffer = table._buffer
+    keys = table._keys
+    maps = table._maps
+    titles = table._titles
+    dates = table._dates
+    offsets = columns['_br_offsets']
+    lengths = columns['_br_lengths']
+    has_byteranges = len(lengths) > 0
+    key = None
+    map_id = -1
+    sequences = columns['_sequences']
+    rows = zip(columns['_uri_start'], columns['_uri_len'], columns['_durations'], columns['_key_ids'],
+               columns['_map_ids'], columns['_discontinuities'])
+    for i, (start, size, duration, segment_key, segment_map, discontinuity) in enumerate(rows):
+        if segment_map >= 0 and segment_map != map_id:
+            map_id = segment_map
+            init_section = maps[map_id]
+            # A #EXT-X-KEY em vigor na #EXT-X-MAP é a que criptografa a seção de inicialização
+            if init_section.key != key:
+                key = init_section.key
+                append(_format_key(key))
+            append(_format_map(init_section))
+        if (keys[segment_key] if segment_key >= 0 else None) != key:
+            key = keys[segment_key] if segment_key >= 0 else None
+            append(_format_key(key))
+        if discontinuity:
+            append('#EXT-X-DISCONTINUITY')
+        if dates and i in dates:
+            append(f'#EXT-X-PROGRAM-DATE-TIME:{dates[i]}')
+        if parts:
+            for part in parts.pop(sequences[i], ()):
+                append(_format_part(part))
+        if duration == duration:
+            append(f'#EXTINF:{_format_duration(duration)},{titles.get(i, "")}')
+        if has_byteranges and lengths[i] >= 0:
+            append(f'#EXT-X-BYTERANGE:{lengths[i]}@{offsets[i]}')
+        append(base + buffer[start:start + size])
+
+
+def _key_to_json(key: Key) -> list:
+    return [key.method, key.uri, key.iv, key.keyformat, key.keyformatversions]
+
+
+def _key_from_json(data: list) -> Key:
+    return Key(*data)
+
+
+def _map_to_json(init_section: InitSection) -> list:
+    byterange = init_section.byterange
+    key = init_section.key
+    return [init_section.uri, [byterange.length, byterange.offset] if byterange else None,
+            _key_to_json(key) if key else None]
+
+
+def _map_from_json(data: list) -> InitSection:
+    # Snapshots anteriores não guardam a chave da seção
+    uri, byterange, key = (list(data) + [None])[:3]
+    return InitSection(uri=uri, byterange=ByteRange(*byterange) if byterange else None,
+                       key=_key_from_json(key) if key else None)
+
+
+def _part_to_json(part: Part) -> list:
+    byterange = part.byterange
+    return [part.uri, part.duration, part.sequence, part.index, part.independent, part.gap,
+            [byterange.length, byterange.offset] if byterange else None]
+
+
+def _part_from_json(data: list) -> Part:
+    *values, byterange = data
+    return Part(*values, byterange=ByteRange(*byterange) if byterange else None)
+
+
+def _padding(size: int) -> bytes:
+    return b'\0' * (-size % _ALIGN)
+
+
+def save_snapshot(playlist: Playlist, path: str):
+    """
+    Grava um snapshot binário compacto de uma playlist já analisada.
+
+    As colunas da `SegmentTable` são gravadas como blocos binários alinhados, de modo que `load_snapshot` as
+    mapeia em memória diretamente, sem reprocessar o texto. O arquivo é escrito de forma atômica.
+
+    Args:
+        playlist (Playlist): Modelo da playlist.
+        path (str): Caminho do arquivo de snapshot.
+
+    Raises:
+        M3u8FileError: Se não for possível gravar o arquivo.
+    """
+    table = playlist.segments
+    columns = table._columns()
+    blobs = []
+    layout = {}
+    offset = 0
+    for name, column in columns.items():
+        view = memoryview(column)
+        if not view.contiguous:
+            view = memoryview(array(view.format, view))
+        layout[name] = [view.format, offset, len(view)]
+        blobs.append(view)
+        offset += view.nbytes + (-view.nbytes % _ALIGN)
+    buffer = table._buffer.encode('utf-8')
+    header = {
+        'byteorder': sys.byteorder,
+        'playlist': {f.name: getattr(playlist, f.name) for f in fields(Playlist) if f.name not in _STRUCTURED},
+        'variants': [[v.uri, v.attributes] for v in playlist.variants],
+        'iframe_variants': [[v.uri, v.attributes] for v in playlist.iframe_variants],
+        'renditions': [r.attributes for r in playlist.renditions],
+        'keys': [_key_to_json(k) for k in playlist.keys],
+        'session_keys': [_key_to_json(k) for k in playlist.session_keys],
+        'server_control': playlist.server_control.attributes if playlist.server_control else None,
+        'parts': [_part_to_json(p) for p in playlist.parts],
+        'preload_hints': [[h.type, h.uri, h.start, h.length] for h in playlist.preload_hints],
+        'table': {
+            'base': table._base,
+            'origin': table._origin,
+            'keys': [_key_to_json(k) for k in table._keys],
+            'maps': [_map_to_json(m) for m in table._maps],
+            'titles': table._titles,
+            'dates': table._dates,
+            'columns': layout,
+            'buffer': [offset, len(buffer)],
+        },
+    }
+    encoded = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    temporary = f'{path}.tmp'
+    try:
+        with open(temporary, 'wb') as f:
+            f.write(_PREAMBLE.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, len(encoded)))
+            f.write(encoded)
+            f.write(_padding(_PREAMBLE.size + len(encoded)))
+            for blob in blobs:
+                f.write(blob)
+                f.write(_padding(blob.nbytes))
+            f.write(buffer)
+        os.replace(temporary, path)
+    except OSError as e:
+        raise M3u8FileError(f"Erro ao gravar o snapshot '{path}': {e}")
+
+
+def load_snapshot(path: str) -> Playlist:
+    """
+    Carrega uma playlist a partir de um snapshot gravado por `save_snapshot`.
+
+    O arquivo é mapeado em memória (mmap) e as colunas numéricas da `SegmentTable` são `memoryview`s sobre
+    ele, sem cópia; apenas o cabeçalho e o buffer de URIs são decodificados.
+
+    Args:
+        path (str): Caminho do arquivo de snapshot.
+
+    Returns:
+        Playlist: O modelo da playlist. A tabela de segmentos é convertida para `array`s na primeira
+        modificação.
+
+    Raises:
+        M3u8FileError: Se o arquivo não existir, não for um snapshot ou tiver sido gravado em outra arquitetura.
+    """
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        raise M3u8FileError(f"Erro ao abrir o snapshot '{path}': {e}")
+    view = memoryview(mapped)
+    try:
+        magic, version, header_size = _PREAMBLE.unpack_from(mapped, 0)
+    except struct.error:
+        magic, version, header_size = b'', 0, 0
+    if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+        raise M3u8FileError(f"'{path}' não é um snapshot de playlist compatível")
+    header = json.loads(bytes(view[_PREAMBLE.size:_PREAMBLE.size + header_size]))
+    if header['byteorder'] != sys.byteorder:
+        raise M3u8FileError("Snapshot gravado em uma arquitetura com outra ordem de bytes",
+                            errors=[header['byteorder']])
+    start = _PREAMBLE.size + header_size
+    start += -start % _ALIGN
+
+    table_info = header['table']
+    columns = {}
+    for name, (typecode, offset, count) in table_info['columns'].items():
+        itemsize = array(typecode).itemsize
+        begin = start + offset
+        columns[name] = view[begin:begin + count * itemsize].cast(typecode)
+    buffer_offset, buffer_size = table_info['buffer']
+    begin = start + buffer_offset
+    table = SegmentTable._from_columns(
+        base=table_info['base'],
+        buffer=str(view[begin:begin + buffer_size], 'utf-8'),
+        columns=columns,
+        keys=[_key_from_json(k) for k in table_info['keys']],
+        maps=[_map_from_json(m) for m in table_info['maps']],
+        titles={int(i): t for i, t in table_info['titles'].items()},
+        dates={int(i): d for i, d in table_info['dates'].items()},
+        origin=table_info['origin'],
+    )
+    return Playlist(
+        segments=table,
+        variants=[Variant(uri=uri, attributes=attrs) for uri, attrs in header['variants']],
+        iframe_variants=[Variant(uri=uri, attributes=attrs, iframe=True) for uri, attrs in header['iframe_variants']],
+        renditions=[Rendition(attributes=attrs) for attrs in header['renditions']],
+        keys=[_key_from_json(k) for k in header['keys']],
+        session_keys=[_key_from_json(k) for k in header['session_keys']],
+        # Snapshots anteriores ao suporte a LL-HLS não têm estes campos
+        server_control=ServerControl(attributes=header['server_control']) if header.get('server_control') else None,
+        parts=[_part_from_json(p) for p in header.get('parts', ())],
+        preload_hints=[PreloadHint(*h) for h in header.get('preload_hints', ())],
+        **header['playlist'],
+    )
@@ -0,0 +1,101 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def request_key(url: str, headers: dict = None, method: str = 'GET') -> Tuple:
+    """Identificador de uma requisição para a `SingleFlight`: método, URL e cabeçalhos (sem ordem)."""
+    return method, url, tuple(sorted((str(k).lower(), str(v)) for k, v in (headers or {}).items()))
+
+
+class _Call:
+    """Chamada em andamento, aguardada pelas demais threads que pedirem a mesma chave."""
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas simultâneas idênticas em uma única execução.
+
+    Enquanto uma chamada para uma chave está em andamento, as threads que pedirem a mesma chave esperam por ela
+    e recebem o mesmo resultado (ou a mesma exceção), em vez de repetir a requisição. Nada é guardado depois
+    que a chamada termina: a próxima chamada com a mesma chave executa de novo (para reaproveitar resultados,
+    use `HttpCache` ou `KeyCache`).
+
+    Uma instância é compartilhada por padrão (`get_default_flight()`) por `M3u8Analyzer.get_m3u8`,
+    `EncryptSuport` e pelo download da playlist em `M3u8Downloader`, então picos de pedidos pela mesma
+    playlist ou chave chegam à origem como uma única requisição.
+
+    Examples:
+        ```python
+        flight = SingleFlight()
+        conteudo = flight.do(request_key(url, headers), lambda: session.get(url, headers=headers).text)
+        ```
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        # Chamadas atendidas pela execução de outra thread
+        self.shared = 0
+
+    def in_flight(self) -> int:
+        """Quantidade de chaves com uma chamada em andamento."""
+        return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Executa `fn()` uma única vez entre as chamadas simultâneas com a mesma `key`.
+
+        Args:
+            key (Hashable): Identificador da chamada (ex.: `request_key(url, headers)`).
+            fn (callable): Função executada pela primeira thread; as demais recebem o seu resultado.
+
+        Returns:
+            O resultado de `fn()`.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+_default_flight: Optional[SingleFlight] = SingleFlight()
+
+
+def get_default_flight() -> Optional[SingleFlight]:
+    """`SingleFlight` compartilhada pelas buscas de playlists e chaves (None = sem agrupamento)."""
+    return _default_flight
+
+
+def set_default_flight(flight: Optional[SingleFlight]):
+    """
+    Define a `SingleFlight` usada por padrão.
+
+    Args:
+        flight (SingleFlight, optional): Instância compartilhada. Com None, cada chamada faz a sua requisição.
+    """
+    global _default_flight
+    _default_flight = flight
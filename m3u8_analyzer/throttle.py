@@ -0,0 +1,196 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .retry import host_of
+
+
+class TokenBucket:
+    """
+    Balde de fichas: libera `rate` unidades por segundo, acumulando no máximo `burst`.
+
+    Um consumo maior que as fichas disponíveis deixa o balde em débito e o chamador espera o tempo necessário
+    para pagá-lo; assim blocos maiores que `burst` nunca travam e a taxa média é mantida. Seguro para uso por
+    várias threads; a espera acontece fora da trava.
+
+    Examples:
+        ```python
+        bucket = TokenBucket(rate=2 * 1024 * 1024)  # 2 MiB/s
+        for chunk in resposta.iter_content(64 * 1024):
+            bucket.consume(len(chunk))
+        ```
+    """
+
+    def __init__(self, rate: float, burst: float = None, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate (float): Unidades por segundo (bytes ou requisições).
+            burst (float, optional): Fichas acumuladas no máximo. Padrão: 1/4 de segundo de `rate` (ao menos 1).
+            clock (callable): Relógio em segundos (substituível nos testes).
+            sleep (callable): Função de espera (substituível nos testes).
+        """
+        if rate <= 0:
+            raise ValueError("rate deve ser maior que zero!")
+        self.rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(self.rate / 4, 1.0)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.burst
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Retira `amount` fichas e retorna quantos segundos o chamador deve esperar."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= amount
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def consume(self, amount: float = 1):
+        """Retira `amount` fichas, bloqueando até que a taxa permita."""
+        delay = self.reserve(amount)
+        if delay > 0:
+            self.sleep(delay)
+
+    async def consume_async(self, amount: float = 1):
+        """Versão assíncrona de `consume`."""
+        delay = self.reserve(amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class Throttle:
+    """
+    Limites de banda (bytes/s) e de requisições por segundo, globais e por host.
+
+    Um `Throttle` pode ter um `parent`: cada consumo passa pelos baldes do próprio objeto e de todos os
+    ancestrais. Assim um limite por trabalho (o `Throttle` criado por download) convive com o limite do
+    processo (`get_default_throttle()`), e todos os downloads de um processo dividem a mesma banda.
+
+    Os bytes são contabilizados dentro do laço de leitura, bloco a bloco, então a taxa fica estável em vez de
+    oscilar entre rajadas e pausas.
+
+    Examples:
+        ```python
+        # No máximo 50 MiB/s no processo, 10 MiB/s e 20 requisições/s por CDN
+        set_default_throttle(Throttle(bandwidth=50 * 2 ** 20, per_host_bandwidth=10 * 2 ** 20,
+                                      per_host_requests_per_second=20))
+        # E no máximo 4 MiB/s para este download
+        M3u8Downloader.downloader_and_remuxer_segments(url, 'video.mp4', workers=8, max_bandwidth=4 * 2 ** 20)
+        ```
+    """
+
+    def __init__(self, bandwidth: float = None, per_host_bandwidth: float = None,
+                 requests_per_second: float = None, per_host_requests_per_second: float = None,
+                 parent: 'Throttle' = None):
+        """
+        Args:
+            bandwidth (float, optional): Bytes por segundo somando todos os hosts.
+            per_host_bandwidth (float, optional): Bytes por segundo para cada host.
+            requests_per_second (float, optional): Requisições por segundo somando todos os hosts.
+            per_host_requests_per_second (float, optional): Requisições por segundo para cada host.
+            parent (Throttle, optional): Limites aplicados também (ex.: os do processo).
+        """
+        self.parent = parent
+        self.per_host_bandwidth = per_host_bandwidth
+        self.per_host_requests_per_second = per_host_requests_per_second
+        self._bandwidth = TokenBucket(bandwidth) if bandwidth else None
+        self._requests = TokenBucket(requests_per_second, burst=1) if requests_per_second else None
+        self._host_bandwidth: Dict[str, TokenBucket] = {}
+        self._host_requests: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _host_bucket(self, buckets: Dict[str, TokenBucket], host: str, rate: float, burst: float = None):
+        bucket = buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = buckets.setdefault(host, TokenBucket(rate, burst=burst))
+        return bucket
+
+    def _reserve_request(self, url: str) -> float:
+        delay = 0.0
+        throttle = self
+        host = host_of(url)
+        while throttle is not None:
+            if throttle._requests is not None:
+                delay = max(delay, throttle._requests.reserve(1))
+            if throttle.per_host_requests_per_second:
+                bucket = throttle._host_bucket(throttle._host_requests, host,
+                                               throttle.per_host_requests_per_second, burst=1)
+                delay = max(delay, bucket.reserve(1))
+            throttle = throttle.parent
+        return delay
+
+    def _reserve_bytes(self, url: str, amount: int) -> float:
+        delay = 0.0
+        throttle = self
+        host = host_of(url)
+        while throttle is not None:
+            if throttle._bandwidth is not None:
+                delay = max(delay, throttle._bandwidth.reserve(amount))
+            if throttle.per_host_bandwidth:
+                bucket = throttle._host_bucket(throttle._host_bandwidth, host, throttle.per_host_bandwidth)
+                delay = max(delay, bucket.reserve(amount))
+            throttle = throttle.parent
+        return delay
+
+    def request(self, url: str):
+        """Aguarda a vez de uma requisição para `url`."""
+        delay = self._reserve_request(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def data(self, url: str, amount: int):
+        """Contabiliza `amount` bytes recebidos de `url`, aguardando se algum limite de banda for excedido."""
+        delay = self._reserve_bytes(url, amount)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def request_async(self, url: str):
+        """Versão assíncrona de `request`."""
+        delay = self._reserve_request(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def data_async(self, url: str, amount: int):
+        """Versão assíncrona de `data`."""
+        delay = self._reserve_bytes(url, amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_default_throttle: Optional[Throttle] = None
+
+
+def get_default_throttle() -> Optional[Throttle]:
+    """Limites do processo, aplicados a todos os downloads (None = sem limites)."""
+    return _default_throttle
+
+
+def set_default_throttle(throttle: Optional[Throttle]):
+    """
+    Define os limites do processo.
+
+    Args:
+        throttle (Throttle, optional): Limites compartilhados por todos os downloads. Com None, sem limites.
+    """
+    global _default_throttle
+    _default_throttle = throttle
+
+
+def job_throttle(throttle: Optional[Throttle] = None, max_bandwidth: float = None,
+                 requests_per_second: float = None) -> Optional[Throttle]:
+    """
+    Limites de um trabalho: `throttle` (ou os do processo) mais os limites próprios do download, se houver.
+
+    Returns:
+        Throttle: O `Throttle` a usar no trabalho, ou None se não houver nenhum limite.
+    """
+    parent = throttle if throttle is not None else get_default_throttle()
+    if not max_bandwidth and not requests_per_second:
+        return parent
+    return Throttle(bandwidth=max_bandwidth, requests_per_second=requests_per_second, parent=parent)
@@ -0,0 +1,152 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .playlist import Playlist, Variant
+
+
+def _bandwidth(variant: Variant) -> int:
+    return variant.bandwidth or 0
+
+
+def _pixels_of(resolution: Union[str, Tuple[int, int]]) -> int:
+    if isinstance(resolution, tuple):
+        width, height = resolution
+    else:
+        width, _, height = resolution.lower().partition('x')
+    return int(width) * int(height)
+
+
+class VariantIndex:
+    """
+    Índice das variantes de uma playlist master, construído uma única vez.
+
+    As variantes ficam ordenadas por BANDWIDTH e por número de pixels, e os melhores candidatos por codec e
+    por grupo de áudio são pré-calculados, de modo que cada consulta é respondida em O(log n) ou O(1).
+
+    Examples:
+        ```python
+        index = VariantIndex.from_playlist(M3u8Analyzer.parse_playlist(master_content))
+        index.best_under(2_000_000)         # maior BANDWIDTH <= 2 Mbps
+        index.nearest_resolution('1280x720')
+        index.highest_with_codec('avc1')
+        index.lowest_with_audio_group('aac')
+        ```
+    """
+
+    __slots__ = ('_by_bandwidth', '_bandwidths', '_by_pixels', '_pixels', '_by_resolution', '_best_codec',
+                 '_lowest_audio')
+
+    def __init__(self, variants: Iterable[Variant]):
+        """
+        Args:
+            variants: Variantes da playlist master. Variantes de I-frames são ignoradas.
+        """
+        variants = [v for v in variants if not v.iframe]
+        self._by_bandwidth: List[Variant] = sorted(variants, key=_bandwidth)
+        self._bandwidths: List[int] = [_bandwidth(v) for v in self._by_bandwidth]
+        self._by_pixels: List[Variant] = sorted((v for v in variants if v.pixels),
+                                                key=lambda v: (v.pixels, _bandwidth(v)))
+        self._pixels: List[int] = [v.pixels for v in self._by_pixels]
+        self._by_resolution: Dict[str, Variant] = {}
+        self._best_codec: Dict[str, Variant] = {}
+        self._lowest_audio: Dict[str, Variant] = {}
+        for variant in variants:
+            if variant.resolution:
+                self._by_resolution.setdefault(variant.resolution, variant)
+        # Percorre do maior para o menor: o primeiro visto para cada codec é o de maior qualidade
+        for variant in reversed(self._by_pixels or self._by_bandwidth):
+            for codec in (variant.codecs or '').split(','):
+                codec = codec.strip()
+                if codec:
+                    self._best_codec.setdefault(codec, variant)
+                    self._best_codec.setdefault(codec.split('.')[0], variant)
+        for variant in self._by_bandwidth:
+            if variant.audio:
+                self._lowest_audio.setdefault(variant.audio, variant)
+
+    @classmethod
+    def from_playlist(cls, playlist: Playlist) -> 'VariantIndex':
+        """Constrói o índice a partir do modelo de uma playlist master."""
+        return cls(playlist.variants)
+
+    def __len__(self) -> int:
+        return len(self._by_bandwidth)
+
+    def by_bandwidth(self) -> List[Variant]:
+        """Variantes em ordem crescente de BANDWIDTH."""
+        return list(self._by_bandwidth)
+
+    def by_resolution(self) -> List[Variant]:
+        """Variantes com RESOLUTION, em ordem crescente de pixels."""
+        return list(self._by_pixels)
+
+    def lowest(self) -> Optional[Variant]:
+        """Variante de menor BANDWIDTH."""
+        return self._by_bandwidth[0] if self._by_bandwidth else None
+
+    def highest(self) -> Optional[Variant]:
+        """Variante de maior BANDWIDTH."""
+        return self._by_bandwidth[-1] if self._by_bandwidth else None
+
+    def highest_resolution(self) -> Optional[Variant]:
+        """Variante de maior resolução (empates resolvidos pelo maior BANDWIDTH)."""
+        return self._by_pixels[-1] if self._by_pixels else None
+
+    def resolution(self, resolution: str) -> Optional[Variant]:
+        """Primeira variante com exatamente a resolução informada (ex.: '1920x1080')."""
+        return self._by_resolution.get(resolution)
+
+    def resolutions(self) -> Dict[str, str]:
+        """Mapa resolução -> URI, na ordem do manifesto."""
+        return {res: v.uri for res, v in self._by_resolution.items()}
+
+    def best_under(self, bandwidth: int) -> Optional[Variant]:
+        """
+        Variante de maior BANDWIDTH que não ultrapassa o limite.
+
+        Args:
+            bandwidth (int): Limite em bits por segundo.
+
+        Returns:
+            Optional[Variant]: A variante encontrada, ou None se todas ultrapassarem o limite.
+        """
+        position = bisect_right(self._bandwidths, bandwidth)
+        return self._by_bandwidth[position - 1] if position else None
+
+    def nearest_resolution(self, resolution: Union[str, Tuple[int, int]]) -> Optional[Variant]:
+        """
+        Variante cuja área (largura x altura) é mais próxima da resolução informada.
+
+        Em caso de empate, prefere a maior.
+
+        Args:
+            resolution: Resolução como '1280x720' ou (1280, 720).
+        """
+        if not self._pixels:
+            return None
+        target = _pixels_of(resolution)
+        position = bisect_left(self._pixels, target)
+        if position == len(self._pixels):
+            return self._by_pixels[-1]
+        if position == 0:
+            return self._by_pixels[0]
+        below, above = self._by_pixels[position - 1], self._by_pixels[position]
+        return below if target - below.pixels < above.pixels - target else above
+
+    def highest_with_codec(self, codec: str) -> Optional[Variant]:
+        """
+        Variante de maior resolução que usa o codec informado.
+
+        Args:
+            codec (str): Codec completo ('avc1.640028') ou apenas a família ('avc1', 'hvc1', 'mp4a').
+        """
+        return self._best_codec.get(codec)
+
+    def lowest_with_audio_group(self, group_id: str) -> Optional[Variant]:
+        """
+        Variante de menor BANDWIDTH associada ao grupo de áudio (atributo AUDIO) informado.
+
+        Args:
+            group_id (str): GROUP-ID da mídia de áudio.
+        """
+        return self._lowest_audio.get(group_id)
@@ -22,8 +22,9 @@ setup(
     url='https://paulocesar-dev404.github.io/M3u8_Analyzer/',
     license="MIT",
     keywords=["hls", "m3u8", "m3u8_analyzer", "M3u8Analyzer"],
-    packages=find_packages(),
+    packages=find_packages(exclude=['tests', 'tests.*']),
     install_requires=['colorama', 'requests', 'cryptography'],
+    extras_require={'aio': ['aiohttp']},
     include_package_data=True,
     platforms=["any"],
     classifiers=[
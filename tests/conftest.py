@@ -0,0 +1,97 @@
+import collections
+import http.server
+import threading
+
+import pytest
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        path = self.path.split('?')[0]
+        server.hits[path] += 1
+        server.requests.append((path, self.headers.get('Range')))
+        body = server.files.get(path)
+        if callable(body):
+            body = body(self)
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if isinstance(body, str):
+            body = body.encode()
+        byte_range = self.headers.get('Range')
+        if byte_range and not server.ignore_range:
+            start, _, end = byte_range.split('=')[1].partition('-')
+            start = int(start)
+            end = int(end) if end else len(body) - 1
+            part = body[start:end + 1]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(body)}')
+            self.send_header('Content-Length', str(len(part)))
+            self.end_headers()
+            self.wfile.write(part)
+            return
+        self.send_response(200)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except OSError:
+            # Cliente que troca a resposta inteira por sub-faixas fecha a conexão no meio
+            pass
+
+
+@pytest.fixture
+def server():
+    """Servidor HTTP local: `server.files[path]` (bytes, str ou callable(handler)), `server.hits`, `server.url`,
+    `server.ignore_range`."""
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.files = {}
+    httpd.hits = collections.Counter()
+    httpd.requests = []
+    # Com True, responde 200 com o recurso inteiro mesmo a pedidos com Range
+    httpd.ignore_range = False
+    httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}/'
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+_FAKE_FFMPEG = '''#!{python}
+import sys
+args = sys.argv[1:]
+if args[:1] == ['-i']:
+    # Sondagem de faixas: informa áudio e vídeo
+    sys.stderr.write('Stream: Audio: aac Video: h264\\n')
+    sys.exit(1)
+lista, saida = args[args.index('-i') + 1], args[-1]
+with open(saida, 'wb') as destino:
+    for linha in open(lista, encoding='utf-8'):
+        caminho = linha.strip()[6:-1].replace("'\\\\''", "'")
+        destino.write(open(caminho, 'rb').read())
+'''
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    """ffmpeg de teste: a concatenação só junta os arquivos da lista, byte a byte."""
+    import importlib
+    import os
+    import sys
+
+    path = tmp_path / 'ffmpeg'
+    path.write_text(_FAKE_FFMPEG.format(python=sys.executable))
+    os.chmod(path, 0o755)
+    monkeypatch.setattr(importlib.import_module('m3u8_analyzer.M3u8Analyzer'), 'ffmpeg_bin', str(path))
+    return path
@@ -0,0 +1,21 @@
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+
+def encrypt(data: bytes, key: bytes, iv: bytes) -> bytes:
+    """AES-128-CBC com PKCS7, como os segmentos HLS."""
+    padder = padding.PKCS7(128).padder()
+    padded = padder.update(data) + padder.finalize()
+    encryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).encryptor()
+    return encryptor.update(padded) + encryptor.finalize()
+
+
+def ts_payload(size: int, seed: int = 0) -> bytes:
+    """Bytes que parecem MPEG-TS (0x47 a cada 188 bytes)."""
+    return bytes(0x47 if i % 188 == 0 else (i * 7 + seed) & 0xff for i in range(size))
+
+
+def fmp4_payload(box: bytes, size: int, seed: int = 0) -> bytes:
+    """Bytes que começam com uma caixa ISO BMFF (`box`, ex.: b'ftyp' ou b'moof')."""
+    body = bytes((i * 13 + seed) & 0xff for i in range(max(size - 8, 0)))
+    return (8 + len(body)).to_bytes(4, 'big') + box + body
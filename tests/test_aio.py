@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from m3u8_analyzer import aio
+from m3u8_analyzer.keys import KeyCache
+
+from .crypto import encrypt, fmp4_payload, ts_payload
+
+KEY_A = bytes(range(16))
+KEY_B = bytes(range(16, 32))
+
+
+def download(url, output, **kwargs):
+    asyncio.run(aio.downloader_and_remuxer_segments(url, str(output), key_cache=KeyCache(), **kwargs))
+    return output.read_bytes()
+
+
+@pytest.fixture
+def fmp4_rotating_keys(server):
+    """fMP4 por #EXT-X-BYTERANGE em um único arquivo, com a chave trocada no meio da playlist."""
+    init = fmp4_payload(b'ftyp', 600)
+    segments = [fmp4_payload(b'moof', 3000 + i, seed=i) for i in range(4)]
+    keys = [KEY_A, KEY_A, KEY_B, KEY_B]
+    encrypted = [encrypt(segment, key, i.to_bytes(16, 'big')) for i, (segment, key) in enumerate(zip(segments, keys))]
+    server.files['/video/keys/a.bin'] = KEY_A
+    server.files['/video/keys/b.bin'] = KEY_B
+    server.files['/video/media/all.mp4'] = init + b''.join(encrypted)
+    lines = ['#EXTM3U', '#EXT-X-VERSION:7', '#EXT-X-TARGETDURATION:4',
+             f'#EXT-X-MAP:URI="media/all.mp4",BYTERANGE="{len(init)}@0"']
+    offset = len(init)
+    for i, segment in enumerate(encrypted):
+        if i in (0, 2):
+            lines.append(f'#EXT-X-KEY:METHOD=AES-128,URI="keys/{"ab"[i // 2]}.bin"')
+        lines += ['#EXTINF:4,', f'#EXT-X-BYTERANGE:{len(segment)}@{offset}', 'media/all.mp4']
+        offset += len(segment)
+    server.files['/video/v.m3u8'] = '\n'.join(lines + ['#EXT-X-ENDLIST', ''])
+    return init + b''.join(segments)
+
+
+def test_map_byte_ranges_and_rotating_keys(server, fake_ffmpeg, tmp_path, fmp4_rotating_keys):
+    output = download(server.url + 'video/v.m3u8', tmp_path / 'out.mp4', segmentsType='.m4s')
+    assert output == fmp4_rotating_keys
+    # URIs relativas resolvidas pela URL da playlist, cada chave buscada uma vez
+    assert server.hits['/video/keys/a.bin'] == server.hits['/video/keys/b.bin'] == 1
+    ranges = [byte_range for path, byte_range in server.requests if path == '/video/media/all.mp4']
+    assert len(ranges) == 5 and all(ranges)
+
+
+def test_server_ignoring_range_is_cut_while_streaming(server, fake_ffmpeg, tmp_path, fmp4_rotating_keys):
+    server.ignore_range = True
+    assert download(server.url + 'video/v.m3u8', tmp_path / 'out.mp4') == fmp4_rotating_keys
+
+
+def test_player_overrides_playlist_url(server, fake_ffmpeg, tmp_path):
+    segments = [ts_payload(1000, seed=i) for i in range(3)]
+    for i, segment in enumerate(segments):
+        server.files[f'/cdn/s{i}.ts'] = segment
+    server.files['/v.m3u8'] = '\n'.join(['#EXTM3U', '#EXT-X-TARGETDURATION:2'] +
+                                        [f'#EXTINF:2,\ns{i}.ts' for i in range(3)] + ['#EXT-X-ENDLIST', ''])
+    output = download(server.url + 'v.m3u8', tmp_path / 'out.ts', player=server.url + 'cdn/')
+    assert output == b''.join(segments)
+
+
+def test_user_key_does_not_decrypt_clear_init_section(server, fake_ffmpeg, tmp_path):
+    init = fmp4_payload(b'ftyp', 600)
+    segment = fmp4_payload(b'moof', 4000)
+    iv = bytes(16)
+    encrypted = encrypt(segment, KEY_A, iv)
+    server.files['/init.mp4'] = init
+    server.files['/s0.m4s'] = encrypted
+    server.files['/v.m3u8'] = '\n'.join(['#EXTM3U', '#EXT-X-TARGETDURATION:4', '#EXT-X-MAP:URI="init.mp4"',
+                                         '#EXTINF:4,', 's0.m4s', '#EXT-X-ENDLIST', ''])
+    output = download(server.url + 'v.m3u8', tmp_path / 'out.mp4', key_hex=KEY_A.hex(), iv_hex=iv.hex())
+    assert output == init + segment
+
+
+@pytest.mark.parametrize('status', [204, 304])
+def test_stream_transport_bodiless_status_keeps_connection(status):
+    """204/304 sem Content-Length não têm corpo: a leitura não espera o EOF e a conexão é reaproveitada."""
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        responses = [f'HTTP/1.1 {status} Sem corpo\r\n\r\n',
+                     'HTTP/1.1 103 Early Hints\r\nLink: </s.ts>\r\n\r\nHTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok']
+        for response in responses:
+            while (await reader.readline()).strip():
+                pass
+            writer.write(response.encode())
+            await writer.drain()
+        await reader.read()
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        url = f'http://127.0.0.1:{server.sockets[0].getsockname()[1]}/v.m3u8'
+        transport = aio.StreamTransport()
+        try:
+            first = await transport.request(url, timeout=2)
+            body = await first.read()
+            await first.release()
+            second = await transport.request(url, timeout=2)
+            result = first.status, body, second.status, await second.read()
+            await second.release()
+        finally:
+            await transport.close()
+            server.close()
+        return result
+
+    assert asyncio.run(main()) == (status, b'', 200, b'ok')
+    assert len(connections) == 1
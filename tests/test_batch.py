@@ -0,0 +1,41 @@
+import pytest
+
+from m3u8_analyzer import PlaylistParser
+from m3u8_analyzer.batch import parse_many
+from m3u8_analyzer.exeptions import M3u8Error
+
+OK = '#EXTM3U\n#EXT-X-TARGETDURATION:4\n#EXTINF:4,\nseg.ts\n#EXT-X-ENDLIST\n'
+
+
+@pytest.fixture
+def broken_parser(monkeypatch):
+    original = PlaylistParser.parse
+
+    def parse(content, *args, **kwargs):
+        if 'quebrada' in content:
+            raise ValueError('falha inesperada')
+        return original(content, *args, **kwargs)
+
+    monkeypatch.setattr(PlaylistParser, 'parse', staticmethod(parse))
+
+
+def test_results_keep_input_order():
+    items = [OK.replace('seg.ts', f'seg{i}.ts') for i in range(5)]
+    results = list(parse_many(items, workers=1, chunksize=2))
+    assert [list(playlist.segments.iter_uris()) for playlist in results] == [[f'seg{i}.ts'] for i in range(5)]
+
+
+def test_unexpected_error_is_returned(broken_parser):
+    results = list(parse_many(['#EXTM3U\n# quebrada\n', OK], workers=1, return_exceptions=True))
+    assert isinstance(results[0], M3u8Error)
+    assert list(results[1].segments.iter_uris()) == ['seg.ts']
+
+
+def test_unexpected_error_propagates_without_return_exceptions(broken_parser):
+    with pytest.raises(ValueError):
+        list(parse_many(['#EXTM3U\n# quebrada\n', OK], workers=1))
+
+
+def test_invalid_item_is_returned():
+    results = list(parse_many([123, OK], workers=1, return_exceptions=True))
+    assert isinstance(results[0], M3u8Error) and len(results) == 2
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+import requests
+
+from m3u8_analyzer.cache import HttpCache
+from m3u8_analyzer.exeptions import M3u8FileError
+from m3u8_analyzer.network import HttpSession
+
+URL = 'https://example.com/v.m3u8'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Origin:
+    """Servidor simulado: responde com o corpo de `body(headers)` e conta as requisições."""
+
+    def __init__(self, body, headers=None):
+        self.body = body
+        self.headers = headers or {'Cache-Control': 'max-age=60'}
+        self.calls = 0
+
+    def fetcher(self, headers):
+        def fetch(conditional):
+            self.calls += 1
+            response = requests.Response()
+            response.status_code = 200
+            response._content = self.body(headers).encode()
+            response.headers.update(self.headers)
+            response.encoding = 'utf-8'
+            return response
+        return fetch
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HttpCache(str(tmp_path / 'cache'), clock=Clock())
+
+
+def get(cache, origin, headers=None):
+    return cache.get(URL, origin.fetcher(headers), headers).text
+
+
+def test_authorization_and_cookie_are_part_of_the_key(cache):
+    origin = Origin(lambda headers: f"#EXTM3U\n# {headers}")
+    alice, bob = {'Authorization': 'Bearer a'}, {'authorization': 'Bearer b'}
+    assert 'Bearer a' in get(cache, origin, alice)
+    assert 'Bearer b' in get(cache, origin, bob)
+    assert 'Bearer a' in get(cache, origin, alice)
+    assert 'c=1' in get(cache, origin, {'Cookie': 'c=1'})
+    assert origin.calls == 3
+    assert len(cache) == 3
+
+
+def test_key_without_private_headers_is_the_url():
+    assert HttpCache.key(URL) == HttpCache.key(URL, {'User-Agent': 'x'})
+    assert HttpCache.key(URL) != HttpCache.key(URL, {'Cookie': 'c=1'})
+
+
+def test_vary_headers_must_match(cache):
+    origin = Origin(lambda headers: f"#EXTM3U\n# {headers['Accept-Language']}",
+                    {'Cache-Control': 'max-age=60', 'Vary': 'Accept-Language'})
+    assert get(cache, origin, {'Accept-Language': 'pt'}).endswith('pt')
+    assert get(cache, origin, {'accept-language': 'pt'}).endswith('pt')
+    assert origin.calls == 1
+    assert get(cache, origin, {'Accept-Language': 'en'}).endswith('en')
+    assert origin.calls == 2
+
+
+def test_vary_star_is_not_stored(cache):
+    origin = Origin(lambda headers: '#EXTM3U', {'Cache-Control': 'max-age=60', 'Vary': '*'})
+    get(cache, origin)
+    get(cache, origin)
+    assert origin.calls == 2
+    assert len(cache) == 0
+
+
+def test_failed_write_leaves_no_temporary_file(cache, monkeypatch):
+    def fail(source, target):
+        raise OSError('disco cheio')
+
+    monkeypatch.setattr(os, 'replace', fail)
+    with pytest.raises(M3u8FileError):
+        get(cache, Origin(lambda headers: '#EXTM3U'))
+    assert os.listdir(cache.directory) == []
+
+
+def test_session_request_headers_include_session_headers_and_cookies():
+    session = HttpSession(headers={'Authorization': 'Bearer s'})
+    session.session.cookies.set('sid', '42', domain='example.com')
+    headers = session.request_headers(URL, {'Referer': 'https://example.com/'})
+    assert headers['Authorization'] == 'Bearer s'
+    assert headers['Cookie'] == 'sid=42'
+    assert headers['Referer'] == 'https://example.com/'
+    assert HttpCache.key(URL, headers) != HttpCache.key(URL)
@@ -0,0 +1,108 @@
+import pytest
+
+from m3u8_analyzer import M3u8Downloader
+
+from .crypto import encrypt, fmp4_payload, ts_payload
+
+KEY = bytes(range(16))
+IV = bytes(16)
+
+
+@pytest.fixture(params=['classico', 'pipeline'])
+def mode(request):
+    """Opções de `downloader_and_remuxer_segments` para cada modo de download."""
+    return {} if request.param == 'classico' else {'pipeline': True, 'workers': 2}
+
+
+def download(server, name, output, **kwargs):
+    M3u8Downloader.downloader_and_remuxer_segments(server.url + name, str(output), player=server.url, **kwargs)
+    return output.read_bytes()
+
+
+@pytest.fixture
+def fmp4(server):
+    """fMP4 em um único arquivo, com #EXT-X-MAP em texto claro e segmentos por #EXT-X-BYTERANGE."""
+    init = fmp4_payload(b'ftyp', 600)
+    segments = [fmp4_payload(b'moof', 5000 + i, seed=i) for i in range(4)]
+    return init, segments
+
+
+def byterange_playlist(init_length, lengths, key_line=''):
+    lines = ['#EXTM3U', '#EXT-X-VERSION:7', '#EXT-X-TARGETDURATION:4',
+             f'#EXT-X-MAP:URI="all.mp4",BYTERANGE="{init_length}@0"']
+    if key_line:
+        lines.append(key_line)
+    offset = init_length
+    for length in lengths:
+        lines += ['#EXTINF:4,', f'#EXT-X-BYTERANGE:{length}@{offset}', 'all.mp4']
+        offset += length
+    return '\n'.join(lines + ['#EXT-X-ENDLIST', ''])
+
+
+def test_user_key_does_not_decrypt_clear_init_section(server, fake_ffmpeg, tmp_path, fmp4, mode):
+    init, segments = fmp4
+    encrypted = [encrypt(segment, KEY, IV) for segment in segments]
+    server.files['/all.mp4'] = init + b''.join(encrypted)
+    server.files['/v.m3u8'] = byterange_playlist(len(init), [len(e) for e in encrypted])
+    output = download(server, 'v.m3u8', tmp_path / 'out.mp4', key_hex=KEY.hex(), iv_hex=IV.hex(), **mode)
+    assert output == init + b''.join(segments)
+
+
+def test_encrypted_init_section_uses_key_in_effect_at_map(server, fake_ffmpeg, tmp_path, fmp4, mode):
+    init, segments = fmp4
+    init_iv = bytes.fromhex('0f' * 16)
+    encrypted_init = encrypt(init, KEY, init_iv)
+    encrypted = [encrypt(segment, KEY, init_iv) for segment in segments]
+    server.files['/k.bin'] = KEY
+    server.files['/all.mp4'] = encrypted_init + b''.join(encrypted)
+    playlist = byterange_playlist(len(encrypted_init), [len(e) for e in encrypted])
+    # A #EXT-X-KEY vem antes da #EXT-X-MAP: a seção de inicialização também é criptografada
+    playlist = playlist.replace('#EXT-X-MAP', f'#EXT-X-KEY:METHOD=AES-128,URI="k.bin",IV=0x{init_iv.hex()}\n'
+                                              '#EXT-X-MAP')
+    server.files['/v.m3u8'] = playlist
+    output = download(server, 'v.m3u8', tmp_path / 'out.mp4', **mode)
+    assert output == init + b''.join(segments)
+
+
+def test_key_after_map_leaves_init_section_clear(server, fake_ffmpeg, tmp_path, fmp4, mode):
+    init, segments = fmp4
+    encrypted = [encrypt(segment, KEY, (i).to_bytes(16, 'big')) for i, segment in enumerate(segments)]
+    server.files['/k.bin'] = KEY
+    server.files['/all.mp4'] = init + b''.join(encrypted)
+    server.files['/v.m3u8'] = byterange_playlist(len(init), [len(e) for e in encrypted],
+                                                 key_line='#EXT-X-KEY:METHOD=AES-128,URI="k.bin"')
+    output = download(server, 'v.m3u8', tmp_path / 'out.mp4', **mode)
+    assert output == init + b''.join(segments)
+
+
+@pytest.fixture
+def encrypted_ts(server):
+    """Segmentos TS criptografados com o IV do media sequence, em arquivos separados e por byte-range."""
+    plain = [ts_payload(size, seed=i) for i, size in enumerate([150_001, 2_500_000, 188 * 7, 3_100_017])]
+    encrypted = [encrypt(segment, KEY, i.to_bytes(16, 'big')) for i, segment in enumerate(plain)]
+    server.files['/k.bin'] = KEY
+    server.files['/all.ts'] = b''.join(encrypted)
+    head = ['#EXTM3U', '#EXT-X-TARGETDURATION:2', '#EXT-X-KEY:METHOD=AES-128,URI="k.bin"']
+    files, ranges, offset = list(head), list(head), 0
+    for i, segment in enumerate(encrypted):
+        server.files[f'/s{i}.ts'] = segment
+        files += ['#EXTINF:2,', f's{i}.ts']
+        ranges += ['#EXTINF:2,', f'#EXT-X-BYTERANGE:{len(segment)}@{offset}', 'all.ts']
+        offset += len(segment)
+    server.files['/a.m3u8'] = '\n'.join(files + ['#EXT-X-ENDLIST', ''])
+    server.files['/b.m3u8'] = '\n'.join(ranges + ['#EXT-X-ENDLIST', ''])
+    return b''.join(plain)
+
+
+@pytest.mark.parametrize('name', ['a.m3u8', 'b.m3u8'])
+def test_split_encrypted_segments_stitch_the_cbc_iv(server, fake_ffmpeg, tmp_path, encrypted_ts, name):
+    output = download(server, name, tmp_path / 'out.ts', split_threshold=1_000_000, range_workers=3, workers=2)
+    assert output == encrypted_ts
+    # Os segmentos grandes foram baixados em sub-faixas, cada uma com o bloco cifrado anterior como IV
+    split = [byte_range for path, byte_range in server.requests if byte_range and not byte_range.startswith('bytes=0-')]
+    assert split
+    assert all(int(byte_range[6:].split('-')[0]) % 16 == 0 for byte_range in split)
+
+
+def test_encrypted_byte_ranges(server, fake_ffmpeg, tmp_path, encrypted_ts, mode):
+    assert download(server, 'b.m3u8', tmp_path / 'out.ts', **mode) == encrypted_ts
@@ -0,0 +1,125 @@
+import json
+import os
+
+import pytest
+
+from m3u8_analyzer import M3u8Downloader
+from m3u8_analyzer.exeptions import M3u8AnalyzerExceptions
+from m3u8_analyzer.journal import DownloadJournal, job_id
+
+from .crypto import ts_payload
+
+N = 6
+FAILING = 4
+
+
+@pytest.fixture
+def job(server, tmp_path):
+    """Playlist de N segmentos TS em que o segmento FAILING responde 404 até `state['fail']` virar False."""
+    segments = [ts_payload(188 * (20 + i), seed=i) for i in range(N)]
+    state = {'fail': True}
+    for i, segment in enumerate(segments):
+        server.files[f'/s{i}.ts'] = segment
+    server.files[f'/s{FAILING}.ts'] = lambda handler: None if state['fail'] else segments[FAILING]
+    server.files['/v.m3u8'] = '\n'.join(['#EXTM3U', '#EXT-X-TARGETDURATION:2'] +
+                                        [line for i in range(N) for line in ('#EXTINF:2,', f's{i}.ts')] +
+                                        ['#EXT-X-ENDLIST', ''])
+    jobs_dir = tmp_path / 'jobs'
+    output = tmp_path / 'out.ts'
+    work_dir = jobs_dir / job_id(server.url + 'v.m3u8', str(output))
+    return segments, state, jobs_dir, output, work_dir
+
+
+def run(server, jobs_dir, output):
+    M3u8Downloader.downloader_and_remuxer_segments(server.url + 'v.m3u8', str(output), player=server.url,
+                                                   resume=True, jobs_dir=str(jobs_dir), workers=2)
+
+
+def interrupt(server, job):
+    segments, state, jobs_dir, output, work_dir = job
+    with pytest.raises(M3u8AnalyzerExceptions):
+        run(server, jobs_dir, output)
+    # Os segmentos concluídos ficam no diretório do trabalho, com o diário
+    journal = DownloadJournal(str(work_dir))
+    kept = {i for i in range(N) if journal.is_complete(i, server.url + f's{i}.ts', journal.segment_path(i, '.ts'))}
+    assert len(journal) == len(kept) > 0
+    assert FAILING not in kept
+    state['fail'] = False
+    server.hits.clear()
+    return kept
+
+
+def segment_hits(server):
+    return {i for i in range(N) if server.hits[f'/s{i}.ts']}
+
+
+def test_resume_fetches_only_missing_segments(server, fake_ffmpeg, job):
+    segments, state, jobs_dir, output, work_dir = job
+    kept = interrupt(server, job)
+    run(server, jobs_dir, output)
+    assert output.read_bytes() == b''.join(segments)
+    assert segment_hits(server) == set(range(N)) - kept
+    # Concluído o download, o diretório do trabalho é removido
+    assert not work_dir.exists()
+
+
+def test_resume_ignores_truncated_last_journal_line(server, fake_ffmpeg, job):
+    segments, state, jobs_dir, output, work_dir = job
+    kept = interrupt(server, job)
+    lines = (work_dir / 'journal.jsonl').read_text(encoding='utf-8').splitlines(keepends=True)
+    # Queda no meio da escrita do último registro
+    (work_dir / 'journal.jsonl').write_text(''.join(lines[:-1]) + lines[-1][:len(lines[-1]) // 2], encoding='utf-8')
+    lost = json.loads(lines[-1])['index']
+    run(server, jobs_dir, output)
+    assert output.read_bytes() == b''.join(segments)
+    assert segment_hits(server) == set(range(N)) - kept | {lost}
+
+
+def test_resume_refetches_segment_with_wrong_size(server, fake_ffmpeg, job):
+    segments, state, jobs_dir, output, work_dir = job
+    kept = interrupt(server, job)
+    damaged = sorted(kept)[:2]
+    with open(work_dir / f'seg_{damaged[0]:06d}.ts', 'ab') as f:
+        f.write(b'lixo')
+    (work_dir / f'seg_{damaged[1]:06d}.ts').write_bytes(segments[damaged[1]][:100])
+    run(server, jobs_dir, output)
+    assert output.read_bytes() == b''.join(segments)
+    assert segment_hits(server) == set(range(N)) - kept | set(damaged)
+
+
+def test_open_compacts_the_journal(tmp_path):
+    journal = DownloadJournal(str(tmp_path))
+    for index in (2, 0, 2):
+        path = journal.segment_path(index, '.ts')
+        with open(path, 'wb') as f:
+            f.write(bytes([index]) * 10)
+        journal.record(index, f's{index}.ts', path)
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"v":1,"index":5,"ur')
+    reopened = DownloadJournal(str(tmp_path))
+    assert len(reopened) == 2
+    with open(reopened.path, encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f]
+    # Um registro por segmento, em ordem, sem a linha truncada
+    assert [entry['index'] for entry in entries] == [0, 2]
+    assert not os.path.exists(reopened.path + '.tmp')
+
+
+def test_is_complete(tmp_path):
+    journal = DownloadJournal(str(tmp_path))
+    path = journal.segment_path(0, '.ts')
+    with open(path, 'wb') as f:
+        f.write(b'a' * 32)
+    assert not journal.is_complete(0, 's0.ts', path)
+    journal.record(0, 's0.ts', path, (True, False))
+    assert journal.is_complete(0, 's0.ts', path)
+    assert journal.flags(0) == (True, False)
+    # A playlist mudou: outra URI na mesma posição
+    assert not journal.is_complete(0, 'outro.ts', path)
+    # Mesmo tamanho, outro conteúdo: só o SHA-256 percebe
+    with open(path, 'wb') as f:
+        f.write(b'b' * 32)
+    assert journal.is_complete(0, 's0.ts', path)
+    assert not DownloadJournal(str(tmp_path), verify_checksums=True).is_complete(0, 's0.ts', path)
+    os.remove(path)
+    assert not journal.is_complete(0, 's0.ts', path)
@@ -0,0 +1,108 @@
+import io
+
+import pytest
+
+from m3u8_analyzer.keys import KeyCache, SegmentDecryptor, segment_iv
+from m3u8_analyzer.playlist import Key
+
+from .crypto import encrypt
+
+KEY = bytes(range(16))
+IV = bytes.fromhex('a5' * 16)
+PLAIN = bytes((i * 31) & 0xff for i in range(10_000))
+
+
+def decrypt(data, chunk, **kwargs):
+    output = io.BytesIO()
+    decryptor = SegmentDecryptor(output, KEY, **kwargs)
+    for start in range(0, len(data), chunk):
+        decryptor.write(data[start:start + chunk])
+    decryptor.finish()
+    return output.getvalue()
+
+
+@pytest.mark.parametrize('chunk', [1, 7, 16, 17, 4096, 1 << 20])
+def test_any_chunking_gives_the_plaintext(chunk):
+    assert decrypt(encrypt(PLAIN, KEY, IV), chunk, iv=IV) == PLAIN
+
+
+@pytest.mark.parametrize('size', [0, 15, 16, 17])
+def test_padding_removed_for_sizes_around_a_block(size):
+    assert decrypt(encrypt(PLAIN[:size], KEY, IV), 5, iv=IV) == PLAIN[:size]
+
+
+def test_without_iv_the_first_block_received_is_the_iv():
+    encrypted = encrypt(PLAIN, KEY, IV)
+    # Sub-faixa que começa no meio do segmento: o bloco cifrado anterior serve de IV
+    start = 4096
+    assert decrypt(encrypted[start - 16:], 100) == PLAIN[start:]
+
+
+def test_middle_range_without_unpad_keeps_every_byte():
+    encrypted = encrypt(PLAIN, KEY, IV)
+    output = io.BytesIO()
+    decryptor = SegmentDecryptor(output, KEY, unpad=False)
+    decryptor.write(encrypted[1024 - 16:2048])
+    decryptor.finish()
+    assert output.getvalue() == PLAIN[1024:2048]
+
+
+def test_wrong_key_is_a_value_error():
+    encrypted = encrypt(PLAIN, KEY, IV)
+    decryptor = SegmentDecryptor(io.BytesIO(), bytes(16), iv=IV)
+    decryptor.write(encrypted)
+    with pytest.raises(ValueError):
+        decryptor.finish()
+
+
+def test_segment_iv_declared_or_from_sequence():
+    assert segment_iv(Key('AES-128', 'k.bin'), 258) == (258).to_bytes(16, 'big')
+    assert segment_iv(Key('AES-128', 'k.bin', iv='0x' + 'ab' * 16), 258) == bytes.fromhex('ab' * 16)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_cache_entries_are_separated_by_credentials():
+    cache = KeyCache(ttl=60, clock=Clock())
+    fetched = []
+
+    def fetch(value):
+        return lambda: fetched.append(value) or value
+
+    url = 'https://example.com/k.bin'
+    assert cache.get(url, fetch(b'a' * 16), {'Authorization': 'alice'}) == b'a' * 16
+    assert cache.get(url, fetch(b'b' * 16), {'authorization': 'bob'}) == b'b' * 16
+    assert cache.get(url, fetch(b'n' * 16)) == b'n' * 16
+    # Cabeçalhos que não identificam quem pede não separam as entradas
+    assert cache.get(url, fetch(b'x' * 16), {'Authorization': 'alice', 'User-Agent': 'x'}) == b'a' * 16
+    assert cache.peek(url, {'Cookie': 'sid=1'}) is None
+    assert len(fetched) == 3 and len(cache) == 3
+
+
+def test_key_cache_expires_with_the_clock():
+    clock = Clock()
+    cache = KeyCache(ttl=10, clock=clock)
+    cache.put('u', b'k' * 16, {'Cookie': 'sid=1'})
+    assert cache.peek('u', {'Cookie': 'sid=1'}) == b'k' * 16
+    clock.now = 10
+    assert cache.peek('u', {'Cookie': 'sid=1'}) is None
+
+
+def test_get_key_does_not_serve_a_key_fetched_with_other_credentials(server):
+    from m3u8_analyzer import HttpSession
+    from m3u8_analyzer.M3u8Analyzer import EncryptSuport
+
+    server.files['/k.bin'] = lambda handler: handler.headers.get('Authorization', 'anon').encode().ljust(16, b'.')
+    cache = KeyCache()
+    url = server.url + 'k.bin'
+    alice = HttpSession(headers={'Authorization': 'alice'})
+    assert EncryptSuport.get_key(url, session=alice, key_cache=cache).startswith(b'alice')
+    assert EncryptSuport.get_key(url, key_cache=cache).startswith(b'anon')
+    assert EncryptSuport.get_key(url, session=alice, key_cache=cache).startswith(b'alice')
+    assert server.hits['/k.bin'] == 2
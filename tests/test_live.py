@@ -0,0 +1,240 @@
+import io
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+
+from m3u8_analyzer.exeptions import M3u8NetworkingError
+from m3u8_analyzer.live import LiveFollower, LivePlaylist
+from m3u8_analyzer.retry import RetryPolicy
+
+URL = 'https://example.com/live/index.m3u8'
+HEAD = '#EXTM3U\n#EXT-X-TARGETDURATION:4\n'
+LL_HEAD = HEAD + '#EXT-X-PART-INF:PART-TARGET=1\n'
+
+
+def media(first, count, head=HEAD, durations=None, tail=''):
+    """Janela de `count` segmentos a partir do media sequence `first`."""
+    lines = [head + f'#EXT-X-MEDIA-SEQUENCE:{first}']
+    for sequence in range(first, first + count):
+        duration = durations[sequence - first] if durations else 4
+        lines += [f'#EXTINF:{duration},', f's{sequence}.ts']
+    return '\n'.join(lines) + '\n' + tail
+
+
+def parts(sequence, count, gap=()):
+    return ''.join(f'#EXT-X-PART:DURATION=1,URI="p{sequence}.{i}.ts"{",GAP=YES" if i in gap else ""}\n'
+                   for i in range(count))
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Stop:
+    """Substitui o `threading.Event` de parada: registra as esperas e avança o relógio em vez de dormir."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.waits = []
+        self._set = False
+
+    def set(self):
+        self._set = True
+
+    def is_set(self):
+        return self._set
+
+    def wait(self, timeout=None):
+        self.waits.append(round(timeout, 6))
+        self.clock.now += timeout
+        return self._set
+
+
+class _Raw(io.BytesIO):
+    decode_content = False
+
+
+class FakeSession:
+    """
+    Sessão de teste. `routes[path]` é uma lista de respostas consumidas a cada pedido (a última se repete);
+    cada resposta é o corpo (str/bytes), um status HTTP (int) ou uma exceção a levantar. Sem rota, o corpo é
+    o próprio caminho, então a saída gravada mostra o que foi baixado e em que ordem.
+    """
+    timeout = 5
+
+    def __init__(self, **routes):
+        self.routes = {f'/live/{name.replace("_", ".")}': value for name, value in routes.items()}
+        self.requests = []
+
+    def request_headers(self, url, headers=None):
+        return dict(headers or {})
+
+    def get(self, url, headers=None, timeout=None, stream=False, **kwargs):
+        parts = urlsplit(url)
+        self.requests.append(parts.path + (f'?{parts.query}' if parts.query else ''))
+        answers = self.routes.get(parts.path, [f'[{parts.path.rsplit("/", 1)[-1]}]'])
+        answer = answers.pop(0) if len(answers) > 1 else answers[0]
+        if isinstance(answer, BaseException):
+            raise answer
+        response = requests.Response()
+        response.url = url
+        response.status_code = answer if isinstance(answer, int) else 200
+        body = b'' if isinstance(answer, int) else answer.encode() if isinstance(answer, str) else answer
+        response.raw = _Raw(body)
+        response.encoding = 'utf-8'
+        return response
+
+
+def follower(session, tmp_path, **kwargs):
+    clock = Clock()
+    live = LiveFollower(URL, str(tmp_path / 'out.ts'), session=session, retry=RetryPolicy(attempts=1),
+                        throttle=None, clock=clock, **kwargs)
+    live._stop = Stop(clock)
+    return live
+
+
+def recorded(tmp_path):
+    return (tmp_path / 'out.ts').read_text()
+
+
+class TestLivePlaylist:
+    def test_reload_parses_only_new_segments(self, monkeypatch):
+        live = LivePlaylist()
+        first = live.update(media(0, 5))
+        assert [s.sequence for s in first.added] == [0, 1, 2, 3, 4]
+
+        def full(*args):
+            raise AssertionError('análise completa em uma recarga incremental')
+
+        monkeypatch.setattr(live, '_update_full', full)
+        delta = live.update(media(2, 5))
+        assert [s.sequence for s in delta.added] == [5, 6]
+        assert [s.uri for s in delta.added] == ['s5.ts', 's6.ts']
+        assert [s.sequence for s in delta.removed] == [0, 1]
+        assert not delta.reset
+        assert live.media_sequence == 2 and live.next_sequence == 7
+
+    def test_lower_media_sequence_is_a_reset(self):
+        live = LivePlaylist()
+        live.update(media(100, 3))
+        delta = live.update(media(0, 2))
+        assert delta.reset
+        assert [s.sequence for s in delta.added] == [0, 1]
+
+    def test_window_that_moved_past_everything_known_is_not_a_reset(self):
+        live = LivePlaylist()
+        live.update(media(0, 3))
+        delta = live.update(media(10, 3))
+        assert not delta.reset
+        assert [s.sequence for s in delta.added] == [10, 11, 12]
+
+
+def test_reload_cadence_and_backoff(tmp_path):
+    end = media(0, 3, durations=[4, 4, 3], tail='#EXT-X-ENDLIST\n')
+    window = media(0, 3, durations=[4, 4, 3])
+    session = FakeSession(index_m3u8=[window, window, window, window, end])
+    live = follower(session, tmp_path, backoff=2, max_delay=5)
+    live.run()
+    # Segmentos novos: duração do último; sem mudança: metade do target duration, multiplicada pelo backoff
+    # até max_delay
+    assert live._stop.waits == [3, 2, 4, 5]
+    assert live.reloads == 5 and live.segments == 3
+    assert recorded(tmp_path) == '[s0.ts][s1.ts][s2.ts]'
+
+
+def test_media_sequence_gap_counts_dropped_segments(tmp_path):
+    session = FakeSession(index_m3u8=[media(0, 3), media(6, 3, tail='#EXT-X-ENDLIST\n')])
+    live = follower(session, tmp_path)
+    live.run()
+    assert live.dropped == 3
+    assert recorded(tmp_path) == '[s0.ts][s1.ts][s2.ts][s6.ts][s7.ts][s8.ts]'
+
+
+def test_playlist_reset_records_the_new_numbering(tmp_path):
+    session = FakeSession(index_m3u8=[media(100, 2), media(0, 2, tail='#EXT-X-ENDLIST\n')])
+    live = follower(session, tmp_path)
+    live.run()
+    assert recorded(tmp_path) == '[s100.ts][s101.ts][s0.ts][s1.ts]'
+    assert live.dropped == 0 and live.last_sequence == 1
+
+
+@pytest.mark.parametrize('failure', [404, requests.exceptions.ConnectionError('reset')])
+def test_failed_segment_is_dropped_and_recording_continues(tmp_path, failure):
+    session = FakeSession(index_m3u8=[media(0, 2), media(0, 4, tail='#EXT-X-ENDLIST\n')], s1_ts=[failure])
+    live = follower(session, tmp_path)
+    live.run()
+    assert recorded(tmp_path) == '[s0.ts][s2.ts][s3.ts]'
+    assert live.dropped == 1 and live.segments == 3
+    # O segmento que falhou não é pedido de novo na recarga seguinte
+    assert session.requests.count('/live/s1.ts') == 1
+
+
+def test_playlist_errors_are_tolerated_up_to_max_errors(tmp_path):
+    error = requests.exceptions.ConnectionError('reset')
+    session = FakeSession(index_m3u8=[media(0, 1), error, error, media(0, 2, tail='#EXT-X-ENDLIST\n')])
+    live = follower(session, tmp_path, max_errors=3)
+    live.run()
+    assert recorded(tmp_path) == '[s0.ts][s1.ts]'
+
+    session = FakeSession(index_m3u8=[media(0, 1), error, error, error])
+    with pytest.raises(M3u8NetworkingError):
+        follower(session, tmp_path, max_errors=3).run()
+
+
+class TestLowLatency:
+    def test_segment_is_assembled_from_parts_and_preload_hint(self, tmp_path):
+        first = media(10, 1, head=LL_HEAD) + parts(11, 2) + '#EXT-X-PRELOAD-HINT:TYPE=PART,URI="p11.2.ts"\n'
+        last = media(10, 1, head=LL_HEAD) + parts(11, 3) + '#EXTINF:3,\ns11.ts\n#EXT-X-ENDLIST\n'
+        session = FakeSession(index_m3u8=[first, last])
+        live = follower(session, tmp_path)
+        live.run()
+        assert recorded(tmp_path) == '[s10.ts][p11.0.ts][p11.1.ts][p11.2.ts]'
+        # O segmento gravado parte a parte não é baixado de novo
+        assert '/live/s11.ts' not in session.requests
+        assert live.parts == 3 and live.segments == 2 and live.dropped == 0
+        assert live._stop.waits == [1]
+
+    def test_blocking_reload_asks_for_the_next_part(self, tmp_path):
+        head = LL_HEAD + '#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES\n'
+        first = media(10, 1, head=head) + parts(11, 2)
+        last = media(10, 1, head=head) + parts(11, 3) + '#EXTINF:3,\ns11.ts\n#EXT-X-ENDLIST\n'
+        session = FakeSession(index_m3u8=[first, last])
+        live = follower(session, tmp_path)
+        live.run()
+        assert '/live/index.m3u8?_HLS_msn=11&_HLS_part=2' in session.requests
+        assert live._stop.waits == []
+        assert recorded(tmp_path) == '[s10.ts][p11.0.ts][p11.1.ts][p11.2.ts]'
+
+    def test_skipped_part_discards_the_rest_of_the_segment(self, tmp_path):
+        first = media(10, 1, head=LL_HEAD) + parts(11, 3, gap={1})
+        last = (media(10, 1, head=LL_HEAD) + parts(11, 3, gap={1}) + '#EXTINF:3,\ns11.ts\n'
+                + '#EXTINF:4,\ns12.ts\n#EXT-X-ENDLIST\n')
+        session = FakeSession(index_m3u8=[first, last])
+        live = follower(session, tmp_path)
+        live.run()
+        assert recorded(tmp_path) == '[s10.ts][p11.0.ts][s12.ts]'
+        assert live.dropped == 1
+        assert '/live/s11.ts' not in session.requests
+
+    def test_missing_first_part_downloads_the_whole_segment(self, tmp_path):
+        first = media(10, 1, head=LL_HEAD) + parts(11, 2)
+        last = media(10, 1, head=LL_HEAD) + parts(11, 2) + '#EXTINF:2,\ns11.ts\n#EXT-X-ENDLIST\n'
+        session = FakeSession(index_m3u8=[first, last], p11_0_ts=[404])
+        live = follower(session, tmp_path)
+        live.run()
+        assert recorded(tmp_path) == '[s10.ts][s11.ts]'
+        assert live.dropped == 0 and live.parts == 0
+
+    def test_missing_later_part_drops_the_segment(self, tmp_path):
+        first = media(10, 1, head=LL_HEAD) + parts(11, 3)
+        last = media(10, 1, head=LL_HEAD) + parts(11, 3) + '#EXTINF:3,\ns11.ts\n#EXTINF:4,\ns12.ts\n#EXT-X-ENDLIST\n'
+        session = FakeSession(index_m3u8=[first, last], p11_1_ts=[404])
+        live = follower(session, tmp_path)
+        live.run()
+        assert recorded(tmp_path) == '[s10.ts][p11.0.ts][s12.ts]'
+        assert live.dropped == 1
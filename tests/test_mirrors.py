@@ -0,0 +1,134 @@
+import threading
+
+import pytest
+
+from m3u8_analyzer.exeptions import M3u8DownloadError, M3u8NetworkingError
+from m3u8_analyzer.mirrors import MirrorPool
+
+A, B, C = 'https://a.example.com/', 'https://b.example.com/', 'https://c.example.com/'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Origins:
+    """
+    `download` dos espelhos: `behaviour[base]` é 'ok', 'fail', 'hang' (espera a interrupção) ou um tempo de
+    download, avançado no relógio.
+    """
+
+    def __init__(self, clock, **behaviour):
+        self.clock = clock
+        self.behaviour = behaviour
+        self.calls = []
+        self.stopped = []
+
+    def __call__(self, url, destination, stop):
+        base = next(base for base in (A, B, C) if url.startswith(base))
+        self.calls.append(base)
+        action = self.behaviour.get(base, 'ok')
+        if action == 'fail':
+            raise M3u8NetworkingError("Erro HTTP: 503", errors=[url])
+        if action == 'hang':
+            stop.wait(5)
+            self.stopped.append(base)
+            raise M3u8DownloadError("interrompido")
+        if not isinstance(action, str):
+            self.clock.now += action
+        with open(destination, 'w') as f:
+            f.write(base)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_failover_to_next_mirror_and_ranking(clock, tmp_path):
+    pool = MirrorPool([A, B], clock=clock)
+    origins = Origins(clock, **{A: 'fail'})
+    destination = tmp_path / 'seg.ts'
+    assert pool.fetch('seg.ts', str(destination), origins).base == B
+    assert destination.read_text() == B
+    assert origins.calls == [A, B]
+    # O espelho que falhou perde a primeira posição
+    assert [mirror.base for mirror in pool.ranked()] == [B, A]
+    assert pool.mirrors[0].failures == 1 and pool.mirrors[1].successes == 1
+
+
+def test_all_mirrors_failing_raises_the_last_error(clock, tmp_path):
+    pool = MirrorPool([A, B], clock=clock)
+    with pytest.raises(M3u8NetworkingError):
+        pool.fetch('seg.ts', str(tmp_path / 'seg.ts'), Origins(clock, **{A: 'fail', B: 'fail'}))
+
+
+def test_latency_is_measured_with_the_clock(clock, tmp_path):
+    pool = MirrorPool([A, B], clock=clock)
+    pool.fetch('seg.ts', str(tmp_path / 'seg.ts'), Origins(clock, **{A: 2.5}))
+    assert pool.mirrors[0].latency == 2.5
+    # Mais lento, A fica atrás de B assim que B tiver uma medida melhor
+    pool.record(pool.mirrors[1], True, 0.5)
+    assert pool.ranked()[0].base == B
+
+
+def test_hedge_delay_is_the_percentile_after_min_samples(clock):
+    pool = MirrorPool([A, B], hedge_percentile=0.9, hedge_min_samples=10, hedge_min_delay=0.05, clock=clock)
+    for elapsed in range(1, 10):
+        pool.record(pool.mirrors[0], True, elapsed / 10)
+    assert pool.hedge_delay() is None
+    pool.record(pool.mirrors[0], True, 1.0)
+    assert pool.hedge_delay() == 1.0
+    assert MirrorPool([A], hedge_percentile=0.9, hedge_min_samples=0).hedge_delay() is None
+
+
+def hedging_pool(clock, samples=3):
+    pool = MirrorPool([A, B, C], hedge_percentile=0.5, hedge_min_samples=samples, hedge_min_delay=0.01,
+                      clock=clock)
+    for _ in range(samples):
+        pool.record(pool.mirrors[0], True, 0.0)
+    return pool
+
+
+def test_slow_mirror_is_hedged_and_the_loser_interrupted(clock, tmp_path):
+    pool = hedging_pool(clock)
+    origins = Origins(clock, **{A: 'hang'})
+    destination = tmp_path / 'seg.ts'
+    try:
+        assert pool.fetch('seg.ts', str(destination), origins).base == B
+    finally:
+        pool.close()
+    assert destination.read_text() == B
+    assert pool.hedges == 1 and pool.hedges_won == 1
+    assert origins.stopped == [A]
+    # A cópia interrompida não conta como falha do espelho, e nenhum arquivo parcial sobra
+    assert pool.mirrors[0].failures == 0
+    assert [path.name for path in tmp_path.iterdir()] == ['seg.ts']
+
+
+def test_hedged_fetch_fails_over_when_the_first_mirror_errors(clock, tmp_path):
+    pool = hedging_pool(clock)
+    destination = tmp_path / 'seg.ts'
+    try:
+        assert pool.fetch('seg.ts', str(destination), Origins(clock, **{A: 'fail'})).base == B
+    finally:
+        pool.close()
+    assert destination.read_text() == B
+    assert pool.hedges == 0 and pool.mirrors[0].failures == 1
+
+
+def test_cancel_stops_every_attempt(clock, tmp_path):
+    pool = hedging_pool(clock)
+    cancel = threading.Event()
+    cancel.set()
+    origins = Origins(clock, **{A: 'hang', B: 'hang', C: 'hang'})
+    try:
+        with pytest.raises(M3u8DownloadError):
+            pool.fetch('seg.ts', str(tmp_path / 'seg.ts'), origins, cancel)
+    finally:
+        pool.close()
+    assert all(mirror.failures == 0 for mirror in pool.mirrors)
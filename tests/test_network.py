@@ -0,0 +1,24 @@
+from m3u8_analyzer.network import HEADERS_DEFAULT, HttpSession
+
+
+def test_default_headers_have_no_body_headers():
+    assert not {'content-length', 'content-type'} & {name.lower() for name in HEADERS_DEFAULT}
+
+
+def test_get_drops_body_headers_on_reused_connections(server):
+    received = []
+
+    def echo(handler):
+        received.append({name.lower() for name in handler.headers})
+        return '#EXTM3U\n'
+
+    server.files['/v.m3u8'] = echo
+    session = HttpSession(headers={'Content-Type': 'text/plain'})
+    browser_headers = {**HEADERS_DEFAULT, 'Content-Length': '583'}
+    # Com o Content-Length repassado, a segunda requisição da conexão seria lida como corpo da primeira
+    for _ in range(3):
+        response = session.get(server.url + 'v.m3u8', headers=browser_headers, timeout=5)
+        assert response.text == '#EXTM3U\n'
+    assert len(received) == 3
+    assert not any({'content-length', 'content-type'} & headers for headers in received)
+    assert 'content-length' not in {name.lower() for name in session.request_headers(server.url, browser_headers)}
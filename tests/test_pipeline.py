@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from m3u8_analyzer import M3u8Downloader
+from m3u8_analyzer.exeptions import M3u8Error, M3u8NetworkingError
+
+from .crypto import ts_payload
+
+SEGMENTS = 10
+
+
+@pytest.fixture
+def playlist(server):
+    """Playlist de segmentos TS pequenos; retorna o conteúdo combinado esperado."""
+    segments = [ts_payload(188 * 20, seed=i) for i in range(SEGMENTS)]
+    for i, segment in enumerate(segments):
+        server.files[f'/s{i}.ts'] = segment
+    server.files['/v.m3u8'] = '\n'.join(['#EXTM3U', '#EXT-X-TARGETDURATION:2'] +
+                                        [f'#EXTINF:2,\ns{i}.ts' for i in range(SEGMENTS)] + ['#EXT-X-ENDLIST', ''])
+    return b''.join(segments)
+
+
+def download(server, output, **kwargs):
+    M3u8Downloader.downloader_and_remuxer_segments(server.url + 'v.m3u8', str(output), player=server.url,
+                                                   pipeline=True, **kwargs)
+    return output.read_bytes()
+
+
+def test_stalled_segment_holds_back_new_downloads(server, fake_ffmpeg, tmp_path, playlist):
+    max_pending = 3
+    release = threading.Event()
+    requested_while_stalled = []
+    first = server.files['/s0.ts']
+
+    def stalled(handler):
+        # Segura o primeiro segmento até os seguintes, dentro do limite, terem sido pedidos
+        release.wait(10)
+        return first
+
+    def watch():
+        while server.hits['/s2.ts'] == 0:
+            threading.Event().wait(0.01)
+        # Tempo para um pipeline sem limite pedir mais segmentos
+        threading.Event().wait(0.3)
+        requested_while_stalled.extend(path for path, count in server.hits.items() if count and path != '/v.m3u8')
+        release.set()
+
+    server.files['/s0.ts'] = stalled
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    output = download(server, tmp_path / 'out.ts', workers=2, max_pending=max_pending)
+    watcher.join()
+    assert sorted(requested_while_stalled) == ['/s0.ts', '/s1.ts', '/s2.ts']
+    # A ordem da playlist é mantida mesmo com o primeiro segmento chegando por último
+    assert output == playlist
+
+
+def test_failed_segment_stops_the_pipeline(server, fake_ffmpeg, tmp_path, playlist):
+    del server.files['/s4.ts']
+    with pytest.raises(M3u8NetworkingError):
+        download(server, tmp_path / 'out.ts', workers=2, max_pending=2)
+    # Segmentos depois do limite não chegam a ser pedidos
+    assert server.hits['/s9.ts'] == 0
+
+
+def test_max_pending_below_workers_is_rejected(server, fake_ffmpeg, tmp_path, playlist):
+    with pytest.raises(M3u8Error):
+        download(server, tmp_path / 'out.ts', workers=4, max_pending=2)
@@ -0,0 +1,67 @@
+import pytest
+
+from m3u8_analyzer import M3u8Analyzer, PlaylistParser
+from m3u8_analyzer.M3u8Analyzer import M3U8Playlist
+
+HEAD = '#EXTM3U\n#EXT-X-TARGETDURATION:4\n'
+
+
+def parse(body):
+    return PlaylistParser().parse(HEAD + body)
+
+
+def test_byterange_offsets_follow_previous_segment():
+    playlist = parse('#EXTINF:4,\n#EXT-X-BYTERANGE:100@10\nall.ts\n#EXTINF:4,\n#EXT-X-BYTERANGE:50\nall.ts\n')
+    ranges = [(segment.byterange.offset, segment.byterange.length) for segment in playlist.segments]
+    assert ranges == [(10, 100), (110, 50)]
+
+
+def test_malformed_byterange_is_ignored():
+    playlist = parse('#EXTINF:4,\n#EXT-X-BYTERANGE:abc@0\nseg.ts\n#EXTINF:4,\n#EXT-X-BYTERANGE:10@x\nseg2.ts\n')
+    assert [segment.byterange for segment in playlist.segments] == [None, None]
+
+
+def test_get_segments_with_malformed_byterange():
+    content = HEAD + '#EXTINF:4,\n#EXT-X-BYTERANGE:abc@0\nseg.ts\n#EXT-X-ENDLIST\n'
+    assert M3u8Analyzer.get_segments(content)['uris'] == ['seg.ts']
+
+
+def test_malformed_map_and_part_byteranges():
+    playlist = parse('#EXT-X-MAP:URI="init.mp4",BYTERANGE="x@0"\n'
+                     '#EXT-X-PART:DURATION=1,URI="p.mp4",BYTERANGE="?"\n'
+                     '#EXTINF:4,\nseg.m4s\n')
+    segment = list(playlist.segments)[0]
+    assert segment.init_section.uri == 'init.mp4' and segment.init_section.byterange is None
+    assert playlist.parts[0].uri == 'p.mp4' and playlist.parts[0].byterange is None
+
+
+def test_part_byteranges_continue_on_same_uri():
+    playlist = parse('#EXT-X-PART:DURATION=1,URI="a.mp4",BYTERANGE="100@0"\n'
+                     '#EXT-X-PART:DURATION=1,URI="a.mp4",BYTERANGE="50"\n'
+                     '#EXT-X-PART:DURATION=1,URI="b.mp4",BYTERANGE="20"\n')
+    assert [(part.byterange.offset, part.byterange.length) for part in playlist.parts] == [(0, 100), (100, 50),
+                                                                                           (0, 20)]
+
+
+def test_method_none_is_not_encrypted():
+    playlist = parse('#EXT-X-KEY:METHOD=NONE\n#EXTINF:4,\nseg.ts\n')
+    assert not playlist.encrypted
+    playlist = parse('#EXT-X-KEY:METHOD=AES-128,URI="k.bin"\n#EXTINF:4,\nseg.ts\n'
+                     '#EXT-X-KEY:METHOD=NONE\n#EXTINF:4,\nseg2.ts\n')
+    assert playlist.encrypted
+    assert [segment.key and segment.key.uri for segment in playlist.segments] == ['k.bin', None]
+
+
+MASTER = ('#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360\n360p.m3u8\n'
+          '#EXT-X-STREAM-INF:BANDWIDTH=2000000,RESOLUTION=1280x720\n720p.m3u8\n')
+MEDIA = HEAD + '#EXTINF:4,\na.ts\n#EXTINF:4,\nb.ts\n#EXTINF:4,\nc.ts\n#EXT-X-ENDLIST\n'
+
+
+@pytest.mark.parametrize('content', [MASTER, MEDIA], ids=['master', 'media'])
+def test_playlist_uris_match_get_segments(content):
+    playlist = M3U8Playlist('https://example.com/v.m3u8', content=content)
+    expected = M3u8Analyzer.get_segments(content)['enumerated_uris']
+    assert expected
+    assert playlist.uris() == expected
+    assert playlist.number_segments() == len(expected)
+    assert playlist.info()['uris'] == expected
@@ -0,0 +1,180 @@
+import pytest
+import requests
+
+from m3u8_analyzer.exeptions import M3u8CircuitOpenError, M3u8DownloadError
+from m3u8_analyzer.retry import CircuitBreaker, RetryPolicy
+
+URL = 'https://cdn.example.com/seg.ts'
+HOST = 'cdn.example.com'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Response:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def failing():
+    raise requests.exceptions.ConnectionError('fora do ar')
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=2, recovery_time=10, clock=clock)
+
+
+def policy(breaker=None, attempts=1, sleeps=None):
+    return RetryPolicy(attempts=attempts, backoff=1, jitter=0, breaker=breaker,
+                       sleep=sleeps.append if sleeps is not None else lambda _: None)
+
+
+def open_circuit(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            policy(breaker).run(URL, failing)
+    assert breaker.state(HOST) == 'open'
+
+
+def test_closed_until_threshold(breaker):
+    with pytest.raises(requests.exceptions.ConnectionError):
+        policy(breaker).run(URL, failing)
+    assert breaker.state(HOST) == 'closed'
+    with pytest.raises(requests.exceptions.ConnectionError):
+        policy(breaker).run(URL, failing)
+    assert breaker.state(HOST) == 'open'
+
+
+def test_open_rejects_without_calling(breaker):
+    open_circuit(breaker)
+    calls = []
+    with pytest.raises(M3u8CircuitOpenError):
+        policy(breaker).run(URL, lambda: calls.append(1))
+    assert calls == []
+
+
+def test_half_open_probe_success_closes(breaker, clock):
+    open_circuit(breaker)
+    clock.now = 10
+    assert breaker.state(HOST) == 'half-open'
+    assert policy(breaker).run(URL, Response).status_code == 200
+    assert breaker.state(HOST) == 'closed'
+
+
+def test_half_open_probe_failure_reopens(breaker, clock):
+    open_circuit(breaker)
+    clock.now = 10
+    with pytest.raises(requests.exceptions.ConnectionError):
+        policy(breaker).run(URL, failing)
+    assert breaker.state(HOST) == 'open'
+    clock.now = 19
+    with pytest.raises(M3u8CircuitOpenError):
+        policy(breaker).run(URL, Response)
+
+
+def test_only_one_probe_at_a_time(breaker, clock):
+    open_circuit(breaker)
+    clock.now = 10
+    assert breaker.before(HOST) is True
+    with pytest.raises(M3u8CircuitOpenError):
+        breaker.before(HOST)
+
+
+@pytest.mark.parametrize('error', [M3u8DownloadError('cancelado'), ValueError('padding'), KeyboardInterrupt()])
+def test_probe_interrupted_by_other_error_is_released(breaker, clock, error):
+    open_circuit(breaker)
+    clock.now = 10
+
+    def attempt():
+        raise error
+
+    with pytest.raises(type(error)):
+        policy(breaker).run(URL, attempt)
+    clock.now = 500
+    assert policy(breaker).run(URL, Response).status_code == 200
+    assert breaker.state(HOST) == 'closed'
+
+
+def test_fatal_probe_reopens(breaker, clock):
+    open_circuit(breaker)
+    clock.now = 10
+
+    def attempt():
+        raise requests.exceptions.SSLError('certificado')
+
+    with pytest.raises(requests.exceptions.SSLError):
+        policy(breaker, attempts=3).run(URL, attempt)
+    assert breaker.state(HOST) == 'open'
+
+
+def test_retries_exceptions_with_backoff():
+    sleeps = []
+    results = iter([requests.exceptions.Timeout(), requests.exceptions.ConnectionError(), Response()])
+
+    def attempt():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert policy(attempts=3, sleeps=sleeps).run(URL, attempt).status_code == 200
+    assert sleeps == [1, 2]
+
+
+def test_retryable_status_respects_retry_after():
+    sleeps = []
+    first = Response(503, {'Retry-After': '7'})
+    results = iter([first, Response()])
+    assert policy(attempts=2, sleeps=sleeps).run(URL, lambda: next(results)).status_code == 200
+    assert first.closed
+    assert sleeps == [7]
+
+
+def test_last_retryable_status_is_returned():
+    result = policy(attempts=2).run(URL, lambda: Response(500))
+    assert result.status_code == 500
+
+
+def test_non_retryable_exception_is_not_repeated():
+    calls = []
+
+    def attempt():
+        calls.append(1)
+        raise ValueError('erro do chamador')
+
+    with pytest.raises(ValueError):
+        policy(attempts=3).run(URL, attempt)
+    assert calls == [1]
+
+
+def test_run_async_releases_probe(breaker, clock):
+    import asyncio
+
+    open_circuit(breaker)
+    clock.now = 10
+
+    async def attempt():
+        raise M3u8DownloadError('cancelado')
+
+    async def ok():
+        return Response()
+
+    with pytest.raises(M3u8DownloadError):
+        asyncio.run(policy(breaker).run_async(URL, attempt))
+    assert asyncio.run(policy(breaker).run_async(URL, ok)).status_code == 200
@@ -0,0 +1,23 @@
+import pytest
+
+from m3u8_analyzer import M3u8Downloader
+from m3u8_analyzer.exeptions import M3u8CircuitOpenError, M3u8NetworkingError
+from m3u8_analyzer.retry import CircuitBreaker, RetryPolicy, host_of
+
+baixar_segmento = getattr(M3u8Downloader, '_M3u8Downloader__baixar_segmento')
+
+
+def test_http_error_is_networking_error(server, tmp_path):
+    with pytest.raises(M3u8NetworkingError):
+        baixar_segmento(server.url + 'nao-existe.ts', str(tmp_path / 'seg.ts'), 1, 1, processar=False,
+                        retry=RetryPolicy(attempts=1))
+
+
+def test_open_circuit_is_raised_unchanged(server, tmp_path):
+    server.files['/seg.ts'] = b'\x47' * 188
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=60)
+    breaker.failure(host_of(server.url))
+    with pytest.raises(M3u8CircuitOpenError):
+        baixar_segmento(server.url + 'seg.ts', str(tmp_path / 'seg.ts'), 1, 1, processar=False,
+                        retry=RetryPolicy(attempts=1, breaker=breaker))
+    assert server.hits['/seg.ts'] == 0
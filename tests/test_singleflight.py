@@ -0,0 +1,147 @@
+import threading
+import time
+
+import pytest
+
+from m3u8_analyzer import keys as keys_module
+from m3u8_analyzer import HttpSession
+from m3u8_analyzer.M3u8Analyzer import EncryptSuport, M3u8Analyzer
+from m3u8_analyzer.singleflight import SingleFlight, request_key
+
+CALLERS = 8
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def run_concurrently(call):
+    """Executa `call()` em várias threads; retorna as threads e a lista com o resultado (ou exceção) de cada uma."""
+    results = [None] * CALLERS
+
+    def run(i):
+        try:
+            results[i] = call()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return object()
+
+    threads, results = run_concurrently(lambda: flight.do('k', fn))
+    # Todas as outras threads estão esperando a primeira antes de ela terminar
+    wait_until(lambda: flight.shared == CALLERS - 1)
+    assert flight.in_flight() == 1
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.in_flight() == 0
+
+
+def test_error_is_shared_and_next_call_runs_again():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError('origem indisponível')
+
+    threads, results = run_concurrently(lambda: flight.do('k', fail))
+    wait_until(lambda: flight.shared == CALLERS - 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert all(isinstance(result, ValueError) for result in results)
+    # Nada é guardado depois que a chamada termina
+    assert flight.do('k', lambda: 42) == 42
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight = SingleFlight()
+    release = threading.Event()
+    thread = threading.Thread(target=flight.do, args=('lenta', lambda: release.wait(5)))
+    thread.start()
+    wait_until(lambda: flight.in_flight() == 1)
+    assert flight.do('rápida', lambda: 'ok') == 'ok'
+    release.set()
+    thread.join()
+    assert flight.shared == 0
+
+
+def test_request_key_ignores_header_order_and_case():
+    assert request_key('u', {'A': '1', 'b': '2'}) == request_key('u', {'B': '2', 'a': '1'})
+    assert request_key('u', {'A': '1'}) != request_key('u', {'A': '2'})
+    assert request_key('u') == request_key('u', {})
+
+
+@pytest.fixture
+def no_key_cache(monkeypatch):
+    monkeypatch.setattr(keys_module, '_default_key_cache', None)
+
+
+def test_concurrent_key_requests_reach_the_origin_once(server, no_key_cache):
+    release = threading.Event()
+
+    def key(handler):
+        release.wait(5)
+        return bytes(range(16))
+
+    server.files['/k.bin'] = key
+    flight = SingleFlight()
+    threads, results = run_concurrently(lambda: EncryptSuport.get_key(server.url + 'k.bin', flight=flight))
+    wait_until(lambda: flight.shared == CALLERS - 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == [bytes(range(16))] * CALLERS
+    assert server.hits['/k.bin'] == 1
+
+
+@pytest.mark.parametrize('fetch', ['playlist', 'key'])
+def test_sessions_with_different_credentials_are_not_coalesced(server, no_key_cache, fetch):
+    release = threading.Event()
+
+    def respond(handler):
+        # A resposta depende das credenciais da sessão; segura até as duas requisições estarem em andamento
+        release.wait(5)
+        user = handler.headers.get('Authorization', '')
+        return f'#EXTM3U\n# {user}\n' if fetch == 'playlist' else user.encode().ljust(16, b'.')
+
+    server.files['/r'] = respond
+    flight = SingleFlight()
+    results = {}
+
+    def call(user):
+        session = HttpSession(headers={'Authorization': user})
+        if fetch == 'playlist':
+            results[user] = M3u8Analyzer.get_m3u8(server.url + 'r', session=session, flight=flight)
+        else:
+            results[user] = EncryptSuport.get_key(server.url + 'r', session=session, flight=flight).decode()
+
+    threads = [threading.Thread(target=call, args=(user,)) for user in ('alice', 'bob')]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: flight.in_flight() == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert 'alice' in results['alice'] and 'bob' in results['bob']
+    assert flight.shared == 0 and server.hits['/r'] == 2